@@ -0,0 +1,83 @@
+"""
+Small thread-safe circuit breaker.
+
+Used by the Slack listener to fail fast on a Slack API endpoint that keeps
+timing out or erroring, instead of tying up a handler thread for the full
+HTTP timeout on every call during an outage.
+
+States follow the usual pattern:
+- closed: calls go through; consecutive failures are counted
+- open: calls are refused until reset_timeout seconds have passed
+- half-open: one trial call is let through; success closes the breaker,
+  failure opens it again
+"""
+
+import threading
+import time
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Counts consecutive failures and refuses calls for a while once too many pile up."""
+
+    def __init__(self, fail_threshold: int = 5, reset_timeout: float = 30.0, timer=time.monotonic):
+        """
+        Args:
+            fail_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before allowing a trial call
+            timer: Clock function (monotonic seconds), injectable for tests
+        """
+        self.fail_threshold = fail_threshold
+        self.reset_timeout = reset_timeout
+        self._timer = timer
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state (closed, open or half_open)."""
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Return True if a call may proceed.
+
+        An open breaker whose reset_timeout has elapsed moves to half-open and
+        lets exactly one trial call through.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._timer() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """Close the breaker and reset the failure count."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """Count a failure, opening the breaker at the threshold or after a failed trial."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.fail_threshold:
+                self._state = OPEN
+                self._opened_at = self._timer()
+
+    def reset(self):
+        """Return to the closed state."""
+        self.record_success()
@@ -72,6 +72,13 @@ REGISTRY_SOCKET = os.path.join(SOCKET_DIR, "registry.sock")
 DEBUG = os.environ.get("DEBUG_WRAPPER", "0") == "1"
 LOG_DIR = os.environ.get("SLACK_LOG_DIR", get_log_dir())
 
+# Slack bot connections carry one message each, terminated by EOF
+SOCKET_RECV_CHUNK = 65536  # bytes per recv()
+SOCKET_RECV_TIMEOUT = 5  # seconds - a sender that stalls mid-message is dropped
+# Applied as SO_RCVTIMEO rather than settimeout(), which would switch the
+# socket to non-blocking mode and poll() before every recv()
+_SOCKET_RECV_TIMEVAL = struct.pack("ll", SOCKET_RECV_TIMEOUT, 0)
+
 # ANSI color codes for terminal output
 CYAN = "\033[36m"
 GREEN = "\033[32m"
@@ -122,6 +129,31 @@ def debug_log(message):
         print(f"{CYAN}[DEBUG] {message}{RESET}", file=sys.stderr)
 
 
+def read_socket_message(conn) -> str:
+    """
+    Read one message from an accepted Slack bot connection.
+
+    The listener opens one connection per message and closes it after
+    sending, so the message is everything up to EOF. A single recv() used to
+    cut long messages (pasted logs, code) off at 4 KB.
+
+    Args:
+        conn: Accepted socket connection
+
+    Returns:
+        Decoded message text, stripped
+    """
+    conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, _SOCKET_RECV_TIMEVAL)
+    chunks = []
+    while True:
+        chunk = conn.recv(SOCKET_RECV_CHUNK)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    # Decode once so multi-byte characters split across chunks stay intact
+    return b"".join(chunks).decode('utf-8').strip()
+
+
 def generate_session_id():
     """Generate unique 8-character hex session ID"""
     random_bytes = os.urandom(4)
@@ -807,7 +839,7 @@ class HybridPTYWrapper:
 
                 with conn:
                     # Receive message from Slack bot
-                    data = conn.recv(4096).decode('utf-8').strip()
+                    data = read_socket_message(conn)
 
                     if data:
                         self.logger.info(f"Received input from Slack: {len(data)} chars")
@@ -23,6 +23,10 @@ DEFAULT_CONFIG = {
 
     # Claude Code binary
     'claude_bin': None,  # Auto-detect or use environment variable
+
+    # Slack listener
+    'listener_concurrency': 32,  # Socket Mode worker threads for event handlers
+    'listener_log_level': 'INFO',  # DEBUG adds the per-event routing trace
 }
 
 def get_config_value(key, default=None):
@@ -32,6 +36,8 @@ def get_config_value(key, default=None):
         'registry_db': 'REGISTRY_DB_PATH',
         'log_dir': 'SLACK_LOG_DIR',
         'claude_bin': 'CLAUDE_BIN',
+        'listener_concurrency': 'SLACK_BOT_CONCURRENCY',
+        'listener_log_level': 'SLACK_LISTENER_LOG_LEVEL',
     }
 
     env_var = env_map.get(key)
@@ -52,6 +58,20 @@ def get_log_dir():
     """Get log directory path"""
     return get_config_value('log_dir')
 
+def get_listener_concurrency():
+    """Get Socket Mode worker thread count for the Slack listener"""
+    try:
+        return max(1, int(get_config_value('listener_concurrency')))
+    except (TypeError, ValueError):
+        return DEFAULT_CONFIG['listener_concurrency']
+
+def get_listener_log_level():
+    """Get logging level name for the Slack listener (unknown names fall back to the default)"""
+    level = str(get_config_value('listener_log_level')).upper()
+    if level not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
+        return DEFAULT_CONFIG['listener_log_level']
+    return level
+
 def get_claude_bin():
     """Get Claude Code binary path (auto-detect if not specified)"""
     claude_bin = get_config_value('claude_bin')
@@ -14,6 +14,8 @@ import sys
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
+from transcript_parser import TranscriptParser
+
 
 @dataclass
 class DMCommand:
@@ -278,18 +280,20 @@ def format_session_list_for_slack(db) -> str:
     return '\n'.join(lines)
 
 
-def get_transcript_path_for_session(db, session_id: str) -> str:
+def get_transcript_path_for_session(db, session_id: str, session: dict = None) -> str:
     """
     Find the transcript JSONL file for a session.
 
     Args:
         db: RegistryDatabase instance
         session_id: Claude session ID
+        session: Session dict if the caller already has it (skips the registry lookup)
 
     Returns:
         Path to transcript file, or None if not found
     """
-    session = db.get_session(session_id)
+    if session is None:
+        session = db.get_session(session_id)
     if not session:
         return None
 
@@ -344,21 +348,22 @@ def attach_to_session(db, user_id: str, session_id: str, dm_channel_id: str, sla
 
     # Send history if requested
     if history_count > 0:
-        transcript_path = get_transcript_path_for_session(db, session_id)
+        transcript_path = get_transcript_path_for_session(db, session_id, session)
         if transcript_path:
             try:
-                from transcript_parser import TranscriptParser
                 parser = TranscriptParser(transcript_path)
-                if parser.load():
+                # Only decode the tail of the transcript - older lines are never shown
+                if parser.load_recent(history_count):
                     messages = parser.get_last_n_messages(n=history_count)
                     if messages:
                         # Format and send history
-                        history_text = "*Recent messages:*\n"
+                        history_parts = ["*Recent messages:*\n"]
                         for msg in messages:
                             role_emoji = "👤" if msg['role'] == 'user' else "🤖"
                             # Truncate long messages
                             text = msg['text'][:500] + '...' if len(msg['text']) > 500 else msg['text']
-                            history_text += f"{role_emoji} {text}\n\n"
+                            history_parts.append(f"{role_emoji} {text}\n\n")
+                        history_text = ''.join(history_parts)
 
                         try:
                             slack_client.chat_postMessage(
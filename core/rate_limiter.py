@@ -0,0 +1,71 @@
+"""
+Small thread-safe token-bucket rate limiter.
+
+Used by the Slack listener to keep bursts of interactive Slack API calls
+(button mashing, repeated shortcut opens) under Slack's per-method rate
+limits, so calls are spread out locally instead of being answered with a 429
+and a retry-after stall.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Bucket refilled at a fixed rate; each call takes one token.
+
+    When the bucket is empty, take() reserves the next token and sleeps until
+    it is due, so concurrent callers queue up in order instead of all
+    retrying at once.
+    """
+
+    def __init__(self, rate: float, capacity: int, timer=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (the allowed burst size)
+            timer: Clock function (monotonic seconds), injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._timer = timer
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting (0.0 if a token was available)
+        """
+        with self._lock:
+            now = self._timer()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def try_take(self) -> bool:
+        """
+        Take one token only if one is available now, never waiting.
+
+        Returns:
+            True if a token was taken, False if the bucket is empty
+        """
+        with self._lock:
+            now = self._timer()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
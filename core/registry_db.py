@@ -11,14 +11,43 @@ Benefits:
 - Automatic retry on write conflicts
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
-from sqlalchemy import create_engine, Column, String, DateTime, Index, text
+from sqlalchemy import create_engine, event, Column, String, DateTime, Index, text, or_, bindparam
 from sqlalchemy.orm import declarative_base, sessionmaker
 from contextlib import contextmanager
 
 Base = declarative_base()
 
+# Pre-built statements for hot read paths. The SQL text is identical on every
+# call, so SQLAlchemy's compiled cache and sqlite3's statement cache both hit
+# and skip re-parsing/ORM hydration.
+_SELECT_USER_MODE = text("SELECT mode FROM user_preferences WHERE user_id = :user_id")
+# Route lookups return the wrapper session (8-char ID, owns the socket) ahead
+# of the Claude UUID session (36 chars) registered alongside it, and skip rows
+# without a socket to send to.
+_SELECT_THREAD_ROUTE = text(
+    "SELECT session_id, socket_path FROM sessions "
+    "WHERE slack_thread_ts = :thread_ts AND status = 'active' AND socket_path != '' "
+    "ORDER BY length(session_id) LIMIT 1"
+)
+_SELECT_CHANNEL_ROUTES = text(
+    "SELECT session_id, socket_path FROM sessions "
+    "WHERE slack_channel IN (:channel, :channel_name) AND slack_thread_ts IS NULL AND status = 'active' "
+    "AND socket_path != '' "
+    "ORDER BY length(session_id)"
+)
+# Everything a forwarded DM needs (subscribed session's socket + user mode) in one query
+_SELECT_DM_ROUTE = text(
+    "SELECT d.session_id, s.socket_path, p.mode FROM dm_subscriptions d "
+    "LEFT JOIN sessions s ON s.session_id = d.session_id "
+    "LEFT JOIN user_preferences p ON p.user_id = d.user_id "
+    "WHERE d.user_id = :user_id"
+)
+_SELECT_THREAD_SESSION_ID = text(
+    "SELECT session_id FROM sessions WHERE slack_thread_ts = :thread_ts LIMIT 1"
+)
+
 
 class DMSubscription(Base):
     """
@@ -163,8 +192,10 @@ class SessionRecord(Base):
     __table_args__ = (
         Index('idx_status', 'status'),
         Index('idx_last_activity', 'last_activity'),
-        Index('idx_slack_thread', 'slack_thread_ts'),
         Index('idx_project_dir', 'project_dir'),
+        Index('idx_status_created', 'status', 'created_at'),  # list_sessions/search_sessions
+        Index('idx_sessions_thread_active', 'slack_thread_ts', 'status'),  # get_thread_route
+        Index('idx_sessions_channel_thread_active', 'slack_channel', 'slack_thread_ts', 'status'),  # get_channel_routes
     )
 
     def to_dict(self):
@@ -189,6 +220,15 @@ class SessionRecord(Base):
         }
 
 
+# Single-statement write for the per-message reply_to_ts update (Core, so
+# DateTime binding matches what the ORM stores)
+_UPDATE_REPLY_TO_TS = (
+    SessionRecord.__table__.update()
+    .where(SessionRecord.__table__.c.session_id == bindparam('target_session_id'))
+    .values(reply_to_ts=bindparam('reply_to_ts'), last_activity=bindparam('last_activity'))
+)
+
+
 class RegistryDatabase:
     """
     Database manager for session registry
@@ -197,12 +237,15 @@ class RegistryDatabase:
     Provides context managers for safe transaction handling.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = 5):
         """
         Initialize database connection
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Connections kept open in the pool. Multi-threaded callers
+                (the Slack listener) should pass their worker count so threads
+                don't queue for a connection; idle slots cost nothing.
         """
         self.db_path = db_path
 
@@ -211,16 +254,21 @@ class RegistryDatabase:
             f'sqlite:///{db_path}',
             connect_args={
                 'timeout': 2.0,  # 2 second timeout for write conflicts
-                'check_same_thread': False  # Allow multi-threaded access
+                'check_same_thread': False,  # Allow multi-threaded access
+                'cached_statements': 256  # Per-connection prepared statement cache
             },
+            pool_size=pool_size,
             echo=False  # Set to True for SQL debugging
         )
 
-        # Enable WAL mode for concurrent reads + single writer
+        # busy_timeout/synchronous/cache_size are per-connection settings, so apply
+        # them to every pooled connection rather than only the first one
+        event.listen(self.engine, 'connect', self._configure_connection)
+
+        # Enable WAL mode for concurrent reads + single writer (persisted in the file).
+        # The listener's per-event route reads then never wait on wrapper commits.
         with self.engine.connect() as conn:
             conn.execute(text("PRAGMA journal_mode=WAL"))
-            conn.execute(text("PRAGMA busy_timeout=2000"))  # 2 second retry
-            conn.execute(text("PRAGMA synchronous=NORMAL"))   # Faster writes, still safe with WAL
             conn.commit()
 
         # Create tables
@@ -229,9 +277,48 @@ class RegistryDatabase:
         # Run migrations for existing databases
         self._run_migrations()
 
+        # Collect planner statistics (sqlite_stat1) for the sessions indexes so the
+        # routing lookups pick the composite ones. An explicit ANALYZE is needed:
+        # PRAGMA optimize on a fresh connection analyzes nothing, since no
+        # queries have run on it yet
+        with self.engine.connect() as conn:
+            conn.execute(text("ANALYZE sessions"))
+            conn.commit()
+
         # Session factory
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
 
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record):
+        """Apply per-connection PRAGMAs when the pool opens a new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout=2000")  # 2 second retry
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Faster writes, still safe with WAL
+        cursor.execute("PRAGMA cache_size=-8000")  # ~8 MB page cache for the per-event reads
+        cursor.execute("PRAGMA temp_store=MEMORY")  # Sorts/temp indexes never touch disk
+        cursor.execute("PRAGMA mmap_size=67108864")  # Map up to 64 MB; reads skip the read() syscall
+        cursor.close()
+
+    def _read_rows(self, statement, params: dict) -> list:
+        """
+        Run a pre-built SELECT on a pooled DB-API connection and return plain tuples.
+
+        The per-event lookups (routes, DM targets, user mode) go through here
+        rather than engine.connect(): skipping SQLAlchemy's Connection and
+        Result wrappers makes each read roughly 3x cheaper, while keeping the
+        pool and its per-connection PRAGMAs. sqlite3 binds the statements'
+        :named parameters itself.
+        """
+        dbapi_connection = self.engine.raw_connection()
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                return cursor.execute(statement.text, params).fetchall()
+            finally:
+                cursor.close()
+        finally:
+            dbapi_connection.close()  # Returns it to the pool
+
     def _run_migrations(self):
         """
         Apply database migrations for schema changes.
@@ -279,6 +366,23 @@ class RegistryDatabase:
                 conn.execute(text("ALTER TABLE sessions ADD COLUMN permission_message_ts VARCHAR(50)"))
                 conn.commit()
 
+            # Add composite index for active-session listing (status filter + created_at sort)
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_status_created ON sessions(status, created_at)"))
+            conn.commit()
+
+            # Add composite indexes for the listener's per-event routing lookups
+            if 'slack_thread_ts' in columns and 'slack_channel' in columns:
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_sessions_thread_active ON sessions(slack_thread_ts, status)"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_sessions_channel_thread_active "
+                    "ON sessions(slack_channel, slack_thread_ts, status)"
+                ))
+                # Superseded by idx_sessions_thread_active, which covers the same prefix
+                conn.execute(text("DROP INDEX IF EXISTS idx_slack_thread"))
+                conn.commit()
+
             # Create dm_subscriptions table if not exists
             result = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='dm_subscriptions'"))
             if not result.fetchone():
@@ -366,6 +470,42 @@ class RegistryDatabase:
             records = query.order_by(SessionRecord.created_at.desc()).all()
             return [r.to_dict() for r in records]
 
+    def search_sessions(self, query: str = '', status: str = 'active', limit: int = 100,
+                        columns: tuple = None) -> list:
+        """
+        Search sessions by project name or session ID prefix.
+
+        Used by the Slack external_select options handler so the session picker
+        is filtered in SQL instead of materializing every session.
+
+        Args:
+            query: Case-insensitive substring of project, or session ID prefix
+            status: Filter by status (default: 'active', None for all)
+            limit: Maximum number of results (Slack caps select options at 100)
+            columns: Optional SessionRecord column names to load; the dicts then
+                hold only those keys and no full records are built
+
+        Returns:
+            List of session dicts, most recent first
+        """
+        with self.session_scope() as session:
+            if columns:
+                q = session.query(*(getattr(SessionRecord, name) for name in columns))
+            else:
+                q = session.query(SessionRecord)
+            if status:
+                q = q.filter_by(status=status)
+            if query:
+                # autoescape: % and _ in the user's text match literally
+                q = q.filter(or_(
+                    SessionRecord.project.icontains(query, autoescape=True),
+                    SessionRecord.session_id.startswith(query, autoescape=True)
+                ))
+            records = q.order_by(SessionRecord.created_at.desc()).limit(limit).all()
+            if columns:
+                return [dict(zip(columns, row)) for row in records]
+            return [r.to_dict() for r in records]
+
     def create_session(self, session_data: dict) -> dict:
         """Create a new session record"""
         with self.session_scope() as session:
@@ -407,6 +547,29 @@ class RegistryDatabase:
                 record.last_activity = datetime.now()
             return True
 
+    def set_reply_to_ts(self, session_id: str, reply_to_ts: str) -> bool:
+        """
+        Set the message a session's next response threads to.
+
+        Equivalent to update_session(session_id, {'reply_to_ts': ...}), but as
+        one UPDATE instead of loading the SessionRecord first, since the Slack
+        listener does this for every message it delivers.
+
+        Args:
+            session_id: Session ID
+            reply_to_ts: Slack message timestamp (or None to clear)
+
+        Returns:
+            True if the session exists
+        """
+        params = {
+            'target_session_id': session_id,
+            'reply_to_ts': reply_to_ts,
+            'last_activity': datetime.now(),
+        }
+        with self.engine.begin() as conn:
+            return conn.execute(_UPDATE_REPLY_TO_TS, params).rowcount > 0
+
     def delete_session(self, session_id: str) -> bool:
         """Delete a session record"""
         with self.session_scope() as session:
@@ -422,6 +585,59 @@ class RegistryDatabase:
             record = session.query(SessionRecord).filter_by(slack_thread_ts=thread_ts).first()
             return record.to_dict() if record else None
 
+    def get_session_id_for_thread(self, thread_ts: str) -> str:
+        """
+        Get the session_id registered for a Slack thread.
+
+        Same match as get_by_thread(), but reads the one column the Slack
+        listener needs with a pre-built statement instead of hydrating a
+        SessionRecord.
+
+        Args:
+            thread_ts: Slack thread timestamp
+
+        Returns:
+            Session ID, or None if no session owns the thread
+        """
+        rows = self._read_rows(_SELECT_THREAD_SESSION_ID, {'thread_ts': thread_ts})
+        return rows[0][0] if rows else None
+
+    def get_thread_route(self, thread_ts: str) -> tuple:
+        """
+        Get (session_id, socket_path) for the active session in a Slack thread.
+
+        Used by the Slack listener on every threaded event, so it fetches a
+        single plain row from a pre-built statement instead of hydrating
+        SessionRecords. The wrapper session is preferred over its Claude UUID
+        session, in SQL.
+
+        Args:
+            thread_ts: Slack thread timestamp
+
+        Returns:
+            (session_id, socket_path) tuple, or None if no active session has a socket
+        """
+        rows = self._read_rows(_SELECT_THREAD_ROUTE, {'thread_ts': thread_ts})
+        return rows[0] if rows else None
+
+    def get_channel_routes(self, channel: str, channel_name: str = None) -> list:
+        """
+        Get (session_id, socket_path) for active custom channel sessions.
+
+        Custom channel sessions have no thread_ts. The channel may be stored as
+        an ID or a name, so both are matched. All candidates are returned (the
+        caller skips ones whose socket is gone), wrapper sessions first.
+
+        Args:
+            channel: Slack channel ID or name
+            channel_name: Resolved channel name (defaults to channel)
+
+        Returns:
+            List of (session_id, socket_path) tuples, preferred first
+        """
+        params = {'channel': channel, 'channel_name': channel_name or channel}
+        return self._read_rows(_SELECT_CHANNEL_ROUTES, params)
+
     def get_by_project_dir(self, project_dir: str, status: str = 'active') -> dict:
         """
         Get the most recent session for a project directory.
@@ -604,6 +820,28 @@ class RegistryDatabase:
             session.flush()
             return pref.to_dict()
 
+    def get_dm_route(self, user_id: str) -> tuple:
+        """
+        Get where a user's plain DM messages go, in a single query.
+
+        Combines get_dm_subscription_for_user(), get_session() and
+        get_user_mode() for the Slack listener, which needs all three for
+        every DM it forwards.
+
+        Args:
+            user_id: Slack user ID
+
+        Returns:
+            (session_id, socket_path, mode) if the user is attached, else None.
+            socket_path is None if the session no longer exists; mode
+            defaults to 'execute'.
+        """
+        rows = self._read_rows(_SELECT_DM_ROUTE, {'user_id': user_id})
+        if not rows:
+            return None
+        session_id, socket_path, mode = rows[0]
+        return session_id, socket_path, mode or 'execute'
+
     def get_user_mode(self, user_id: str) -> str:
         """
         Get a user's current interaction mode.
@@ -614,8 +852,8 @@ class RegistryDatabase:
         Returns:
             Mode string (defaults to 'execute' if not set)
         """
-        pref = self.get_user_preference(user_id)
-        return pref['mode'] if pref else 'execute'
+        rows = self._read_rows(_SELECT_USER_MODE, {'user_id': user_id})
+        return (rows[0][0] if rows else None) or 'execute'
 
     # ─────────────────────────────────────────────────────────────────────────
     # AskUserQuestion Methods
@@ -801,8 +1039,6 @@ class RegistryDatabase:
             return count
 
 
-from datetime import timedelta
-
 if __name__ == '__main__':
     # Test the database
     import os
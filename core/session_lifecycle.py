@@ -175,7 +175,6 @@ class SessionLifecycle:
         # Update activity in registry
         if self.registry:
             # Use registry's database backend to update last_activity timestamp
-            from datetime import datetime
             self.registry.db.update_session(self.session_id, {'last_activity': datetime.now()})
 
         # Auto-transition from IDLE to ACTIVE
@@ -0,0 +1,160 @@
+"""
+HTTP keep-alive for the Slack SDK's urllib-based WebClient.
+
+slack_sdk's WebClient sends every Web API call through urllib's urlopen(),
+which opens a new TCP connection - and TLS handshake - per call and closes
+it afterwards. Bolt also builds a fresh WebClient for every event, so a
+pool on app.client alone would not be reused.
+
+install_keepalive_transport() replaces the SDK's request method so every
+WebClient in the process keeps one persistent HTTP/1.1 connection per thread
+and host. Listener worker threads then pay the handshake once instead of on
+every chat.update / reactions.add / views.open.
+
+Connections are per thread because http.client connections are not
+thread-safe. A connection that the server has closed while idle, or that
+sat idle longer than IDLE_TIMEOUT, is reopened before use rather than
+retried after a failure, so non-idempotent calls (chat.postMessage) are
+never sent twice.
+
+The replaced method is private to slack_sdk, so install_keepalive_transport()
+checks the SDK version and the method's signature first and leaves the stock
+urllib transport in place (logging why) if either has changed.
+"""
+
+import inspect
+import io
+import logging
+import select
+import threading
+import time
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+from slack_sdk.version import __version__ as SLACK_SDK_VERSION
+from slack_sdk.web.base_client import BaseClient
+
+
+log = logging.getLogger(__name__)
+
+# Reopen connections idle for longer than this instead of risking one the
+# server is about to drop
+IDLE_TIMEOUT = 30.0
+
+# The private method replaced below takes (url, req) and returns a
+# {status, headers, body} dict in the slack_sdk releases this was written
+# against (3.21 through 3.x; requirements.txt pins <4)
+SUPPORTED_SDK_MAJOR = 3
+_EXPECTED_PARAMS = ("self", "url", "req")
+
+_urllib_request = getattr(BaseClient, "_perform_urllib_http_request_internal", None)
+_local = threading.local()
+
+
+def _connection_dropped(conn) -> bool:
+    """True if an idle connection's socket is readable, i.e. the server closed it."""
+    if conn.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _get_connection(scheme, netloc, ssl_context, timeout):
+    """Return this thread's connection for (scheme, netloc), reopening it if stale."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    key = (scheme, netloc, id(ssl_context), timeout)
+    entry = connections.get(key)
+    now = time.monotonic()
+    if entry is not None:
+        conn, last_used = entry
+        if now - last_used > IDLE_TIMEOUT or _connection_dropped(conn):
+            # http.client reconnects on the next request once closed
+            conn.close()
+    else:
+        if scheme == "https":
+            conn = HTTPSConnection(netloc, timeout=timeout, context=ssl_context)
+        else:
+            conn = HTTPConnection(netloc, timeout=timeout)
+    connections[key] = (conn, now)
+    return conn
+
+
+def _discard_connection(scheme, netloc, ssl_context, timeout):
+    """Close and forget this thread's connection after a failed request."""
+    connections = getattr(_local, "connections", {})
+    entry = connections.pop((scheme, netloc, id(ssl_context), timeout), None)
+    if entry is not None:
+        entry[0].close()
+
+
+def _perform_keepalive_request(self, url, req):
+    """
+    Drop-in for BaseClient._perform_urllib_http_request_internal over a kept-alive connection.
+
+    Returns the same {status, headers, body} dict and raises HTTPError for
+    non-2xx responses, as urlopen() does, so the SDK's retry handlers and
+    error parsing work unchanged. Proxied clients use the original urllib path.
+    """
+    parts = urlsplit(url)
+    if self.proxy is not None or parts.scheme not in ("http", "https"):
+        return _urllib_request(self, url, req)
+
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = _get_connection(parts.scheme, parts.netloc, self.ssl, self.timeout)
+    try:
+        conn.request(req.get_method(), path, body=req.data, headers=dict(req.header_items()))
+        resp = conn.getresponse()
+        body = resp.read()
+    except Exception:
+        _discard_connection(parts.scheme, parts.netloc, self.ssl, self.timeout)
+        raise
+
+    if not 200 <= resp.status < 300:
+        raise HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+
+    if resp.headers.get_content_type() == "application/gzip":
+        # admin.analytics.getFile
+        return {"status": resp.status, "headers": resp.headers, "body": body}
+    charset = resp.headers.get_content_charset() or "utf-8"
+    return {"status": resp.status, "headers": resp.headers, "body": body.decode(charset)}
+
+
+def _sdk_incompatibility():
+    """Return why this slack_sdk can't take the keep-alive transport, or None if it can."""
+    major = SLACK_SDK_VERSION.split(".", 1)[0]
+    if major != str(SUPPORTED_SDK_MAJOR):
+        return f"slack_sdk {SLACK_SDK_VERSION} is not a {SUPPORTED_SDK_MAJOR}.x release"
+    if _urllib_request is None:
+        return "BaseClient._perform_urllib_http_request_internal no longer exists"
+    try:
+        params = tuple(inspect.signature(_urllib_request).parameters)
+    except (TypeError, ValueError):
+        params = None
+    if params != _EXPECTED_PARAMS:
+        return f"BaseClient._perform_urllib_http_request_internal takes {params}, expected {_EXPECTED_PARAMS}"
+    return None
+
+
+def install_keepalive_transport() -> bool:
+    """
+    Route all WebClient requests in this process over kept-alive connections.
+
+    Returns:
+        True if the transport was installed, False if it already was or the
+        installed slack_sdk is not one it was written against
+    """
+    if BaseClient._perform_urllib_http_request_internal is _perform_keepalive_request:
+        return False
+    reason = _sdk_incompatibility()
+    if reason is not None:
+        log.warning("⚠️  Keeping urllib for Slack API calls - %s", reason)
+        return False
+    BaseClient._perform_urllib_http_request_internal = _perform_keepalive_request
+    return True
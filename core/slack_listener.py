@@ -40,16 +40,49 @@ Registry Database:
 import os
 import sys
 import json
+import logging
+import queue
+import re
 import time
 import fcntl
 import socket as sock_module
+import ssl
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from types import MappingProxyType
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
+from slack_bolt.middleware import IgnoringSelfEvents
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
 from registry_db import RegistryDatabase
-from config import get_registry_db_path, get_socket_dir
+from dm_mode import (
+    parse_dm_command,
+    format_session_list_for_slack,
+    list_active_sessions,
+    attach_to_session,
+    detach_from_session,
+    handle_mode_command,
+    get_mode_prompt
+)
+from config import get_registry_db_path, get_socket_dir, get_listener_concurrency, get_listener_log_level
+from ttl_cache import TTLCache
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from rate_limiter import TokenBucket
+from slack_keepalive import install_keepalive_transport
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    # Optional - Slack payloads fall back to stdlib json
+    orjson = None
+
 # AskUserQuestion response handling
 ASKUSER_RESPONSE_DIR = Path.home() / ".claude" / "slack" / "askuser_responses"
 ASKUSER_RESPONSE_DIR.mkdir(parents=True, exist_ok=True)
@@ -64,6 +97,42 @@ RESPONSE_FILE = PROJECT_DIR / "slack_response.txt"
 SOCKET_DIR = get_socket_dir()
 SOCKET_PATH = os.environ.get("SLACK_SOCKET_PATH", os.path.join(SOCKET_DIR, "claude_slack.sock"))
 REGISTRY_DB_PATH = get_registry_db_path()  # Uses ~/.claude/slack/registry.db by default
+SLACK_APP_TOKEN = os.environ.get("SLACK_APP_TOKEN")  # Validated in main() - Socket Mode requires it
+# Socket Mode websocket reads: the SDK default (1 KB) takes several recv()
+# calls and frame-parse passes on the reader thread for a typical event
+# payload; one TLS record (16 KB) per read covers most events in one go
+SOCKET_MODE_RECEIVE_BUFFER = 16 * 1024
+
+# Per-event diagnostics are logged at DEBUG so a busy listener writes one line
+# per event by default (SLACK_LISTENER_LOG_LEVEL=DEBUG restores the full trace)
+log = logging.getLogger("slack_listener")
+if not log.handlers:
+    _log_handler = logging.StreamHandler(sys.stderr)
+    _log_handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_log_handler)
+log.setLevel(get_listener_log_level())
+
+
+@contextmanager
+def queued_logging():
+    """
+    Route the listener's log output through a queue drained by a background thread.
+
+    Handlers only enqueue records, so a burst of errors (e.g. every handler
+    failing during a Slack outage) doesn't block event threads on stderr writes.
+    The original handlers are restored, and pending records flushed, on exit.
+    """
+    handlers = list(log.handlers)
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    log.handlers = [QueueHandler(records)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        log.handlers = handlers
+
 
 # Initialize registry database - create directory and DB if needed
 registry_db = None
@@ -73,22 +142,82 @@ try:
     # Create directory if it doesn't exist
     if not os.path.exists(registry_dir):
         os.makedirs(registry_dir, exist_ok=True)
-        print(f"📁 Created registry directory: {registry_dir}", file=sys.stderr)
+        log.info("📁 Created registry directory: %s", registry_dir)
 
-    # Initialize database (creates tables if they don't exist)
-    registry_db = RegistryDatabase(REGISTRY_DB_PATH)
-    print(f"✅ Connected to registry database: {REGISTRY_DB_PATH}", file=sys.stderr)
+    # Initialize database (creates tables if they don't exist), with a
+    # connection per listener worker so concurrent handlers never queue for one
+    registry_db = RegistryDatabase(REGISTRY_DB_PATH, pool_size=get_listener_concurrency())
+    log.info("✅ Connected to registry database: %s", REGISTRY_DB_PATH)
 except Exception as e:
-    print(f"⚠️  Failed to initialize registry database: {e}", file=sys.stderr)
-    print(f"   Falling back to hard-coded socket path", file=sys.stderr)
+    log.warning("⚠️  Failed to initialize registry database: %s", e)
+    log.warning("   Falling back to hard-coded socket path")
+
+
+class _OrjsonJSON:
+    """Stand-in for the json module that encodes with orjson and defers everything else to json."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        try:
+            return orjson.dumps(obj)  # bytes - the SDK sends these without re-encoding
+        except TypeError:
+            return json.dumps(obj, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+
+def install_orjson_encoder() -> bool:
+    """
+    Make the Slack WebClient serialize JSON request bodies with orjson.
+
+    views_open / chat_postMessage payloads are nested block dicts, which orjson
+    encodes several times faster than stdlib json. Only the SDK's base_client
+    module is affected; the global json module is left untouched.
+
+    Returns:
+        True if orjson was installed, False if orjson is not available
+    """
+    if orjson is None:
+        return False
+
+    from slack_sdk.web import base_client
+    base_client.json = _OrjsonJSON()
+    return True
+
+
+# One TLS context for every Slack Web API call. Without it urllib creates a new
+# context - re-reading the CA bundle - for each HTTPS connection. Bolt copies
+# the app client's ssl setting into the per-request clients handed to listeners.
+# install_keepalive_transport() (slack_keepalive) keeps those connections open
+# per worker thread, so the handshake itself is paid once per thread.
+SLACK_SSL_CONTEXT = ssl.create_default_context()
+
+
+def create_web_client(token):
+    """Create a WebClient that reuses SLACK_SSL_CONTEXT for its HTTPS connections."""
+    return WebClient(token=token, ssl=SLACK_SSL_CONTEXT)
+
 
 # Initialize Slack app
 # Note: We defer the sys.exit() to main() so that tests can import this module
 # without requiring SLACK_BOT_TOKEN to be set
 _slack_app_error = None
-try:
-    app = App(token=os.environ["SLACK_BOT_TOKEN"])
-except KeyError:
+SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
+if SLACK_BOT_TOKEN:
+    # Bolt runs listeners (and lazy listeners) on this executor, after the Socket
+    # Mode client's own worker pool has dispatched the event - size both alike
+    app = App(
+        client=create_web_client(SLACK_BOT_TOKEN),
+        listener_executor=ThreadPoolExecutor(
+            max_workers=get_listener_concurrency(), thread_name_prefix="slack-listener"
+        ),
+        # Replaced by RememberOwnMessages, which drops the same events
+        ignoring_self_events_enabled=False,
+    )
+    install_orjson_encoder()
+    install_keepalive_transport()
+else:
     _slack_app_error = "SLACK_BOT_TOKEN environment variable not set"
     # Create a dummy app for testing - decorators will work but do nothing
     class _DummyClient:
@@ -101,19 +230,63 @@ except KeyError:
         """Dummy App class that accepts decorators but does nothing."""
         def __init__(self):
             self.client = _DummyClient()
-        def event(self, *args, **kwargs):
-            return lambda f: f
-        def action(self, *args, **kwargs):
-            return lambda f: f
-        def message(self, *args, **kwargs):
-            return lambda f: f
-        def shortcut(self, *args, **kwargs):
-            return lambda f: f
-        def view(self, *args, **kwargs):
-            return lambda f: f
+        def _listener(self, *args, **kwargs):
+            # Supports both @app.event(...) and app.view(...)(ack=..., lazy=[...])
+            return lambda *functions, **listeners: functions[0] if functions else None
+        event = action = message = shortcut = view = options = use = _listener
     app = _DummyApp()
 
 
+# Bot user ID, resolved with auth.test on first use and reused for every event
+_bot_user_id = None
+_bot_mention = None
+
+
+def get_bot_user_id(client):
+    """
+    Return the bot's Slack user ID.
+
+    auth.test is only called until it succeeds once; the ID never changes for
+    the lifetime of the process, so per-event lookups are served from memory.
+
+    Args:
+        client: Slack WebClient
+
+    Returns:
+        str: Bot user ID
+
+    Raises:
+        Exception: If auth.test fails and no ID has been cached yet
+    """
+    global _bot_user_id
+    if _bot_user_id is None:
+        _bot_user_id = client.auth_test()["user_id"]
+    return _bot_user_id
+
+
+def get_bot_mention(client):
+    """
+    Return the bot's mention markup ("<@U...>"), built once from get_bot_user_id().
+
+    Raises:
+        Exception: If the bot user ID cannot be resolved yet
+    """
+    global _bot_mention
+    if _bot_mention is None:
+        _bot_mention = f"<@{get_bot_user_id(client)}>"
+    return _bot_mention
+
+
+def _ack_interaction(ack):
+    """
+    Acknowledge a button click, shortcut or view submission immediately.
+
+    Registered as the ack half of Bolt lazy listeners: the Slack 3-second ack
+    is sent right away and the handler body runs in Bolt's lazy listener runner.
+    """
+    ack()
+
+
 def atomic_write_response_file(response_file: Path, data: dict) -> bool:
     """Atomically write response data to file with locking.
 
@@ -138,11 +311,11 @@ def atomic_write_response_file(response_file: Path, data: dict) -> bool:
             with open(response_file, 'w') as f:
                 json.dump(data, f)
 
-            print(f"✅ Atomically wrote response file: {response_file}", file=sys.stderr)
+            log.debug("✅ Atomically wrote response file: %s", response_file)
             return True
 
     except Exception as e:
-        print(f"❌ Error in atomic write: {e}", file=sys.stderr)
+        log.error("❌ Error in atomic write: %s", e)
         return False
     finally:
         # Clean up lock file
@@ -153,7 +326,7 @@ def atomic_write_response_file(response_file: Path, data: dict) -> bool:
             pass
 
 
-def atomic_read_and_update_response_file(response_file: Path, update_data: dict) -> bool:
+def atomic_read_and_update_response_file(response_file: Path, update_data: dict):
     """Atomically read existing response, merge with new data, and write back.
 
     Uses a lock file pattern to prevent race conditions.
@@ -163,7 +336,8 @@ def atomic_read_and_update_response_file(response_file: Path, update_data: dict)
         update_data: Dictionary data to merge with existing data
 
     Returns:
-        bool: True if operation succeeded, False otherwise
+        dict: The merged data as written (so callers needn't read the file
+        back), or None if the update failed
     """
     lock_file = Path(str(response_file) + '.lock')
 
@@ -178,9 +352,9 @@ def atomic_read_and_update_response_file(response_file: Path, update_data: dict)
                 try:
                     with open(response_file) as f:
                         existing_data = json.load(f)
-                    print(f"📖 Loaded existing response: {existing_data}", file=sys.stderr)
+                    log.debug("📖 Loaded existing response: %s", existing_data)
                 except Exception as e:
-                    print(f"⚠️  Could not load existing response: {e}", file=sys.stderr)
+                    log.warning("⚠️  Could not load existing response: %s", e)
 
             # Merge new data
             existing_data.update(update_data)
@@ -189,12 +363,12 @@ def atomic_read_and_update_response_file(response_file: Path, update_data: dict)
             with open(response_file, 'w') as f:
                 json.dump(existing_data, f)
 
-            print(f"✅ Atomically updated response file: {response_file}", file=sys.stderr)
-            return True
+            log.debug("✅ Atomically updated response file: %s", response_file)
+            return existing_data
 
     except Exception as e:
-        print(f"❌ Error in atomic update: {e}", file=sys.stderr)
-        return False
+        log.error("❌ Error in atomic update: %s", e)
+        return None
     finally:
         # Clean up lock file
         try:
@@ -204,69 +378,217 @@ def atomic_read_and_update_response_file(response_file: Path, update_data: dict)
             pass
 
 
+# Routing lookups are memoized: a thread or channel keeps the same session for
+# its lifetime, so a conversation costs one registry query per TTL. Hits are
+# checked against the (cached) socket file, and send failures invalidate.
+ROUTE_CACHE_TTL = 30.0
+ROUTE_CACHE_NEGATIVE_TTL = 1.0
+_ROUTE_MISS = object()
+_thread_route_cache = TTLCache(maxsize=1024, ttl=ROUTE_CACHE_TTL)
+_channel_route_cache = TTLCache(maxsize=512, ttl=ROUTE_CACHE_TTL)
+
+
+def _cached_route(cache, key, lookup):
+    """
+    Return a cached (session_id, socket_path) route for key, calling lookup(key) on a miss.
+
+    Negative results (None) are cached with a shorter TTL so missing sessions
+    don't hammer the registry but new sessions are still picked up quickly.
+    Cached routes are only reused while their socket still exists, so a
+    session that ends is dropped without waiting for the TTL.
+    """
+    route = cache.get(key, _ROUTE_MISS)
+    if route is not _ROUTE_MISS:
+        if route is None or socket_exists(route[1]):
+            return route
+        cache.pop(key)
+
+    route = lookup(key)
+    cache.set(key, route, ttl=None if route else ROUTE_CACHE_NEGATIVE_TTL)
+    return route
+
+
+# Socket file existence, checked on every routed event (and per candidate
+# session in custom channels); a short TTL saves the repeated stat() calls
+SOCKET_EXISTS_TTL = 2.0
+_socket_exists_cache = TTLCache(maxsize=256, ttl=SOCKET_EXISTS_TTL)
+
+
+def socket_exists(socket_path: str) -> bool:
+    """os.path.exists() for session sockets, cached for SOCKET_EXISTS_TTL seconds."""
+    exists = _socket_exists_cache.get(socket_path)
+    if exists is None:
+        exists = os.path.exists(socket_path)
+        _socket_exists_cache.set(socket_path, exists)
+    return exists
+
+
+def socket_known_gone(socket_path: str) -> bool:
+    """
+    True if socket_path was recently found missing (by a stat or a failed send).
+
+    Senders check this instead of socket_exists(): connect() fails right away
+    with ENOENT/ECONNREFUSED for a missing socket, so a stat() before it
+    would only duplicate that check.
+    """
+    return _socket_exists_cache.get(socket_path) is False
+
+
+# Send errors meaning nobody is listening on the socket any more (file removed,
+# or left behind by a wrapper that exited)
+_SOCKET_GONE_ERRORS = (FileNotFoundError, ConnectionRefusedError)
+
+# Send errors from hitting SOCKET_SEND_TIMEOUT (SO_SNDTIMEO surfaces as EAGAIN):
+# the wrapper is alive but not reading, and a retry would block just as long
+_SOCKET_STALLED_ERRORS = (BlockingIOError, TimeoutError)
+
+
+def invalidate_socket_routes(socket_path: str, error: Exception = None) -> None:
+    """
+    Drop cached routes pointing at socket_path (e.g. after a failed send).
+
+    If error shows the socket is gone, it is also remembered as missing for
+    SOCKET_EXISTS_TTL, so the events that follow skip it without a stat() or
+    another connect(); other errors just force a fresh stat.
+    """
+    def points_at_socket(route):
+        return route is not None and route[1] == socket_path
+
+    _thread_route_cache.discard_if(points_at_socket)
+    _channel_route_cache.discard_if(points_at_socket)
+    _message_route_cache.discard_value(socket_path)
+    if isinstance(error, _SOCKET_GONE_ERRORS):
+        _socket_exists_cache.set(socket_path, False)
+    else:
+        _socket_exists_cache.pop(socket_path)
+
+
+def get_route_for_thread(thread_ts):
+    """
+    Look up (session_id, socket_path) for a Slack thread (cached for ROUTE_CACHE_TTL seconds)
+
+    See _lookup_route_for_thread() for the registry query.
+    """
+    if not registry_db:
+        log.warning("⚠️  No registry database - cannot lookup socket for thread %s", thread_ts)
+        return None
+
+    return _cached_route(_thread_route_cache, thread_ts, _lookup_route_for_thread)
+
+
 def get_socket_for_thread(thread_ts):
+    """Look up socket path for a Slack thread (see get_route_for_thread)."""
+    route = get_route_for_thread(thread_ts)
+    return route[1] if route else None
+
+
+def _lookup_route_for_thread(thread_ts):
     """
-    Look up socket path for a Slack thread using the registry database
+    Look up the session route for a Slack thread using the registry database
 
     Args:
         thread_ts: Slack thread timestamp (e.g., "1762285247.297999")
 
     Returns:
-        str: Socket path for the session, or None if not found
+        tuple: (session_id, socket_path) for the session, or None if not found
 
     Note:
         - Queries registry database to find session with matching thread_ts
         - Multiple sessions might have same thread_ts (wrapper + Claude UUID)
-        - Prefers session with shortest session_id (8 chars = wrapper)
-        - Falls back to any session if wrapper not found
+        - The query prefers the shortest session_id (8 chars = wrapper, which
+          owns the socket) and skips sessions without a socket path
     """
-    if not registry_db:
-        print(f"⚠️  No registry database - cannot lookup socket for thread {thread_ts}", file=sys.stderr)
+    try:
+        route = registry_db.get_thread_route(thread_ts)
+
+        if not route:
+            log.debug("⚠️  No active session with a socket found for thread %s", thread_ts)
+            return None
+
+        session_id, socket_path = route
+        log.debug("✅ Found socket for thread %s: %s (session %s)", thread_ts, socket_path, session_id)
+        return route
+
+    except Exception as e:
+        log.error("❌ Error querying registry for thread %s: %s", thread_ts, e)
         return None
 
-    try:
-        # Query all sessions with this thread_ts
-        # (there might be multiple: wrapper session + Claude UUID session)
-        with registry_db.session_scope() as session:
-            from registry_db import SessionRecord
-            records = session.query(SessionRecord).filter_by(
-                slack_thread_ts=thread_ts,
-                status='active'
-            ).all()
-
-            if not records:
-                print(f"⚠️  No active session found for thread {thread_ts}", file=sys.stderr)
-                return None
 
-            # Prefer the wrapper session (8 chars) over Claude UUID (36 chars)
-            # The wrapper session is the one that owns the socket
-            wrapper_session = None
-            fallback_session = None
+# Channel ID -> name, kept for the process lifetime (renames are rare and a
+# conversations.info call per routed event would hit Slack's rate limits;
+# handle_channel_rename keeps it current)
+_channel_name_cache = {}
 
-            for record in records:
-                if len(record.session_id) == 8:
-                    wrapper_session = record
-                    break
-                else:
-                    fallback_session = record
 
-            chosen = wrapper_session or fallback_session
+def resolve_channel_name(channel):
+    """
+    Resolve a Slack channel ID (C...) to its name, caching successful lookups.
 
-            if chosen:
-                print(f"✅ Found socket for thread {thread_ts}: {chosen.socket_path} (session {chosen.session_id})", file=sys.stderr)
-                return chosen.socket_path
-            else:
-                print(f"⚠️  Session found but no socket path for thread {thread_ts}", file=sys.stderr)
-                return None
+    Args:
+        channel: Slack channel ID or name
+
+    Returns:
+        str: Channel name, or the input unchanged if it isn't an ID or can't be resolved
+    """
+    if not channel or not channel.startswith('C'):
+        return channel
+
+    channel_name = _channel_name_cache.get(channel)
+    if channel_name:
+        return channel_name
 
+    try:
+        result = app.client.conversations_info(channel=channel)
+        if result.get("ok") and result.get("channel"):
+            channel_name = result["channel"].get("name", channel)
+            _channel_name_cache[channel] = channel_name
+            log.debug("📋 Resolved channel ID %s to name: %s", channel, channel_name)
+            return channel_name
     except Exception as e:
-        print(f"❌ Error querying registry for thread {thread_ts}: {e}", file=sys.stderr)
+        log.warning("⚠️  Could not resolve channel ID %s: %s", channel, e)
+
+    # Continue with the ID as fallback (not cached, so it is retried next time)
+    return channel
+
+
+@app.event("channel_rename")
+def handle_channel_rename(event):
+    """Keep the channel name cache (and routes resolved through it) current after a rename."""
+    channel = event.get("channel") or {}
+    channel_id = channel.get("id")
+    if not channel_id:
+        return
+
+    if channel.get("name"):
+        _channel_name_cache[channel_id] = channel["name"]
+    else:
+        _channel_name_cache.pop(channel_id, None)
+    _channel_route_cache.pop(channel_id)
+    log.info("📋 Channel %s renamed to %s", channel_id, channel.get('name'))
+
+
+def get_route_for_channel(channel):
+    """
+    Look up (session_id, socket_path) for a custom channel session (cached for ROUTE_CACHE_TTL seconds)
+
+    See _lookup_route_for_channel() for the registry query.
+    """
+    if not registry_db:
+        log.warning("⚠️  No registry database - cannot lookup socket for channel %s", channel)
         return None
 
+    return _cached_route(_channel_route_cache, channel, _lookup_route_for_channel)
+
 
 def get_socket_for_channel(channel):
+    """Look up socket path for a custom channel session (see get_route_for_channel)."""
+    route = get_route_for_channel(channel)
+    return route[1] if route else None
+
+
+def _lookup_route_for_channel(channel):
     """
-    Look up socket path for a custom channel session (where thread_ts is None).
+    Look up the session route for a custom channel session (where thread_ts is None).
 
     This is used for custom channel mode where messages are posted as top-level
     messages instead of in threads.
@@ -275,98 +597,131 @@ def get_socket_for_channel(channel):
         channel: Slack channel ID (e.g., "C1234567890") or channel name
 
     Returns:
-        str: Socket path for the session, or None if not found
+        tuple: (session_id, socket_path) for the session, or None if not found
 
     Note:
         - Only matches sessions where thread_ts is NULL (custom channel mode)
         - Prefers session with shortest session_id (8 chars = wrapper)
         - Resolves channel ID to name for matching (DB stores names)
     """
-    if not registry_db:
-        print(f"⚠️  No registry database - cannot lookup socket for channel {channel}", file=sys.stderr)
-        return None
-
     try:
         # Resolve channel ID to name if it looks like an ID (starts with C)
-        channel_name = channel
-        if channel and channel.startswith('C'):
-            try:
-                result = app.client.conversations_info(channel=channel)
-                if result.get("ok") and result.get("channel"):
-                    channel_name = result["channel"].get("name", channel)
-                    print(f"📋 Resolved channel ID {channel} to name: {channel_name}", file=sys.stderr)
-            except Exception as e:
-                print(f"⚠️  Could not resolve channel ID {channel}: {e}", file=sys.stderr)
-                # Continue with the ID as fallback
-
-        with registry_db.session_scope() as session:
-            from registry_db import SessionRecord
-            # Find sessions for this channel where thread_ts is NULL (custom channel mode)
-            # Try both channel ID and resolved name
-            records = session.query(SessionRecord).filter(
-                SessionRecord.slack_channel.in_([channel, channel_name]),
-                SessionRecord.slack_thread_ts.is_(None),
-                SessionRecord.status == 'active'
-            ).all()
-
-            if not records:
-                print(f"⚠️  No active custom channel session found for channel {channel} (name: {channel_name})", file=sys.stderr)
-                return None
+        channel_name = resolve_channel_name(channel)
 
-            # Prefer the wrapper session (8 chars) over Claude UUID (36 chars)
-            # BUT only if the socket file actually exists (filter out stale sessions)
-            wrapper_session = None
-            fallback_session = None
+        # Find sessions for this channel where thread_ts is NULL (custom channel mode)
+        # Try both channel ID and resolved name
+        routes = registry_db.get_channel_routes(channel, channel_name)
 
-            for record in records:
-                # Skip sessions whose socket doesn't exist (stale)
-                if not record.socket_path or not os.path.exists(record.socket_path):
-                    print(f"⚠️  Skipping stale session {record.session_id} - socket doesn't exist", file=sys.stderr)
-                    continue
-
-                if len(record.session_id) == 8:
-                    wrapper_session = record
-                    break
-                else:
-                    fallback_session = record
+        if not routes:
+            log.debug("⚠️  No active custom channel session found for channel %s (name: %s)", channel, channel_name)
+            return None
 
-            chosen = wrapper_session or fallback_session
+        # Routes come wrapper sessions (8 chars) first; take the first one
+        # whose socket file actually exists (filter out stale sessions)
+        for route in routes:
+            session_id, socket_path = route
+            if socket_exists(socket_path):
+                log.debug("✅ Found socket for custom channel %s: %s (session %s)", channel, socket_path, session_id)
+                return route
+            log.debug("⚠️  Skipping stale session %s - socket doesn't exist", session_id)
 
-            if chosen and chosen.socket_path:
-                print(f"✅ Found socket for custom channel {channel}: {chosen.socket_path} (session {chosen.session_id})", file=sys.stderr)
-                return chosen.socket_path
-            else:
-                print(f"⚠️  No session with existing socket found for channel {channel}", file=sys.stderr)
-                return None
+        log.debug("⚠️  No session with existing socket found for channel %s", channel)
+        return None
 
     except Exception as e:
-        print(f"❌ Error querying registry for channel {channel}: {e}", file=sys.stderr)
+        log.error("❌ Error querying registry for channel %s: %s", channel, e)
         return None
 
 
-def send_to_session_socket(text: str, socket_path: str) -> bool:
+# Payloads up to this size fit the default UDS send buffer; larger ones get SOCKET_SNDBUF
+SOCKET_SMALL_PAYLOAD = 64 * 1024
+SOCKET_SNDBUF = 1 << 20
+_MSG_NOSIGNAL = getattr(sock_module, "MSG_NOSIGNAL", 0)  # Not available on macOS
+_SOCK_NONBLOCK = getattr(sock_module, "SOCK_NONBLOCK", 0)  # Not available on macOS
+
+# Kernel-side bound on connect()/send() for wrapper sockets (struct timeval).
+# Unlike settimeout(), this keeps the socket blocking, so Python doesn't switch
+# it to non-blocking mode and poll() before every call.
+SOCKET_SEND_TIMEOUT = 5
+_SOCKET_SEND_TIMEVAL = struct.pack("ll", SOCKET_SEND_TIMEOUT, 0)
+
+
+def _send_socket_message(payload: bytes, socket_path: str) -> None:
+    """
+    Deliver one message to a session wrapper's Unix socket.
+
+    The wrappers treat each accepted connection as exactly one input (they read
+    it and close the connection), so the connection itself is the message frame
+    and cannot be kept open and reused across messages. The per-message cost is
+    kept to socket/connect/send/close. Bursts (rapid reactions/clicks) are not
+    coalesced either: each message must reach Claude as its own submitted
+    input, and the wrapper pauses between inputs anyway, so batching would
+    only add delay.
+
+    SOCK_STREAM is deliberate: macOS has no AF_UNIX SOCK_SEQPACKET, and
+    SOCK_DGRAM caps a message at net.local.dgram.maxdgram (2 KB by default),
+    which pasted logs and code routinely exceed.
+
+    Where SOCK_NONBLOCK exists (Linux), connect() and send() are first tried
+    without the SOCKET_SEND_TIMEOUT setup: an AF_UNIX connect either completes
+    or fails at once, and a message fits the fresh socket's buffer, so the
+    usual send costs no setsockopt(). Only a full listen backlog or send
+    buffer (EAGAIN) falls back to the blocking, time-bounded path.
+
+    Args:
+        payload: UTF-8 encoded message
+        socket_path: Path to the session's Unix socket
+
+    Raises:
+        OSError: If the socket cannot be reached or the send fails
+    """
+    # Context manager closes the fd on failure too (failed sends used to leak it)
+    with sock_module.socket(sock_module.AF_UNIX, sock_module.SOCK_STREAM | _SOCK_NONBLOCK) as client_socket:
+        if len(payload) > SOCKET_SMALL_PAYLOAD:
+            # Let large messages (pasted logs etc.) go out in one send
+            client_socket.setsockopt(sock_module.SOL_SOCKET, sock_module.SO_SNDBUF, SOCKET_SNDBUF)
+
+        connected = False
+        sent = 0
+        if _SOCK_NONBLOCK:
+            try:
+                client_socket.connect(socket_path)
+                connected = True
+                # A wrapper that exits mid-send must surface as EPIPE, never a SIGPIPE
+                sent = client_socket.send(payload, _MSG_NOSIGNAL)
+                if sent == len(payload):
+                    return
+            except BlockingIOError:
+                pass  # Wrapper is behind on accepting/reading - wait for it below
+            client_socket.setblocking(True)
+
+        client_socket.setsockopt(sock_module.SOL_SOCKET, sock_module.SO_SNDTIMEO, _SOCKET_SEND_TIMEVAL)
+        if not connected:
+            client_socket.connect(socket_path)
+        client_socket.sendall(memoryview(payload)[sent:], _MSG_NOSIGNAL)
+
+
+def send_to_session_socket(text, socket_path: str) -> bool:
     """
     Send a message directly to a session's Unix socket.
 
     Args:
-        text: Message to send
+        text: Message to send (str, or UTF-8 bytes already encoded by the caller)
         socket_path: Path to the session's Unix socket
 
     Returns:
         True if sent successfully, False otherwise
     """
-    if not socket_path or not os.path.exists(socket_path):
+    if not socket_path or socket_known_gone(socket_path):
         return False
 
+    payload = text if isinstance(text, bytes) else text.encode('utf-8')
     try:
-        client_socket = sock_module.socket(sock_module.AF_UNIX, sock_module.SOCK_STREAM)
-        client_socket.settimeout(5.0)
-        client_socket.connect(socket_path)
-        client_socket.sendall(text.encode('utf-8'))
-        client_socket.close()
+        _send_socket_message(payload, socket_path)
         return True
     except Exception as e:
-        print(f"⚠️  Failed to send to session socket: {e}", file=sys.stderr)
+        log.warning("⚠️  Failed to send to session socket: %s", e)
+        invalidate_socket_routes(socket_path, e)
         return False
 
 
@@ -385,29 +740,16 @@ def handle_dm_message(text: str, user_id: str, dm_channel_id: str, db, slack_cli
     Returns:
         True if message was handled (command or forwarded), False otherwise
     """
-    try:
-        from dm_mode import (
-            parse_dm_command,
-            format_session_list_for_slack,
-            attach_to_session,
-            detach_from_session,
-            handle_mode_command,
-            get_mode_prompt
-        )
-    except ImportError:
-        return False
-
     # Parse the command
     command = parse_dm_command(text)
     if command is None:
-        # Not a command - check if user is subscribed to a session
-        subscription = db.get_dm_subscription_for_user(user_id)
-        if subscription:
-            session_id = subscription.get('session_id')
-            session = db.get_session(session_id)
-            if session and session.get('socket_path'):
-                # Get user's mode and append mode prompt if not 'execute'
-                user_mode = db.get_user_mode(user_id)
+        # Not a command - check if user is subscribed to a session (subscription,
+        # session socket and user mode come back from one query)
+        dm_route = db.get_dm_route(user_id)
+        if dm_route:
+            _, socket_path, user_mode = dm_route
+            if socket_path:
+                # Append mode prompt if not 'execute'
                 message_to_send = text
                 if user_mode != 'execute':
                     mode_prompt = get_mode_prompt(user_mode)
@@ -415,7 +757,7 @@ def handle_dm_message(text: str, user_id: str, dm_channel_id: str, db, slack_cli
                         message_to_send = text + mode_prompt
 
                 # Forward message to session's socket
-                if send_to_session_socket(message_to_send, session['socket_path']):
+                if send_to_session_socket(message_to_send, socket_path):
                     mode_indicator = f" [{user_mode}]" if user_mode != 'execute' else ""
                     say(text=f"✅ Sent to Claude{mode_indicator}")
                     return True
@@ -466,86 +808,349 @@ def handle_dm_message(text: str, user_id: str, dm_channel_id: str, db, slack_cli
     return False
 
 
-def send_response(text, thread_ts=None, channel=None):
+def resolve_route(thread_ts=None, channel=None):
     """
-    Send response to Claude Code
+    Resolve where a message for this thread/channel should be delivered.
 
     Phase 3 Mode (registry-based, preferred):
         If thread_ts provided, lookup socket from registry by thread
-        If no thread_ts but channel provided, try custom channel lookup
+        If no thread_ts match but channel provided, try custom channel lookup
 
     Phase 2 Mode (legacy hard-coded):
         Send to hard-coded socket path (backward compatible)
 
-    Phase 1 Mode (fallback):
-        Write to file if socket doesn't exist
-        User must run /check to read response
-
     Args:
-        text: The response text to send
         thread_ts: Slack thread timestamp (for registry lookup)
         channel: Slack channel ID (for custom channel mode lookup)
 
     Returns:
-        str: Mode used ("registry_socket", "custom_channel_socket", "socket", or "file")
+        tuple: (socket_path, session_id, routing_mode). routing_mode is
+        "registry_socket" or "custom_channel_socket" for registry matches (with
+        the matched session_id), otherwise None; socket_path is None if no
+        socket is available.
     """
-    socket_path = None
-    routing_mode = None
-
     # Phase 3a: Try registry lookup by thread_ts first
     if thread_ts:
-        socket_path = get_socket_for_thread(thread_ts)
-        if socket_path:
-            print(f"📋 Using registry socket for thread {thread_ts}: {socket_path}", file=sys.stderr)
-            routing_mode = "registry_socket"
+        route = get_route_for_thread(thread_ts)
+        if route:
+            session_id, socket_path = route
+            log.debug("📋 Using registry socket for thread %s: %s", thread_ts, socket_path)
+            return socket_path, session_id, "registry_socket"
 
     # Phase 3b: Try custom channel lookup (where thread_ts is NULL)
-    if not socket_path and channel:
-        socket_path = get_socket_for_channel(channel)
-        if socket_path:
-            print(f"📋 Using custom channel socket for channel {channel}: {socket_path}", file=sys.stderr)
-            routing_mode = "custom_channel_socket"
+    if channel:
+        route = get_route_for_channel(channel)
+        if route:
+            session_id, socket_path = route
+            log.debug("📋 Using custom channel socket for channel %s: %s", channel, socket_path)
+            return socket_path, session_id, "custom_channel_socket"
 
     # Phase 2: Fall back to hard-coded socket path
-    if not socket_path:
-        socket_path = SOCKET_PATH if os.path.exists(SOCKET_PATH) else None
+    return (SOCKET_PATH if socket_exists(SOCKET_PATH) else None), None, None
 
-    # Try sending via socket with retries
-    if socket_path and os.path.exists(socket_path):
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Connect to wrapper's Unix socket
-                client_socket = sock_module.socket(sock_module.AF_UNIX, sock_module.SOCK_STREAM)
-                client_socket.settimeout(5.0)  # 5 second timeout
-                client_socket.connect(socket_path)
 
-                # Send response
-                client_socket.sendall(text.encode('utf-8'))
-                client_socket.close()
+# A session whose socket is found gone this many sends in a row is marked
+# inactive in the registry, so routing stops picking its leftover socket file
+SOCKET_GONE_THRESHOLD = 3
+_socket_gone_counts = {}
+# Listener threads count concurrently: the lock keeps increments from being
+# lost and lets exactly one of them reach the threshold and deactivate
+_socket_gone_lock = threading.Lock()
+
+
+def _record_socket_gone(socket_path, session_id):
+    """Count a send that found socket_path gone; deactivate its session at the threshold."""
+    with _socket_gone_lock:
+        count = _socket_gone_counts.get(socket_path, 0) + 1
+        if count < SOCKET_GONE_THRESHOLD or not (registry_db and session_id):
+            _socket_gone_counts[socket_path] = count
+            return
+        _socket_gone_counts.pop(socket_path, None)
+
+    try:
+        registry_db.update_session(session_id, {'status': 'inactive'})
+        log.warning("⚠️  Marked session %s inactive - socket %s is gone", session_id[:8], socket_path)
+    except Exception as e:
+        log.warning("⚠️  Could not mark session %s inactive: %s", session_id[:8], e)
+
+
+def _write_response_file(payload: bytes) -> None:
+    """
+    Replace RESPONSE_FILE's contents with payload.
+
+    Writes the already-encoded bytes straight to the fd, skipping the text
+    codec and buffered writer of open(..., "w"); this runs for every event
+    while no wrapper is reachable.
+
+    The fd is opened per write rather than cached: the reader
+    (hooks/slack_bidirectional.py) unlinks the file once consumed, and a
+    cached fd would keep writing to the deleted inode.
+    """
+    fd = os.open(RESPONSE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def send_response(text, thread_ts=None, channel=None, route=None):
+    """
+    Send response to Claude Code
+
+    Routes via resolve_route() (registry thread, custom channel, or legacy
+    socket) unless the caller already resolved the route.
+
+    Phase 1 Mode (fallback):
+        Write to file if socket doesn't exist
+        User must run /check to read response
+
+    Args:
+        text: The response text to send
+        thread_ts: Slack thread timestamp (for registry lookup)
+        channel: Slack channel ID (for custom channel mode lookup)
+        route: Optional (socket_path, session_id, routing_mode) from resolve_route()
+
+    Returns:
+        str: Mode used ("registry_socket", "custom_channel_socket", "socket", or "file")
+    """
+    if route is None:
+        route = resolve_route(thread_ts=thread_ts, channel=channel)
+    socket_path, session_id, routing_mode = route
+
+    # Try sending via socket, retrying once immediately (no sleep - this runs
+    # on a listener worker and a dead session shouldn't hold it for seconds).
+    # Only a dropped connection is retried; gone and timed-out sockets aren't.
+    if socket_path and not socket_known_gone(socket_path):
+        payload = text.encode('utf-8')
+        for attempt in range(2):
+            try:
+                # Send response to wrapper's Unix socket
+                _send_socket_message(payload, socket_path)
+                with _socket_gone_lock:
+                    _socket_gone_counts.pop(socket_path, None)
 
                 mode = routing_mode or "socket"
-                print(f"✅ Sent via {mode}: {text[:100]}", file=sys.stderr)
+                log.info("✅ Sent via %s: %s", mode, text[:100])
                 return mode
 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    backoff = 0.1 * (3 ** attempt)  # 0.1s, 0.3s, 0.9s
-                    print(f"⚠️  Socket attempt {attempt + 1} failed, retrying in {backoff}s: {e}", file=sys.stderr)
-                    import time
-                    time.sleep(backoff)
+            except OSError as e:
+                # Drop the cached route so the next event re-resolves it
+                invalidate_socket_routes(socket_path, e)
+                if isinstance(e, _SOCKET_GONE_ERRORS):
+                    # Nobody is listening - reconnecting would fail the same way
+                    log.warning("⚠️  Session socket is gone, falling back to file: %s", e)
+                    _record_socket_gone(socket_path, session_id)
+                    break
+                if isinstance(e, _SOCKET_STALLED_ERRORS):
+                    log.warning("⚠️  Session socket send timed out, falling back to file: %s", e)
+                    break
+                if attempt == 0:
+                    log.warning("⚠️  Socket send failed, reconnecting once: %s", e)
                 else:
-                    print(f"⚠️  Socket send failed after {max_retries} attempts, falling back to file: {e}", file=sys.stderr)
+                    log.warning("⚠️  Socket send failed after reconnect, falling back to file: %s", e)
                     # Fall through to file mode
 
     # Fall back to Phase 1 (file)
-    with open(RESPONSE_FILE, "w") as f:
-        f.write(text)
+    _write_response_file(text.encode('utf-8'))
 
-    print(f"✅ Wrote to file (Phase 1 - manual /check): {text[:100]}", file=sys.stderr)
+    log.info("✅ Wrote to file (Phase 1 - manual /check): %s", text[:100])
     return "file"
 
 
+# (channel, message_ts) -> parent thread_ts for messages the listener has seen,
+# so reaction routing doesn't need a conversations.history call
+MESSAGE_THREAD_CACHE_TTL = 24 * 60 * 60
+_message_thread_cache = TTLCache(maxsize=4096, ttl=MESSAGE_THREAD_CACHE_TTL)
+
+
+# (channel, message_ts) -> socket_path for user messages delivered to a session,
+# so reactions on them can skip routing entirely
+_message_route_cache = TTLCache(maxsize=4096, ttl=MESSAGE_THREAD_CACHE_TTL)
+
+
+# (channel, message_ts) of seen messages that aren't AskUserQuestion prompts, so
+# number-emoji reactions on them skip handle_askuser_reaction's history fetch
+# (a message's blocks keep their block_ids for its lifetime)
+_non_askuser_messages = TTLCache(maxsize=4096, ttl=MESSAGE_THREAD_CACHE_TTL)
+
+
+def remember_message_thread(event):
+    """
+    Record which thread a message event belongs to (the message itself if
+    top-level), and whether it is an AskUserQuestion prompt.
+    """
+    channel = event.get("channel")
+    message_ts = event.get("ts")
+    if channel and message_ts:
+        key = (channel, message_ts)
+        _message_thread_cache.set(key, event.get("thread_ts") or message_ts)
+        if not any(block.get("block_id", "").startswith("askuser_") for block in event.get("blocks") or ()):
+            _non_askuser_messages.set(key, True)
+
+
+class RememberOwnMessages(IgnoringSelfEvents):
+    """
+    Bolt's self-event filter, recording the thread of the bot's own posts first.
+
+    Permission and AskUser prompts are posted with this app's bot token, so
+    the stock IgnoringSelfEvents drops them before handle_message can call
+    remember_message_thread(), and every reaction to a prompt would need a
+    conversations.replies call to find its thread.
+    """
+
+    def process(self, *, req, resp, next):
+        event = req.body.get("event")
+        if (
+            event
+            and event.get("type") == "message"
+            and event.get("subtype") in (None, "bot_message")
+            and self._is_self_event(req.context.authorize_result, req.context.user_id, event.get("bot_id"), req.body)
+        ):
+            remember_message_thread(event)
+        return super().process(req=req, resp=resp, next=next)
+
+
+app.use(RememberOwnMessages())
+
+
+# Recently handled reaction_added events, keyed by (event_ts, user, item ts,
+# emoji): Slack redelivers an event it thinks wasn't acked, and each copy would
+# otherwise send the same input to Claude again
+REACTION_DEDUP_TTL = 10 * 60
+_seen_reactions = TTLCache(maxsize=1024, ttl=REACTION_DEDUP_TTL)
+
+
+# Reaction emoji names -> numeric permission responses (see handle_reaction)
+REACTION_EMOJI_MAP = MappingProxyType({
+    # Number emojis
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    # Thumbs emojis as shortcuts
+    "+1": "1",           # 👍 = approve
+    "thumbsup": "1",
+    "-1": "3",           # 👎 = deny
+    "thumbsdown": "3",
+    # Check/X emojis
+    "white_check_mark": "1",  # ✅ = approve
+    "x": "3",                  # ❌ = deny
+    "heavy_check_mark": "1",
+})
+
+# Confirmation-message indicator per send_response mode (other modes show 📁)
+MODE_EMOJI = MappingProxyType({"registry_socket": "📋", "socket": "⚡"})
+
+
+# Circuit breakers for interactive Slack API calls, one per endpoint
+SLACK_BREAKER_THRESHOLD = 5  # consecutive outage-type failures before failing fast
+SLACK_BREAKER_RESET = 30.0   # seconds to fail fast before trying the endpoint again
+_slack_breakers = {}
+
+# Local rate limits per endpoint, matching Slack's published tiers
+# (Tier 3 ~50/min, Tier 4 ~100/min, chat.postMessage ~1/s). Bursts up to the
+# capacity go straight through; beyond that calls are spaced out locally.
+_slack_buckets = {
+    "chat.update": TokenBucket(50 / 60, 50),
+    "chat.delete": TokenBucket(50 / 60, 50),
+    "views.open": TokenBucket(100 / 60, 100),
+    "chat.postMessage": TokenBucket(60 / 60, 60),
+    "conversations.open": TokenBucket(50 / 60, 50),
+}
+
+
+def _is_slack_outage(error):
+    """True for errors that say Slack is unreachable or overloaded, not that the request was bad."""
+    if isinstance(error, SlackApiError):
+        status = getattr(error.response, "status_code", 0) or 0
+        return status == 429 or status >= 500
+    return isinstance(error, OSError)  # timeouts, connection resets, DNS failures
+
+
+def slack_api_call(endpoint, method, **kwargs):
+    """
+    Call a Slack WebClient method through the endpoint's circuit breaker.
+
+    While an endpoint is failing (timeouts, 429s, 5xx) the breaker opens and
+    calls fail immediately with CircuitOpenError instead of waiting out the
+    HTTP timeout. Callers already treat these calls as best-effort and catch
+    exceptions, so an open breaker is logged and skipped like any other error.
+    Calls are also paced by the endpoint's token bucket, so bursts wait
+    locally instead of drawing 429s. Calls carrying a trigger_id never wait:
+    the trigger expires 3 seconds after the interaction, so they take a token
+    if one is free and otherwise go straight through.
+
+    Args:
+        endpoint: Slack API method name, e.g. "chat.update"
+        method: Bound WebClient method to call
+        **kwargs: Arguments for the method
+
+    Returns:
+        The method's SlackResponse
+    """
+    breaker = _slack_breakers.get(endpoint)
+    if breaker is None:
+        breaker = _slack_breakers.setdefault(
+            endpoint, CircuitBreaker(SLACK_BREAKER_THRESHOLD, SLACK_BREAKER_RESET)
+        )
+    if not breaker.allow():
+        raise CircuitOpenError(f"{endpoint} is failing, skipping call for now")
+
+    bucket = _slack_buckets.get(endpoint)
+    if bucket is not None and "trigger_id" in kwargs:
+        if not bucket.try_take():
+            log.debug("⏳ %s: rate limit bucket empty, calling anyway before the trigger expires", endpoint)
+    elif bucket is not None:
+        waited = bucket.take()
+        if waited:
+            log.debug("⏳ %s: waited %.2fs for rate limit", endpoint, waited)
+
+    try:
+        result = method(**kwargs)
+    except Exception as e:
+        if _is_slack_outage(e):
+            breaker.record_failure()
+        else:
+            # Slack answered (e.g. message_not_found) - the endpoint itself is healthy
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return result
+
+
+# Side Slack calls (confirmation reactions, prompt cleanup and its registry
+# update) run here so they overlap the socket send instead of adding to the
+# handler's time
+_slack_call_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="slack-call")
+
+
+def _add_reaction(channel, timestamp, name):
+    try:
+        app.client.reactions_add(channel=channel, timestamp=timestamp, name=name)
+    except Exception as e:
+        log.warning("⚠️  Warning: Could not add reaction: %s", e)
+
+
+def add_reaction_async(channel, timestamp, name="white_check_mark"):
+    """
+    Add a reaction to a message without waiting for the Slack API call.
+
+    Failures are logged, never raised.
+
+    Returns:
+        Future for the reactions.add call
+    """
+    return _slack_call_pool.submit(_add_reaction, channel, timestamp, name)
+
+
+# Everything up to and including the first mention, plus the whitespace and
+# punctuation after it, in a single pass
+_MENTION_PREFIX_RE = re.compile(r'^(?:[^>]*>)?[\s,:]*')
+
+
 @app.event("app_mention")
 def handle_mention(event, say):
     """
@@ -559,13 +1164,11 @@ def handle_mention(event, say):
     text = event.get("text", "")
     channel = event.get("channel")
     thread_ts = event.get("thread_ts")  # Extract thread timestamp
+    remember_message_thread(event)
 
-    # Remove bot mention from text
+    # Remove bot mention (and the comma/colon that may follow it) from text
     # Format is typically: "<@U12345>, your message here" or "<@U12345> your message here"
-    clean_text = text.split(">", 1)[-1].strip()
-
-    # Remove leading punctuation (comma, colon, etc.) that may follow the mention
-    clean_text = clean_text.lstrip(',: ').strip()
+    clean_text = _MENTION_PREFIX_RE.sub('', text, count=1).rstrip()
 
     if not clean_text:
         say("👋 Hi! Send me a message and I'll forward it to Claude Code.")
@@ -574,18 +1177,11 @@ def handle_mention(event, say):
     # Send response to Claude Code (registry socket, custom channel socket, legacy socket, or file)
     mode = send_response(clean_text, thread_ts=thread_ts, channel=channel)
 
-    # Acknowledge with reaction
-    try:
-        app.client.reactions_add(
-            channel=channel,
-            timestamp=event["ts"],
-            name="white_check_mark"
-        )
-    except Exception as e:
-        print(f"⚠️  Warning: Could not add reaction: {e}", file=sys.stderr)
+    # Acknowledge with reaction (in the background, overlapping the confirmation post)
+    add_reaction_async(channel, event["ts"])
 
     # Confirm receipt with mode indicator (post to thread if in thread, otherwise channel)
-    mode_emoji = "📋" if mode == "registry_socket" else ("⚡" if mode == "socket" else "📁")
+    mode_emoji = MODE_EMOJI.get(mode, "📁")
     confirm_msg = f"✅ {mode_emoji} Got it! Sent to Claude: `{clean_text[:100]}`"
     thread_info = f" (thread {thread_ts})" if thread_ts else ""
 
@@ -595,7 +1191,13 @@ def handle_mention(event, say):
     else:
         # Post confirmation in the channel
         say(confirm_msg)
-    print(f"📝 Sent mention from user {user}{thread_info}: {clean_text[:100]}")
+    log.info("📝 Sent mention from user %s%s: %s", user, thread_info, clean_text[:100])
+
+
+# Message subtypes handle_message never routes (bot posts, join/leave notices)
+IGNORED_MESSAGE_SUBTYPES = frozenset({
+    "bot_message", "channel_join", "channel_leave", "group_join", "group_leave",
+})
 
 
 @app.event("message")
@@ -613,13 +1215,13 @@ def handle_message(event, say):
     - Channel messages with command prefix (/, !, or digits)
     - Threaded messages (uses registry to route to correct session)
     """
-    # Ignore bot messages
-    if event.get("bot_id") or event.get("subtype") == "bot_message":
-        return
+    # Remember the thread of every message that reaches a listener, other bots'
+    # posts included (this bot's own prompts are dropped before here and are
+    # recorded by RememberOwnMessages instead): reactions are routed by thread
+    remember_message_thread(event)
 
-    # Ignore join/leave messages
-    subtype = event.get("subtype")
-    if subtype in ("channel_join", "channel_leave", "group_join", "group_leave"):
+    # Ignore bot messages and join/leave notices
+    if event.get("bot_id") or event.get("subtype") in IGNORED_MESSAGE_SUBTYPES:
         return
 
     text = event.get("text", "").strip()
@@ -636,7 +1238,7 @@ def handle_message(event, say):
         result = handle_askuser_thread_reply(event, app.client)
         if result:
             # This was an AskUser "Other" response, handled
-            print(f"💬 Handled as AskUser 'Other' response", file=sys.stderr)
+            log.debug("💬 Handled as AskUser 'Other' response")
             return
 
     # Check if this is a DM channel and try to handle as DM command
@@ -644,31 +1246,21 @@ def handle_message(event, say):
         if handle_dm_message(text, user, channel, registry_db, app.client, say):
             return  # DM command handled, don't process further
 
-    # Ignore messages with @mentions - those are handled by app_mention handler
-    # This prevents duplicate processing when someone @mentions the bot
-    if "<@" in text and ">" in text:
-        # Check if it's a bot mention (not just any user mention)
-        try:
-            bot_user_id = app.client.auth_test()["user_id"]
-            if f"<@{bot_user_id}>" in text:
-                print(f"📝 Skipping message with bot mention (handled by app_mention)", file=sys.stderr)
-                return
-        except Exception:
-            pass  # If we can't check, let it through
-
     # Only process direct messages or messages in channels we're monitoring
     # This prevents responding to every message in every channel
     is_dm = channel_type == "im"
 
+    # Resolve the target session once; it decides custom channel mode, the
+    # socket send, and which session gets reply_to_ts. A DM is never a custom
+    # channel, so it skips the channel lookup.
+    route = resolve_route(thread_ts=thread_ts, channel=None if is_dm else channel)
+    _, session_id, routing_mode = route
+
     # For channel messages (not in threads), check if this is a custom channel session
     # Custom channel mode: messages are top-level, not threaded
-    is_custom_channel = False
-    if not is_dm and not thread_ts and channel:
-        # Check if there's an active custom channel session for this channel
-        socket_path = get_socket_for_channel(channel)
-        if socket_path:
-            is_custom_channel = True
-            print(f"📋 Custom channel mode detected for {channel}", file=sys.stderr)
+    is_custom_channel = not is_dm and not thread_ts and routing_mode == "custom_channel_socket"
+    if is_custom_channel:
+        log.debug("📋 Custom channel mode detected for %s", channel)
 
     # For channel messages (not in threads and not custom channel), only process command-like messages
     # For threaded messages and custom channels, process all messages (they're replies to Claude)
@@ -678,56 +1270,40 @@ def handle_message(event, say):
         if not (text.startswith('/') or text.startswith('!') or text.isdigit()):
             return
 
+    # Ignore messages with @mentions - those are handled by app_mention handler
+    # (checked after the cheap filters above, which reject most channel chatter)
+    # This prevents duplicate processing when someone @mentions the bot
+    try:
+        if get_bot_mention(app.client) in text:
+            log.debug("📝 Skipping message with bot mention (handled by app_mention)")
+            return
+    except Exception:
+        pass  # If we can't check, let it through
+
     # Send response to Claude Code (registry socket, custom channel socket, legacy socket, or file)
-    mode = send_response(text, thread_ts=thread_ts, channel=channel)
+    mode = send_response(text, thread_ts=thread_ts, channel=channel, route=route)
 
     # Store the message ts so Claude's response can be threaded to it
     message_ts = event.get("ts")
-    if message_ts and registry_db:
+    if message_ts and routing_mode and mode == routing_mode:
+        _message_route_cache.set((channel, message_ts), route[0])
+    # A threaded message can fall through to the channel route; only the
+    # session that owns the thread (or a top-level custom channel message's
+    # session) gets reply_to_ts, so replies never land in an unrelated thread
+    owns_message = (thread_ts and routing_mode == "registry_socket") or is_custom_channel
+    if message_ts and registry_db and session_id and owns_message:
         try:
-            # Find the session to update
-            session_id = None
-            if thread_ts:
-                # For threaded messages, find session by thread_ts
-                with registry_db.session_scope() as db_session:
-                    from registry_db import SessionRecord
-                    record = db_session.query(SessionRecord).filter_by(
-                        slack_thread_ts=thread_ts,
-                        status='active'
-                    ).first()
-                    if record:
-                        session_id = record.session_id
-            elif is_custom_channel and channel:
-                # For custom channel, find session by channel
-                with registry_db.session_scope() as db_session:
-                    from registry_db import SessionRecord
-                    record = db_session.query(SessionRecord).filter(
-                        SessionRecord.slack_channel == channel,
-                        SessionRecord.slack_thread_ts.is_(None),
-                        SessionRecord.status == 'active'
-                    ).first()
-                    if record:
-                        session_id = record.session_id
-
-            if session_id:
-                registry_db.update_session(session_id, {'reply_to_ts': message_ts})
-                print(f"📋 Set reply_to_ts={message_ts} for session {session_id[:8]}", file=sys.stderr)
+            registry_db.set_reply_to_ts(session_id, message_ts)
+            log.debug("📋 Set reply_to_ts=%s for session %s", message_ts, session_id[:8])
         except Exception as e:
-            print(f"⚠️  Could not set reply_to_ts: {e}", file=sys.stderr)
+            log.warning("⚠️  Could not set reply_to_ts: %s", e)
 
-    # Acknowledge with reaction
-    try:
-        app.client.reactions_add(
-            channel=channel,
-            timestamp=event["ts"],
-            name="white_check_mark"
-        )
-    except Exception as e:
-        print(f"⚠️  Warning: Could not add reaction: {e}", file=sys.stderr)
+    # Acknowledge with reaction (in the background, overlapping the confirmation post)
+    add_reaction_async(channel, event["ts"])
 
     response_type = "thread reply" if thread_ts else ("DM" if is_dm else "channel message")
     thread_info = f" in thread {thread_ts}" if thread_ts else ""
-    print(f"📝 Sent {response_type} from user {user} via {mode}{thread_info}: {text[:100]}")
+    log.info("📝 Sent %s from user %s via %s%s: %s", response_type, user, mode, thread_info, text[:100])
 
 
 @app.event("reaction_added")
@@ -746,21 +1322,10 @@ def handle_reaction(body, client):
     # Extract the inner event payload from the body
     event = body.get("event", {})
 
-    print(f"📌 Reaction event received: {event}", file=sys.stderr)
+    log.debug("📌 Reaction event received: %s", event)
 
-    # Ignore bot's own reactions
-    try:
-        bot_user_id = client.auth_test()["user_id"]
-        if event.get("user") == bot_user_id:
-            print(f"📌 Ignoring bot's own reaction", file=sys.stderr)
-            return
-    except Exception as e:
-        print(f"⚠️  Could not check bot user id: {e}", file=sys.stderr)
-
-    # Try handling as AskUserQuestion reaction first
-    if handle_askuser_reaction(body, client):
-        print(f"📌 Handled as AskUserQuestion reaction", file=sys.stderr)
-        return
+    # The bot's own reactions (the ✅ confirmations) never get here: Bolt's
+    # IgnoringSelfEvents middleware drops events whose user is the bot
 
     emoji_name = event.get("reaction")
     item = event.get("item", {})
@@ -768,80 +1333,92 @@ def handle_reaction(body, client):
     message_ts = item.get("ts")
     user = event.get("user")
 
-    print(f"📌 Parsed: emoji={emoji_name}, channel={channel}, ts={message_ts}, user={user}", file=sys.stderr)
-
-    # Map emoji names to numeric responses
-    emoji_to_number = {
-        # Number emojis
-        "one": "1",
-        "two": "2",
-        "three": "3",
-        "four": "4",
-        "five": "5",
-        # Thumbs emojis as shortcuts
-        "+1": "1",           # 👍 = approve
-        "thumbsup": "1",
-        "-1": "3",           # 👎 = deny
-        "thumbsdown": "3",
-        # Check/X emojis
-        "white_check_mark": "1",  # ✅ = approve
-        "x": "3",                  # ❌ = deny
-        "heavy_check_mark": "1",
-    }
+    log.debug("📌 Parsed: emoji=%s, channel=%s, ts=%s, user=%s", emoji_name, channel, message_ts, user)
+
+    if not _seen_reactions.add((event.get("event_ts"), user, message_ts, emoji_name)):
+        log.debug("📌 Ignoring redelivered reaction event")
+        return
+
+    response = REACTION_EMOJI_MAP.get(emoji_name)
+
+    # Fast path: a reaction on a message this listener routed itself goes straight
+    # to that session's socket (it's a user message, so never an AskUser prompt)
+    socket_path = _message_route_cache.get((channel, message_ts)) if response else None
+    if socket_path and send_to_session_socket(response, socket_path):
+        log.info("📌 Reaction '%s' from user %s → sent '%s' via cached route", emoji_name, user, response)
+        add_reaction_async(channel, message_ts)
+        return
+
+    # Try handling as AskUserQuestion reaction first
+    if handle_askuser_reaction(body, client):
+        log.debug("📌 Handled as AskUserQuestion reaction")
+        return
 
-    response = emoji_to_number.get(emoji_name)
     if not response:
         # Unmapped emoji, ignore
         return
 
     # Get thread_ts for routing - need to find the THREAD's parent ts, not the message ts
-    # Fetch the message to get its thread_ts (parent of the thread)
-    thread_ts = None
-    try:
-        # Get the message that was reacted to
-        result = client.conversations_history(
-            channel=channel,
-            latest=message_ts,
-            inclusive=True,
-            limit=1
-        )
-        if result.get("messages"):
-            msg = result["messages"][0]
-            # thread_ts is the parent message ts (or the message itself if it's the parent)
-            thread_ts = msg.get("thread_ts", message_ts)
-            print(f"📌 Found thread_ts: {thread_ts} for message {message_ts}", file=sys.stderr)
-    except Exception as e:
-        print(f"⚠️  Could not fetch message for thread_ts: {e}", file=sys.stderr)
-        # Fall back to message_ts
-        thread_ts = message_ts
+    # Use the thread carried by the event item or recorded when the message was
+    # seen; otherwise fetch the message
+    thread_ts = item.get("thread_ts") or _message_thread_cache.get((channel, message_ts))
+    if thread_ts:
+        log.debug("📌 Known thread_ts: %s for message %s", thread_ts, message_ts)
+    else:
+        try:
+            # conversations.replies returns the thread's parent first, whether
+            # message_ts is the parent or a reply (conversations.history only
+            # sees channel-level messages, so it can't find threaded prompts)
+            result = client.conversations_replies(
+                channel=channel,
+                ts=message_ts,
+                limit=1
+            )
+            if result.get("messages"):
+                parent = result["messages"][0]
+                # A message with no replies has no thread_ts and is its own parent
+                thread_ts = parent.get("thread_ts") or parent.get("ts", message_ts)
+                log.debug("📌 Found thread_ts: %s for message %s", thread_ts, message_ts)
+                _message_thread_cache.set((channel, message_ts), thread_ts)
+        except Exception as e:
+            log.warning("⚠️  Could not fetch message for thread_ts: %s", e)
+            # Fall back to message_ts
+            thread_ts = message_ts
 
     # Send the numeric response to Claude (pass channel for custom channel mode fallback)
     mode = send_response(response, thread_ts=thread_ts, channel=channel)
 
     # Log the reaction-to-input conversion
-    print(f"📌 Reaction '{emoji_name}' from user {user} → sent '{response}' via {mode}", file=sys.stderr)
+    log.info("📌 Reaction '%s' from user %s → sent '%s' via %s", emoji_name, user, response, mode)
 
-    # Add a checkmark to confirm the reaction was processed
-    try:
-        client.reactions_add(
-            channel=channel,
-            timestamp=message_ts,
-            name="white_check_mark"
-        )
-        print(f"📌 Added confirmation checkmark", file=sys.stderr)
-    except Exception as e:
-        print(f"⚠️  Could not add confirmation reaction: {e}", file=sys.stderr)
+    # Confirm with a checkmark in the background; the handler thread is free once the input is sent
+    add_reaction_async(channel, message_ts)
+
+
+# Permission prompt replacements (chat.update) - filled in per click
+PERMISSION_DENY_FEEDBACK_TEXT = "❌ *<@{user_id}> denied the request*\n\n💬 Please reply in this thread with instructions for Claude:"
+PERMISSION_APPROVED_TEXT = "✅ *<@{user_id}> approved* (option {response})"
 
+# PermissionRequest hook button decision -> result text (chat.update fallback)
+HOOK_DECISION_TEXTS = MappingProxyType({
+    "allow": "✅ *<@{user_id}> allowed* this action",
+    "allow_always": "✅ *<@{user_id}> allowed* (always for this session)",
+    "deny": "❌ *<@{user_id}> denied* this action",
+})
+HOOK_DECISION_DEFAULT_TEXT = "*<@{user_id}>* responded: {decision}"
 
-@app.action("permission_response_1")
-@app.action("permission_response_2")
-@app.action("permission_response_3")
-def handle_permission_button(ack, body, client):
+
+def mrkdwn_blocks(text):
+    """Build a single mrkdwn section block list for chat.update/chat.postMessage."""
+    return [{"type": "section", "text": {"type": "mrkdwn", "text": text}}]
+
+
+def handle_permission_button(body, client):
     """
-    Handle interactive button clicks for permission prompts.
+    Handle interactive button clicks for permission prompts (lazy listener - already acked).
 
     When a user clicks a permission button (1, 2, or 3), this handler:
-    1. Acknowledges the button click immediately (required by Slack)
+    1. Runs after _ack_interaction has acknowledged the click (required by Slack)
     2. Extracts the button value (the numeric response)
     3. Gets the thread_ts for routing to the correct Claude session
     4. Sends the numeric response to Claude
@@ -850,16 +1427,13 @@ def handle_permission_button(ack, body, client):
     The button action_ids are: permission_response_1, permission_response_2, permission_response_3
     The button values are: "1", "2", "3"
     """
-    # Acknowledge immediately (Slack requires response within 3 seconds)
-    ack()
-
-    print(f"🔘 Button click event received", file=sys.stderr)
+    log.debug("🔘 Button click event received")
 
     try:
         # Extract action info
         actions = body.get("actions", [])
         if not actions:
-            print(f"⚠️  No actions in button click body", file=sys.stderr)
+            log.warning("⚠️  No actions in button click body")
             return
 
         action = actions[0]
@@ -873,7 +1447,7 @@ def handle_permission_button(ack, body, client):
         # This handles both 2-option (button 2 = deny) and 3-option (button 3 = deny) prompts
         is_deny_button = button_style == "danger"
 
-        print(f"🔘 Action: {action_id}, Value: {response}, Style: {button_style}, User: {user_name}", file=sys.stderr)
+        log.debug("🔘 Action: %s, Value: %s, Style: %s, User: %s", action_id, response, button_style, user_name)
 
         # Get message and thread info from the body
         message = body.get("message", {})
@@ -881,105 +1455,134 @@ def handle_permission_button(ack, body, client):
         message_ts = message.get("ts")
         thread_ts = message.get("thread_ts", message_ts)  # Thread parent or message itself
 
-        print(f"🔘 Channel: {channel}, Thread: {thread_ts}", file=sys.stderr)
+        log.debug("🔘 Channel: %s, Thread: %s", channel, thread_ts)
 
         if not response:
-            print(f"⚠️  Missing response in button click", file=sys.stderr)
+            log.warning("⚠️  Missing response in button click")
             return
 
-        # Check if this is a custom channel session (no thread, but channel has active session)
-        is_custom_channel = False
-        if channel:
-            custom_socket = get_socket_for_channel(channel)
-            if custom_socket:
-                is_custom_channel = True
-                print(f"🔘 Custom channel mode detected for button click", file=sys.stderr)
+        # Resolve the route once: it tells us whether this is a custom channel
+        # session (no thread, but channel has active session) and is reused for the send
+        route = resolve_route(thread_ts=thread_ts, channel=channel)
+        is_custom_channel = route[2] == "custom_channel_socket"
+        if is_custom_channel:
+            log.debug("🔘 Custom channel mode detected for button click")
 
         # For "deny" option (danger-styled button), prompt user for feedback instead of sending immediately
         # But for custom channels, just send the value since there's no thread to reply in
         if is_deny_button and not is_custom_channel:
-            print(f"🔘 Deny button clicked - prompting for feedback", file=sys.stderr)
+            log.debug("🔘 Deny button clicked - prompting for feedback")
             try:
                 # Update the message to prompt for feedback
-                client.chat_update(
+                slack_api_call(
+                    "chat.update", client.chat_update,
                     channel=channel,
                     ts=message_ts,
-                    blocks=[
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"❌ *<@{user_id}> denied the request*\n\n💬 Please reply in this thread with instructions for Claude:"
-                            }
-                        }
-                    ],
+                    blocks=mrkdwn_blocks(PERMISSION_DENY_FEEDBACK_TEXT.format(user_id=user_id)),
                     text="Permission denied - please reply with feedback"
                 )
-                print(f"🔘 Prompting user for feedback in thread", file=sys.stderr)
+                log.debug("🔘 Prompting user for feedback in thread")
                 # Don't send response yet - wait for user's follow-up message
                 return
             except Exception as e:
-                print(f"⚠️  Could not update message for feedback prompt: {e}", file=sys.stderr)
+                log.warning("⚠️  Could not update message for feedback prompt: %s", e)
                 # Fall through to send response directly
         elif is_deny_button and is_custom_channel:
-            print(f"🔘 Deny button clicked in custom channel - sending '{response}' directly (no thread for feedback)", file=sys.stderr)
+            log.debug("🔘 Deny button clicked in custom channel - sending '%s' directly (no thread for feedback)", response)
+
+        # Delete the permission message and clear it from the registry in the
+        # background - neither affects delivering the response to Claude
+        _slack_call_pool.submit(
+            _cleanup_permission_prompt, client, channel, message_ts, user_id, response, thread_ts
+        )
 
         # Send the numeric response to Claude (for approve options, or fallback for deny)
         # Pass channel for custom channel mode fallback routing
-        mode = send_response(response, thread_ts=thread_ts, channel=channel)
-        print(f"🔘 Button '{response}' from {user_name} → sent via {mode}", file=sys.stderr)
+        mode = send_response(response, thread_ts=thread_ts, channel=channel, route=route)
+        log.info("🔘 Button '%s' from %s → sent via %s", response, user_name, mode)
+
+    except Exception as e:
+        log.exception("❌ Error handling button click: %s", e)
+
+
+def _cleanup_permission_prompt(client, channel, message_ts, user_id, response, thread_ts):
+    """Delete an answered permission prompt, then clear it from the session (runs on _slack_call_pool)."""
+    # Clear permission_message_ts in registry so posttooluse hook doesn't try to delete again
+    if _delete_permission_message(client, channel, message_ts, user_id, response):
+        _clear_permission_message_ts(thread_ts, channel)
+
+
+def _delete_permission_message(client, channel, message_ts, user_id, response):
+    """
+    Delete an answered permission prompt, or mark it approved if it can't be deleted.
 
-        # Delete the permission message to keep the channel clean
+    Returns:
+        bool: True if the message was deleted
+    """
+    try:
+        slack_api_call(
+            "chat.delete", client.chat_delete,
+            channel=channel,
+            ts=message_ts
+        )
+        log.debug("🔘 Permission message deleted (keeping channel clean)")
+        return True
+    except Exception as e:
+        # If deletion fails (e.g., bot lacks permissions), fall back to updating the message
+        log.warning("⚠️  Could not delete message, falling back to update: %s", e)
         try:
-            client.chat_delete(
+            # Update to show selection confirmation
+            slack_api_call(
+                "chat.update", client.chat_update,
                 channel=channel,
-                ts=message_ts
+                ts=message_ts,
+                blocks=mrkdwn_blocks(PERMISSION_APPROVED_TEXT.format(user_id=user_id, response=response)),
+                text=f"Permission approved (option {response})"
             )
-            print(f"🔘 Permission message deleted (keeping channel clean)", file=sys.stderr)
+            log.debug("🔘 Message updated to show approval (fallback)")
+        except Exception as e2:
+            log.warning("⚠️  Could not update message either: %s", e2)
+            # Don't fail - the response was already sent
+        return False
 
-            # Clear permission_message_ts in registry so posttooluse hook doesn't try to delete again
-            if registry_db:
-                try:
-                    # Find session by thread_ts or channel
-                    session = None
-                    if thread_ts:
-                        session = registry_db.get_by_thread(thread_ts)
-                    if not session and channel:
-                        session = registry_db.get_by_channel(channel) if hasattr(registry_db, 'get_by_channel') else None
-                    if session:
-                        registry_db.update_session(session['session_id'], {'permission_message_ts': None})
-                        print(f"🔘 Cleared permission_message_ts for session", file=sys.stderr)
-                except Exception as db_e:
-                    print(f"⚠️  Could not clear permission_message_ts: {db_e}", file=sys.stderr)
 
-        except Exception as e:
-            # If deletion fails (e.g., bot lacks permissions), fall back to updating the message
-            print(f"⚠️  Could not delete message, falling back to update: {e}", file=sys.stderr)
-            try:
-                # Update to show selection confirmation
-                client.chat_update(
-                    channel=channel,
-                    ts=message_ts,
-                    blocks=[
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"✅ *<@{user_id}> approved* (option {response})"
-                            }
-                        }
-                    ],
-                    text=f"Permission approved (option {response})"
-                )
-                print(f"🔘 Message updated to show approval (fallback)", file=sys.stderr)
-            except Exception as e2:
-                print(f"⚠️  Could not update message either: {e2}", file=sys.stderr)
-                # Don't fail - the response was already sent
+# Thread -> owning session_id for permission prompt cleanup. Only the id is
+# cached (it never changes for a thread), so cached entries can't carry a stale
+# permission_message_ts; the short TTL covers a burst of clicks in one thread.
+SESSION_BY_THREAD_TTL = 2.0
+_thread_session_cache = TTLCache(maxsize=256, ttl=SESSION_BY_THREAD_TTL)
+
+
+def _session_id_for_thread(thread_ts):
+    """Return the session_id registered for a thread, briefly cached."""
+    session_id = _thread_session_cache.get(thread_ts)
+    if session_id is None:
+        session_id = registry_db.get_session_id_for_thread(thread_ts)
+        if session_id:
+            _thread_session_cache.set(thread_ts, session_id)
+    return session_id
+
+
+def _clear_permission_message_ts(thread_ts, channel):
+    """Clear permission_message_ts on the session that owned a deleted permission prompt."""
+    if not registry_db:
+        return
+
+    try:
+        # Find session by thread_ts, or by the (cached) custom channel route
+        session_id = _session_id_for_thread(thread_ts) if thread_ts else None
+        if not session_id and channel:
+            route = get_route_for_channel(channel)
+            session_id = route[0] if route else None
+        if session_id:
+            registry_db.update_session(session_id, {'permission_message_ts': None})
+            log.debug("🔘 Cleared permission_message_ts for session")
+    except Exception as db_e:
+        log.warning("⚠️  Could not clear permission_message_ts: %s", db_e)
 
-    except Exception as e:
-        print(f"❌ Error handling button click: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+
+for _action_id in ("permission_response_1", "permission_response_2", "permission_response_3"):
+    app.action(_action_id)(ack=_ack_interaction, lazy=[handle_permission_button])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1003,10 +1606,10 @@ PERMISSION_RESPONSE_DIR.mkdir(parents=True, exist_ok=True)
 # 'four' (4️⃣) -> '3' (fourth option, 0-indexed)
 # IMPORTANT: Display is 1-indexed (shows "Option 1, Option 2") but responses are 0-indexed
 # This ensures consistent option indexing across display and storage layers
-ASKUSER_EMOJI_MAP = {
+ASKUSER_EMOJI_MAP = MappingProxyType({
     'one': '0', 'two': '1', 'three': '2', 'four': '3',  # Emoji name format
     '1️⃣': '0', '2️⃣': '1', '3️⃣': '2', '4️⃣': '3',  # Unicode emoji format
-}
+})
 
 
 def handle_askuser_reaction(body, client):
@@ -1026,7 +1629,7 @@ def handle_askuser_reaction(body, client):
     Returns:
         True if handled as AskUser reaction, False otherwise
     """
-    print(f"🔢 Checking if reaction is for AskUserQuestion", file=sys.stderr)
+    log.debug("🔢 Checking if reaction is for AskUserQuestion")
 
     try:
         # Extract reaction event details
@@ -1037,12 +1640,16 @@ def handle_askuser_reaction(body, client):
         message_ts = item.get("ts")
         user_id = event.get("user")
 
-        print(f"🔢 Emoji: {emoji_name}, Channel: {channel}, TS: {message_ts}, User: {user_id}", file=sys.stderr)
+        log.debug("🔢 Emoji: %s, Channel: %s, TS: %s, User: %s", emoji_name, channel, message_ts, user_id)
 
         # Check if this emoji is mapped to an option index
         option_index = ASKUSER_EMOJI_MAP.get(emoji_name)
         if not option_index:
-            print(f"🔢 Emoji '{emoji_name}' not mapped for AskUser", file=sys.stderr)
+            log.debug("🔢 Emoji '%s' not mapped for AskUser", emoji_name)
+            return False
+
+        if (channel, message_ts) in _non_askuser_messages:
+            log.debug("🔢 Known non-AskUserQuestion message")
             return False
 
         # Fetch the message to check if it's an AskUserQuestion message
@@ -1055,12 +1662,14 @@ def handle_askuser_reaction(body, client):
             )
             messages = result.get("messages", [])
             if not messages:
-                print(f"🔢 Message not found", file=sys.stderr)
+                log.debug("🔢 Message not found")
                 return False
 
             message = messages[0]
+            # handle_reaction needs the same message's thread if this isn't an AskUser prompt
+            remember_message_thread({**message, "channel": channel})
         except Exception as e:
-            print(f"⚠️  Could not fetch message: {e}", file=sys.stderr)
+            log.warning("⚠️  Could not fetch message: %s", e)
             return False
 
         # Check for AskUserQuestion block_id
@@ -1073,14 +1682,14 @@ def handle_askuser_reaction(body, client):
                 break
 
         if not askuser_block:
-            print(f"🔢 Not an AskUserQuestion message", file=sys.stderr)
+            log.debug("🔢 Not an AskUserQuestion message")
             return False
 
         # Extract metadata from block_id: askuser_Q{n}_{session_id}_{request_id}
         block_id = askuser_block.get("block_id", "")
         parts = block_id.split("_")
         if len(parts) < 4:
-            print(f"⚠️  Invalid block_id format: {block_id}", file=sys.stderr)
+            log.warning("⚠️  Invalid block_id format: %s", block_id)
             return False
 
         question_num = parts[1]  # e.g., "Q0"
@@ -1089,12 +1698,12 @@ def handle_askuser_reaction(body, client):
 
         # Extract question index from "Q0" -> "0"
         if not question_num.startswith("Q"):
-            print(f"⚠️  Invalid question number format: {question_num}", file=sys.stderr)
+            log.warning("⚠️  Invalid question number format: %s", question_num)
             return False
 
         question_index = question_num[1:]  # Remove "Q" prefix
 
-        print(f"🔢 Parsed: question={question_index}, session={session_id[:8]}, request={request_id}, option={option_index}", file=sys.stderr)
+        log.debug("🔢 Parsed: question=%s, session=%s, request=%s, option=%s", question_index, session_id[:8], request_id, option_index)
 
         # Accumulate response (merge with existing answers if any)
         response_file = ASKUSER_RESPONSE_DIR / f"{session_id}_{request_id}.json"
@@ -1105,14 +1714,8 @@ def handle_askuser_reaction(body, client):
             "user_id": user_id,
             "timestamp": time.time()
         }
-        atomic_read_and_update_response_file(response_file, new_data)
-
-        # Read back the merged data for message update
-        try:
-            with open(response_file) as f:
-                merged_data = json.load(f)
-        except:
-            merged_data = new_data
+        # The merged answers come back from the locked update, not a second read
+        merged_data = atomic_read_and_update_response_file(response_file, new_data) or new_data
 
         # Update message to show selection and progress
         try:
@@ -1160,18 +1763,16 @@ def handle_askuser_reaction(body, client):
                 text=summary_text
             )
 
-            print(f"🔢 Updated message to show selection (progress: {answered_questions}/{total_questions})", file=sys.stderr)
+            log.info("🔢 Updated message to show selection (progress: %s/%s)", answered_questions, total_questions)
 
         except Exception as e:
-            print(f"⚠️  Could not update message: {e}", file=sys.stderr)
+            log.warning("⚠️  Could not update message: %s", e)
             # Continue - response file was written successfully
 
         return True
 
     except Exception as e:
-        print(f"❌ Error in AskUser reaction handler: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("❌ Error in AskUser reaction handler: %s", e)
         return False
 
 
@@ -1189,7 +1790,7 @@ def handle_askuser_thread_reply(event, client):
     Returns:
         True if handled as AskUser reply, None otherwise
     """
-    print(f"💬 Checking if thread reply is AskUser response", file=sys.stderr)
+    log.debug("💬 Checking if thread reply is AskUser response")
 
     try:
         thread_ts = event.get("thread_ts")
@@ -1214,7 +1815,7 @@ def handle_askuser_thread_reply(event, client):
 
             parent_message = messages[0]
         except Exception as e:
-            print(f"⚠️  Could not fetch parent message: {e}", file=sys.stderr)
+            log.warning("⚠️  Could not fetch parent message: %s", e)
             return None
 
         # Check for AskUserQuestion block_id in parent
@@ -1234,7 +1835,7 @@ def handle_askuser_thread_reply(event, client):
         block_id = askuser_block.get("block_id", "")
         parts = block_id.split("_")
         if len(parts) < 4:
-            print(f"⚠️  Invalid block_id format: {block_id}", file=sys.stderr)
+            log.warning("⚠️  Invalid block_id format: %s", block_id)
             return None
 
         question_num = parts[1]  # e.g., "Q0"
@@ -1243,12 +1844,12 @@ def handle_askuser_thread_reply(event, client):
 
         # Extract question index
         if not question_num.startswith("Q"):
-            print(f"⚠️  Invalid question number format: {question_num}", file=sys.stderr)
+            log.warning("⚠️  Invalid question number format: %s", question_num)
             return None
 
         question_index = question_num[1:]
 
-        print(f"💬 Thread reply is AskUser 'Other' response: question={question_index}, session={session_id[:8]}", file=sys.stderr)
+        log.info("💬 Thread reply is AskUser 'Other' response: question=%s, session=%s", question_index, session_id[:8])
 
         # Accumulate response (merge with existing answers if any)
         response_file = ASKUSER_RESPONSE_DIR / f"{session_id}_{request_id}.json"
@@ -1290,42 +1891,34 @@ def handle_askuser_thread_reply(event, client):
                 text="AskUserQuestion answered: Other"
             )
 
-            print(f"💬 Updated parent message to show 'Other' selection", file=sys.stderr)
+            log.debug("💬 Updated parent message to show 'Other' selection")
 
         except Exception as e:
-            print(f"⚠️  Could not update parent message: {e}", file=sys.stderr)
+            log.warning("⚠️  Could not update parent message: %s", e)
 
         return True
 
     except Exception as e:
-        print(f"❌ Error in AskUser thread reply handler: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("❌ Error in AskUser thread reply handler: %s", e)
         return None
 
 
-@app.action("permission_allow")
-@app.action("permission_deny")
-@app.action("permission_allow_always")
-def handle_permission_hook_button(ack, body, client):
+def handle_permission_hook_button(body, client):
     """
-    Handle permission buttons from PermissionRequest hook.
+    Handle permission buttons from PermissionRequest hook (lazy listener - already acked).
 
     These buttons come from on_permission_request.py hook, not the notification-based
     permission prompts. They write a response file that the hook is polling for.
 
     Button value contains JSON: {"session_id": "...", "request_id": "...", "decision": "allow|deny|allow_always"}
     """
-    # Acknowledge immediately (Slack requires response within 3 seconds)
-    ack()
-
-    print(f"🔐 PermissionRequest hook button clicked", file=sys.stderr)
+    log.debug("🔐 PermissionRequest hook button clicked")
 
     try:
         # Extract action info
         actions = body.get("actions", [])
         if not actions:
-            print(f"⚠️  No actions in button click body", file=sys.stderr)
+            log.warning("⚠️  No actions in button click body")
             return
 
         action = actions[0]
@@ -1334,13 +1927,13 @@ def handle_permission_hook_button(ack, body, client):
         user_id = body.get("user", {}).get("id")
         user_name = body.get("user", {}).get("name", "Unknown")
 
-        print(f"🔐 Action: {action_id}, User: {user_name}", file=sys.stderr)
+        log.debug("🔐 Action: %s, User: %s", action_id, user_name)
 
         # Parse the button value
         try:
             value = json.loads(value_json)
         except json.JSONDecodeError:
-            print(f"⚠️  Invalid JSON in button value: {value_json}", file=sys.stderr)
+            log.warning("⚠️  Invalid JSON in button value: %s", value_json)
             return
 
         session_id = value.get("session_id")
@@ -1348,10 +1941,10 @@ def handle_permission_hook_button(ack, body, client):
         decision = value.get("decision")
 
         if not all([session_id, request_id, decision]):
-            print(f"⚠️  Missing required fields in button value", file=sys.stderr)
+            log.warning("⚠️  Missing required fields in button value")
             return
 
-        print(f"🔐 Session: {session_id[:8]}, Request: {request_id}, Decision: {decision}", file=sys.stderr)
+        log.info("🔐 Session: %s, Request: %s, Decision: %s", session_id[:8], request_id, decision)
 
         # Write response file for the hook to read
         response_file = PERMISSION_RESPONSE_DIR / f"{session_id}_{request_id}.json"
@@ -1365,7 +1958,7 @@ def handle_permission_hook_button(ack, body, client):
         with open(response_file, 'w') as f:
             json.dump(response_data, f)
 
-        print(f"🔐 Wrote response file: {response_file}", file=sys.stderr)
+        log.debug("🔐 Wrote response file: %s", response_file)
 
         # Get message info for updating/deleting
         message = body.get("message", {})
@@ -1373,26 +1966,18 @@ def handle_permission_hook_button(ack, body, client):
         message_ts = message.get("ts")
 
         # Update the message to show the result
-        if decision == "allow":
-            result_text = f"✅ *<@{user_id}> allowed* this action"
-            result_emoji = "✅"
-        elif decision == "allow_always":
-            result_text = f"✅ *<@{user_id}> allowed* (always for this session)"
-            result_emoji = "✅"
-        elif decision == "deny":
-            result_text = f"❌ *<@{user_id}> denied* this action"
-            result_emoji = "❌"
-        else:
-            result_text = f"*<@{user_id}>* responded: {decision}"
-            result_emoji = "🔔"
+        result_text = HOOK_DECISION_TEXTS.get(decision, HOOK_DECISION_DEFAULT_TEXT).format(
+            user_id=user_id, decision=decision
+        )
 
         try:
             # Try to delete the message first (keeps channel clean)
-            client.chat_delete(
+            slack_api_call(
+                "chat.delete", client.chat_delete,
                 channel=channel,
                 ts=message_ts
             )
-            print(f"🔐 Permission message deleted", file=sys.stderr)
+            log.debug("🔐 Permission message deleted")
 
             # Clear permission_message_ts in registry
             if registry_db:
@@ -1401,246 +1986,346 @@ def handle_permission_hook_button(ack, body, client):
                     if session:
                         registry_db.update_session(session_id, {'permission_message_ts': None})
                 except Exception as db_e:
-                    print(f"⚠️  Could not clear permission_message_ts: {db_e}", file=sys.stderr)
+                    log.warning("⚠️  Could not clear permission_message_ts: %s", db_e)
 
         except Exception as del_e:
             # If deletion fails, update the message instead
-            print(f"⚠️  Could not delete message, updating instead: {del_e}", file=sys.stderr)
+            log.warning("⚠️  Could not delete message, updating instead: %s", del_e)
             try:
-                client.chat_update(
+                slack_api_call(
+                    "chat.update", client.chat_update,
                     channel=channel,
                     ts=message_ts,
-                    blocks=[
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": result_text
-                            }
-                        }
-                    ],
+                    blocks=mrkdwn_blocks(result_text),
                     text=f"Permission {decision}"
                 )
             except Exception as update_e:
-                print(f"⚠️  Could not update message either: {update_e}", file=sys.stderr)
+                log.warning("⚠️  Could not update message either: %s", update_e)
 
     except Exception as e:
-        print(f"❌ Error handling permission hook button: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("❌ Error handling permission hook button: %s", e)
+
+
+for _action_id in ("permission_allow", "permission_deny", "permission_allow_always"):
+    app.action(_action_id)(ack=_ack_interaction, lazy=[handle_permission_hook_button])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Shortcut Handlers - Global shortcuts from Slack's ⚡ menu
 # ─────────────────────────────────────────────────────────────────────────────
 
-@app.shortcut("get_sessions")
-def handle_get_sessions_shortcut(ack, shortcut, client):
+# Slack rejects select menus with more than 100 options
+SLACK_MAX_SELECT_OPTIONS = 100
+
+# Attach modal history choices: option value -> message count
+ATTACH_HISTORY_COUNTS = MappingProxyType({"0": 0, "5": 5, "10": 10, "25": 25})
+
+# Static modal blocks, built once. They are shared between requests, so
+# handlers copy the outer tuple into a new list before adding to it.
+NO_SESSIONS_BLOCKS_GET = (
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "📭 *No active sessions*\n\nStart a Claude session with `claude-slack -c channel-name` first."
+        }
+    },
+)
+NO_SESSIONS_BLOCKS_ATTACH = (
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "📭 *No active sessions*\n\nStart a Claude session first with:\n```claude-slack -c channel-name```"
+        }
+    },
+)
+SESSIONS_HEADER_BLOCKS = (
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*🖥️ Active Claude Sessions*"
+        }
+    },
+    {"type": "divider"},
+)
+SESSIONS_FOOTER_BLOCKS = (
+    {"type": "divider"},
+    {
+        "type": "context",
+        "elements": [
+            {
+                "type": "mrkdwn",
+                "text": "💡 Use the *Attach to Session* shortcut to subscribe to output"
+            }
+        ]
+    },
+)
+HISTORY_OPTIONS = (
+    {"text": {"type": "plain_text", "text": "No history"}, "value": "0"},
+    {"text": {"type": "plain_text", "text": "Last 5 messages"}, "value": "5"},
+    {"text": {"type": "plain_text", "text": "Last 10 messages"}, "value": "10"},
+    {"text": {"type": "plain_text", "text": "Last 25 messages"}, "value": "25"},
+)
+
+# Complete modals for the empty state, sent as-is (never mutated)
+EMPTY_GET_SESSIONS_VIEW = {
+    "type": "modal",
+    "title": {"type": "plain_text", "text": "Claude Sessions"},
+    "close": {"type": "plain_text", "text": "Close"},
+    "blocks": NO_SESSIONS_BLOCKS_GET
+}
+EMPTY_ATTACH_VIEW = {
+    "type": "modal",
+    "title": {"type": "plain_text", "text": "Attach to Session"},
+    "close": {"type": "plain_text", "text": "Close"},
+    "blocks": NO_SESSIONS_BLOCKS_ATTACH
+}
+
+# Attach modal - everything but private_metadata is the same on every open
+# (session options are loaded on demand by handle_session_select_options)
+ATTACH_VIEW_TEMPLATE = MappingProxyType({
+    "type": "modal",
+    "callback_id": "attach_session_modal",
+    "title": {"type": "plain_text", "text": "Attach to Session"},
+    "submit": {"type": "plain_text", "text": "Attach"},
+    "close": {"type": "plain_text", "text": "Cancel"},
+    "blocks": (
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "Select a session to receive its output in your DMs:"
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "session_select_block",
+            "element": {
+                "type": "external_select",
+                "action_id": "session_select",
+                "placeholder": {"type": "plain_text", "text": "Select a session"},
+                "min_query_length": 0
+            },
+            "label": {"type": "plain_text", "text": "Session"}
+        },
+        {
+            "type": "input",
+            "block_id": "history_block",
+            "optional": True,
+            "element": {
+                "type": "static_select",
+                "action_id": "history_select",
+                "placeholder": {"type": "plain_text", "text": "No history"},
+                "options": HISTORY_OPTIONS
+            },
+            "label": {"type": "plain_text", "text": "Fetch recent history?"}
+        },
+    ),
+})
+
+
+@dataclass(frozen=True, slots=True)
+class SessionOption:
+    """Session picker entry - only turned into Slack's nested option dict when sent."""
+    project: str
+    session_id: str
+
+    def to_slack(self) -> dict:
+        """Slack option object for select menus."""
+        return {
+            "text": {"type": "plain_text", "text": f"{self.project} ({self.session_id[:8]}...)"},
+            "value": self.session_id
+        }
+
+
+# Active session list for the Get Sessions modal; users often reopen it back-to-back
+ACTIVE_SESSIONS_CACHE_TTL = 3.0
+_active_sessions_cache = TTLCache(maxsize=1, ttl=ACTIVE_SESSIONS_CACHE_TTL)
+
+
+def get_active_sessions():
+    """
+    Return list_active_sessions() for the registry, reused for ACTIVE_SESSIONS_CACHE_TTL seconds.
+
+    Returns:
+        List of session dicts with session_id, project, created_at
     """
-    Handle the 'Get Sessions' global shortcut.
+    if not registry_db:
+        return []
+
+    sessions = _active_sessions_cache.get("active")
+    if sessions is None:
+        sessions = list_active_sessions(registry_db)
+        _active_sessions_cache.set("active", sessions)
+    return sessions
+
+
+def _session_block(project, session_id, started):
+    """Build the Get Sessions modal section for one session."""
+    return {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": f"*{project}*\n`{session_id}`\n_Started: {started}_"
+        }
+    }
+
+
+def handle_get_sessions_shortcut(shortcut, client):
+    """
+    Handle the 'Get Sessions' global shortcut (lazy listener - already acked).
     Shows a modal with a list of active Claude sessions.
     """
-    ack()
     user_id = shortcut["user"]["id"]
     trigger_id = shortcut["trigger_id"]
 
-    print(f"⚡ Shortcut: get_sessions from user {user_id}", file=sys.stderr)
+    log.info("⚡ Shortcut: get_sessions from user %s", user_id)
 
     try:
-        from dm_mode import format_session_list_for_slack, list_active_sessions
-
         # Get sessions list
-        sessions = list_active_sessions(registry_db) if registry_db else []
+        sessions = get_active_sessions()
 
         if not sessions:
-            blocks = [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": "📭 *No active sessions*\n\nStart a Claude session with `claude-slack -c channel-name` first."
-                    }
-                }
-            ]
+            view = EMPTY_GET_SESSIONS_VIEW
         else:
-            blocks = [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": "*🖥️ Active Claude Sessions*"
-                    }
-                },
-                {"type": "divider"}
-            ]
-
-            for session in sessions:
-                session_id = session['session_id']
-                project = session['project']
-                created = session.get('created_at', '')[:10] if session.get('created_at') else ''
-
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*{project}*\n`{session_id}`\n_Started: {created}_"
-                    }
-                })
-
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "💡 Use the *Attach to Session* shortcut to subscribe to output"
-                    }
-                ]
-            })
+            blocks = list(SESSIONS_HEADER_BLOCKS)
 
-        # Open modal with sessions list
-        client.views_open(
-            trigger_id=trigger_id,
-            view={
+            blocks.extend([
+                _session_block(s['project'], s['session_id'], (s.get('created_at') or '')[:10])
+                for s in sessions
+            ])
+
+            blocks.extend(SESSIONS_FOOTER_BLOCKS)
+
+            view = {
                 "type": "modal",
                 "title": {"type": "plain_text", "text": "Claude Sessions"},
                 "close": {"type": "plain_text", "text": "Close"},
                 "blocks": blocks
             }
-        )
+
+        # Open modal with sessions list
+        slack_api_call("views.open", client.views_open, trigger_id=trigger_id, view=view)
 
     except Exception as e:
-        print(f"❌ Error in get_sessions shortcut: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("❌ Error in get_sessions shortcut: %s", e)
+
+
+app.shortcut("get_sessions")(ack=_ack_interaction, lazy=[handle_get_sessions_shortcut])
 
 
-@app.shortcut("attach_to_session")
-def handle_attach_shortcut(ack, shortcut, client):
+def handle_attach_shortcut(shortcut, client):
     """
-    Handle the 'Attach to Session' global shortcut.
+    Handle the 'Attach to Session' global shortcut (lazy listener - already acked).
     Opens a modal with a dropdown to select a session.
     """
-    ack()
     user_id = shortcut["user"]["id"]
     trigger_id = shortcut["trigger_id"]
 
-    print(f"⚡ Shortcut: attach_to_session from user {user_id}", file=sys.stderr)
+    log.info("⚡ Shortcut: attach_to_session from user %s", user_id)
 
     try:
-        from dm_mode import list_active_sessions
-
-        sessions = list_active_sessions(registry_db) if registry_db else []
+        # Only check that at least one session exists - the dropdown options are
+        # loaded on demand by handle_session_select_options (external_select).
+        # A session list cached by a recent shortcut open answers this without a query.
+        sessions = _active_sessions_cache.get("active")
+        if sessions is None:
+            sessions = registry_db.search_sessions(limit=1, columns=('session_id',)) if registry_db else []
+            if not sessions and registry_db:
+                # Remember the empty state so repeat opens skip the registry too
+                _active_sessions_cache.set("active", [])
 
         if not sessions:
             # No sessions available
-            client.views_open(
-                trigger_id=trigger_id,
-                view={
-                    "type": "modal",
-                    "title": {"type": "plain_text", "text": "Attach to Session"},
-                    "close": {"type": "plain_text", "text": "Close"},
-                    "blocks": [
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": "📭 *No active sessions*\n\nStart a Claude session first with:\n```claude-slack -c channel-name```"
-                            }
-                        }
-                    ]
-                }
-            )
+            slack_api_call("views.open", client.views_open, trigger_id=trigger_id, view=EMPTY_ATTACH_VIEW)
             return
 
-        # Build session options for dropdown
-        session_options = [
-            {
-                "text": {"type": "plain_text", "text": f"{s['project']} ({s['session_id'][:8]}...)"},
-                "value": s['session_id']
-            }
-            for s in sessions
-        ]
-
         # Open modal with session picker
-        client.views_open(
+        slack_api_call(
+            "views.open", client.views_open,
             trigger_id=trigger_id,
-            view={
-                "type": "modal",
-                "callback_id": "attach_session_modal",
-                "title": {"type": "plain_text", "text": "Attach to Session"},
-                "submit": {"type": "plain_text", "text": "Attach"},
-                "close": {"type": "plain_text", "text": "Cancel"},
-                "private_metadata": user_id,
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "Select a session to receive its output in your DMs:"
-                        }
-                    },
-                    {
-                        "type": "input",
-                        "block_id": "session_select_block",
-                        "element": {
-                            "type": "static_select",
-                            "action_id": "session_select",
-                            "placeholder": {"type": "plain_text", "text": "Select a session"},
-                            "options": session_options
-                        },
-                        "label": {"type": "plain_text", "text": "Session"}
-                    },
-                    {
-                        "type": "input",
-                        "block_id": "history_block",
-                        "optional": True,
-                        "element": {
-                            "type": "static_select",
-                            "action_id": "history_select",
-                            "placeholder": {"type": "plain_text", "text": "No history"},
-                            "options": [
-                                {"text": {"type": "plain_text", "text": "No history"}, "value": "0"},
-                                {"text": {"type": "plain_text", "text": "Last 5 messages"}, "value": "5"},
-                                {"text": {"type": "plain_text", "text": "Last 10 messages"}, "value": "10"},
-                                {"text": {"type": "plain_text", "text": "Last 25 messages"}, "value": "25"}
-                            ]
-                        },
-                        "label": {"type": "plain_text", "text": "Fetch recent history?"}
-                    }
-                ]
-            }
+            view={**ATTACH_VIEW_TEMPLATE, "private_metadata": json.dumps({"user_id": user_id})}
         )
 
     except Exception as e:
-        print(f"❌ Error in attach_to_session shortcut: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("❌ Error in attach_to_session shortcut: %s", e)
 
 
-@app.view("attach_session_modal")
-def handle_attach_modal_submission(ack, body, client, view):
-    """Handle submission of the attach session modal."""
-    ack()
+app.shortcut("attach_to_session")(ack=_ack_interaction, lazy=[handle_attach_shortcut])
+
+
+@app.options("session_select")
+def handle_session_select_options(ack, payload):
+    """
+    Load options for the session picker in the attach modal.
+
+    Slack calls this as the user opens or types into the external_select.
+    Sessions are filtered in the registry and capped at Slack's 100-option limit.
+    """
+    query = (payload.get("value") or "").strip()
+
+    try:
+        sessions = registry_db.search_sessions(
+            query, limit=SLACK_MAX_SELECT_OPTIONS, columns=('session_id', 'project')
+        ) if registry_db else []
+        options = [SessionOption(s['project'], s['session_id']) for s in sessions]
+    except Exception as e:
+        log.error("❌ Error loading session options: %s", e)
+        options = []
+
+    ack(options=[option.to_slack() for option in options])
+
+
+# User ID -> DM channel ID; a user's IM channel with the bot never changes
+_dm_channel_cache = {}
+
+
+def open_dm_channel(client, user_id):
+    """
+    Return the bot's DM channel ID with a user, calling conversations.open once per user.
+
+    Args:
+        client: Slack WebClient
+        user_id: Slack user ID
+
+    Returns:
+        str: DM channel ID
+    """
+    dm_channel_id = _dm_channel_cache.get(user_id)
+    if dm_channel_id is None:
+        dm_response = slack_api_call("conversations.open", client.conversations_open, users=[user_id])
+        dm_channel_id = _dm_channel_cache[user_id] = dm_response["channel"]["id"]
+    return dm_channel_id
 
-    user_id = body["user"]["id"]
+
+def handle_attach_modal_submission(body, client, view):
+    """Handle submission of the attach session modal (lazy listener - already acked)."""
+    # Attach context stored when the modal was opened (older modals carry a bare user ID)
+    try:
+        metadata = json.loads(view.get("private_metadata") or "{}")
+    except json.JSONDecodeError:
+        metadata = {}
+    user_id = metadata.get("user_id") or body["user"]["id"]
     values = view["state"]["values"]
 
     # Extract selected session
     session_id = values["session_select_block"]["session_select"]["selected_option"]["value"]
 
-    # Extract history count (optional)
-    history_selection = values.get("history_block", {}).get("history_select", {}).get("selected_option")
-    history_count = int(history_selection["value"]) if history_selection else 0
+    # Extract history count (optional - the block or selection may be missing/null)
+    try:
+        history_count = ATTACH_HISTORY_COUNTS.get(
+            values["history_block"]["history_select"]["selected_option"]["value"], 0
+        )
+    except (KeyError, TypeError):
+        history_count = 0
 
-    print(f"⚡ Modal submit: attach {user_id} to {session_id} (history: {history_count})", file=sys.stderr)
+    log.info("⚡ Modal submit: attach %s to %s (history: %s)", user_id, session_id, history_count)
 
     try:
-        from dm_mode import attach_to_session
-
         # Open a DM channel with the user
-        dm_response = client.conversations_open(users=[user_id])
-        dm_channel_id = dm_response["channel"]["id"]
+        dm_channel_id = open_dm_channel(client, user_id)
 
         # Attach to session
         result = attach_to_session(
@@ -1648,45 +2333,40 @@ def handle_attach_modal_submission(ack, body, client, view):
         )
 
         # Send confirmation to user's DM
-        client.chat_postMessage(
+        slack_api_call(
+            "chat.postMessage", client.chat_postMessage,
             channel=dm_channel_id,
             text=result['message']
         )
 
     except Exception as e:
-        print(f"❌ Error attaching to session: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        # Don't keep reusing a DM channel that may be the cause of the failure
+        _dm_channel_cache.pop(user_id, None)
+        log.exception("❌ Error attaching to session: %s", e)
 
 
-@app.shortcut("research_mode")
-def handle_research_mode_shortcut(ack, shortcut, client):
-    """Handle the 'Research Mode' global shortcut."""
-    ack()
-    user_id = shortcut["user"]["id"]
+app.view("attach_session_modal")(ack=_ack_interaction, lazy=[handle_attach_modal_submission])
 
-    print(f"⚡ Shortcut: research_mode from user {user_id}", file=sys.stderr)
-    _set_user_mode(user_id, "research", client)
 
+# Mode shortcut callback_id -> mode passed to _set_user_mode
+MODE_SHORTCUTS = MappingProxyType({
+    "research_mode": "research",
+    "plan_mode": "plan",
+    "execute_mode": "execute",
+})
 
-@app.shortcut("plan_mode")
-def handle_plan_mode_shortcut(ack, shortcut, client):
-    """Handle the 'Plan Mode' global shortcut."""
-    ack()
-    user_id = shortcut["user"]["id"]
 
-    print(f"⚡ Shortcut: plan_mode from user {user_id}", file=sys.stderr)
-    _set_user_mode(user_id, "plan", client)
+def handle_mode_shortcut(shortcut, client):
+    """Handle the Research/Plan/Execute Mode global shortcuts (lazy listener - already acked)."""
+    user_id = shortcut["user"]["id"]
+    callback_id = shortcut["callback_id"]
 
+    log.info("⚡ Shortcut: %s from user %s", callback_id, user_id)
+    _set_user_mode(user_id, MODE_SHORTCUTS[callback_id], client)
 
-@app.shortcut("execute_mode")
-def handle_execute_mode_shortcut(ack, shortcut, client):
-    """Handle the 'Execute Mode' global shortcut."""
-    ack()
-    user_id = shortcut["user"]["id"]
 
-    print(f"⚡ Shortcut: execute_mode from user {user_id}", file=sys.stderr)
-    _set_user_mode(user_id, "execute", client)
+for _callback_id in MODE_SHORTCUTS:
+    app.shortcut(_callback_id)(ack=_ack_interaction, lazy=[handle_mode_shortcut])
 
 
 def _set_user_mode(user_id: str, mode: str, client):
@@ -1699,25 +2379,19 @@ def _set_user_mode(user_id: str, mode: str, client):
         client: Slack WebClient
     """
     try:
-        from dm_mode import handle_mode_command
-
         result = handle_mode_command(registry_db, user_id, action='set', mode=mode)
 
-        # Open DM and send confirmation
-        dm_response = client.conversations_open(users=[user_id])
-        dm_channel_id = dm_response["channel"]["id"]
-
-        client.chat_postMessage(
-            channel=dm_channel_id,
+        # Send confirmation via DM (posting to a user ID opens the DM implicitly)
+        slack_api_call(
+            "chat.postMessage", client.chat_postMessage,
+            channel=user_id,
             text=result['message']
         )
 
-        print(f"✅ Set mode to {mode} for user {user_id}", file=sys.stderr)
+        log.info("✅ Set mode to %s for user %s", mode, user_id)
 
     except Exception as e:
-        print(f"❌ Error setting mode: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("❌ Error setting mode: %s", e)
 
 
 def main():
@@ -1728,50 +2402,70 @@ def main():
         print("   Create a .env file from .env.example and set your tokens", file=sys.stderr)
         sys.exit(1)
 
-    print("🚀 Starting Slack bot...")
-    print(f"📁 Response file (fallback): {RESPONSE_FILE}")
-    print(f"🔌 Legacy socket path: {SOCKET_PATH}")
-    print(f"📋 Registry database: {REGISTRY_DB_PATH}")
+    if not SLACK_APP_TOKEN:
+        print("❌ Error: SLACK_APP_TOKEN environment variable not set", file=sys.stderr)
+        print("   Socket Mode requires an app-level token", file=sys.stderr)
+        sys.exit(1)
+
+    concurrency = get_listener_concurrency()
+
+    # Resolve the bot's user ID (and mention markup) now so the first
+    # message/reaction doesn't pay for auth.test (handlers still resolve it
+    # lazily if this fails)
+    try:
+        get_bot_mention(app.client)
+    except Exception as e:
+        log.warning("⚠️  Could not resolve bot user ID at startup: %s", e)
 
     # Check routing mode
     if registry_db:
-        print("📋 Phase 3 Mode: Registry-based routing enabled")
-        print("   - Threaded messages routed to correct session via registry lookup")
-        print("   - Non-threaded messages fall back to legacy socket")
+        routing_banner = (
+            "📋 Phase 3 Mode: Registry-based routing enabled\n"
+            "   - Threaded messages routed to correct session via registry lookup\n"
+            "   - Non-threaded messages fall back to legacy socket\n"
+        )
     elif os.path.exists(SOCKET_PATH):
-        print("⚡ Phase 2 Mode: Legacy socket routing (no registry)")
+        routing_banner = "⚡ Phase 2 Mode: Legacy socket routing (no registry)\n"
     else:
-        print("📁 Phase 1 Mode: File-based (use /check in Claude Code)")
-
-    # Verify app token
-    try:
-        app_token = os.environ["SLACK_APP_TOKEN"]
-    except KeyError:
-        print("❌ Error: SLACK_APP_TOKEN environment variable not set", file=sys.stderr)
-        print("   Socket Mode requires an app-level token", file=sys.stderr)
-        sys.exit(1)
-
-    # Start Socket Mode handler
-    handler = SocketModeHandler(app, app_token)
-
-    print("\n✅ Slack bot is running!")
-    print("   Listening for:")
-    print("   - @mentions in channels (and threads)")
-    print("   - Direct messages")
-    print("   - Channel messages starting with / or !")
-    print("   - Single digit responses (1, 2, 3)")
-    print("   - Emoji reactions (1️⃣ 2️⃣ 3️⃣ 👍 👎)")
-    print("   - Interactive button clicks")
-    print("   - Threaded replies (routed to correct session)")
-    print("   - Global shortcuts (⚡ menu)")
-    print("")
-    print("   Shortcuts: Get Sessions, Attach to Session, Research/Plan/Execute Mode")
-    print("")
-    print("   Press Ctrl+C to stop")
-    print("")
+        routing_banner = "📁 Phase 1 Mode: File-based (use /check in Claude Code)\n"
+
+    # Start Socket Mode handler - listeners run on a worker pool so one slow
+    # handler (Slack API call, socket retry) doesn't stall the rest
+    handler = SocketModeHandler(
+        app, SLACK_APP_TOKEN,
+        concurrency=concurrency,
+        receive_buffer_size=SOCKET_MODE_RECEIVE_BUFFER,
+    )
+
+    # Emit the startup banner in a single write
+    sys.stdout.write(
+        "🚀 Starting Slack bot...\n"
+        f"📁 Response file (fallback): {RESPONSE_FILE}\n"
+        f"🔌 Legacy socket path: {SOCKET_PATH}\n"
+        f"📋 Registry database: {REGISTRY_DB_PATH}\n"
+        f"🧵 Listener workers: {concurrency} (SLACK_BOT_CONCURRENCY)\n"
+        f"{routing_banner}"
+        "\n✅ Slack bot is running!\n"
+        "   Listening for:\n"
+        "   - @mentions in channels (and threads)\n"
+        "   - Direct messages\n"
+        "   - Channel messages starting with / or !\n"
+        "   - Single digit responses (1, 2, 3)\n"
+        "   - Emoji reactions (1️⃣ 2️⃣ 3️⃣ 👍 👎)\n"
+        "   - Interactive button clicks\n"
+        "   - Threaded replies (routed to correct session)\n"
+        "   - Global shortcuts (⚡ menu)\n"
+        "\n"
+        "   Shortcuts: Get Sessions, Attach to Session, Research/Plan/Execute Mode\n"
+        "\n"
+        "   Press Ctrl+C to stop\n"
+        "\n"
+    )
+    sys.stdout.flush()
 
     try:
-        handler.start()
+        with queued_logging():
+            handler.start()
     except KeyboardInterrupt:
         print("\n👋 Slack bot stopped")
         sys.exit(0)
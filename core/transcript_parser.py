@@ -121,6 +121,46 @@ class TranscriptParser:
 
         return True
 
+    def load_recent(self, n: int) -> bool:
+        """
+        Load only the tail of the transcript needed by get_last_n_messages(n).
+
+        Lines are decoded from the end of the file backwards and decoding stops
+        once the last n user/assistant messages have been found, so attaching
+        with history doesn't json-decode an entire long-running transcript.
+
+        Args:
+            n: Number of recent messages needed (clamped to 1-25 like get_last_n_messages)
+
+        Returns:
+            True if successful, False if file doesn't exist
+        """
+        if not os.path.exists(self.transcript_path):
+            return False
+
+        n = max(1, min(25, n))
+
+        with open(self.transcript_path, 'r') as f:
+            lines = f.readlines()
+
+        recent = []
+        found = 0
+        for line in reversed(lines):
+            try:
+                msg = json.loads(line)
+            except json.JSONDecodeError:
+                # Skip malformed lines
+                continue
+            recent.append(msg)
+            if msg.get('type') in ('user', 'assistant'):
+                found += 1
+                if found >= n:
+                    break
+
+        recent.reverse()
+        self.messages = recent
+        return True
+
     def get_assistant_messages(self) -> List[Dict[str, Any]]:
         """
         Get all assistant messages from the transcript.
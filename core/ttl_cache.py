@@ -0,0 +1,125 @@
+"""
+Small thread-safe TTL cache.
+
+Used by the Slack listener to memoize routing lookups (thread/channel -> socket)
+over short windows, so a burst of events in one thread doesn't turn into one
+registry query per event.
+
+Entries expire after a per-cache TTL, which can be overridden per entry (e.g. a
+shorter TTL for negative results). When full, the oldest entry is evicted.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire after a fixed time-to-live.
+
+    Values may be None (cached negative lookups); use get() with a sentinel
+    default or `in` to tell a cached None apart from a miss.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer=time.monotonic):
+        """
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time-to-live in seconds
+            timer: Clock function (monotonic seconds), injectable for tests
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """
+        Store value under key.
+
+        Args:
+            key: Cache key
+            value: Value to cache (None is allowed)
+            ttl: Optional TTL override in seconds for this entry
+        """
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key, value=None, ttl: float = None) -> bool:
+        """
+        Store value under key only if key is missing or expired.
+
+        The check and the store happen under one lock, so of several threads
+        adding the same key, exactly one succeeds.
+
+        Returns:
+            True if the entry was added, False if key was already cached
+        """
+        now = self._timer()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > now:
+                return False
+            self._data.pop(key, None)
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def pop(self, key, default=None):
+        """Remove key and return its value (expired entries return default)."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING or entry[0] <= self._timer():
+            return default
+        return entry[1]
+
+    def discard_if(self, predicate) -> int:
+        """
+        Remove every entry whose value satisfies predicate(value).
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key, (_, cached) in self._data.items() if predicate(cached)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def discard_value(self, value) -> int:
+        """Remove every entry whose value equals value (see discard_if)."""
+        return self.discard_if(lambda cached: cached == value)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -32,7 +32,8 @@ def clean_env(monkeypatch):
         'SLACK_BOT_TOKEN', 'SLACK_APP_TOKEN', 'SLACK_CHANNEL',
         'SLACK_SOCKET_DIR', 'REGISTRY_DB_PATH', 'SLACK_LOG_DIR',
         'CLAUDE_BIN', 'CLAUDE_SLACK_DIR', 'CLAUDE_TRANSCRIPT_PATH',
-        'CLAUDE_SESSION_ID', 'CLAUDE_PROJECT_DIR'
+        'CLAUDE_SESSION_ID', 'CLAUDE_PROJECT_DIR', 'SLACK_BOT_CONCURRENCY',
+        'SLACK_LISTENER_LOG_LEVEL'
     ]
     for var in vars_to_remove:
         monkeypatch.delenv(var, raising=False)
@@ -707,3 +708,28 @@ def sample_slack_button_event():
             }
         ]
     }
+
+
+# ============================================================
+# Clock Fixtures
+# ============================================================
+
+class FakeClock:
+    """Manually advanced monotonic clock; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Fake monotonic clock for time-based primitives (TTLCache, TokenBucket, CircuitBreaker)."""
+    return FakeClock()
@@ -0,0 +1,68 @@
+"""
+Unit tests for core/circuit_breaker.py
+
+Tests the CircuitBreaker used to fail fast on failing Slack API endpoints.
+"""
+
+import sys
+from pathlib import Path
+
+# Add core directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
+
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold(self, clock):
+        """Consecutive failures up to the threshold open the breaker."""
+        breaker = CircuitBreaker(fail_threshold=3, reset_timeout=10.0, timer=clock)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow() is True
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+
+    def test_success_resets_failure_count(self, clock):
+        """A success in between failures starts the count again."""
+        breaker = CircuitBreaker(fail_threshold=2, reset_timeout=10.0, timer=clock)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_single_trial(self, clock):
+        """After reset_timeout one trial call is allowed; others wait for its outcome."""
+        breaker = CircuitBreaker(fail_threshold=1, reset_timeout=10.0, timer=clock)
+        breaker.record_failure()
+
+        clock.now = 9.9
+        assert breaker.allow() is False
+        clock.now = 10.0
+        assert breaker.allow() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow() is True
+
+    def test_failed_trial_reopens(self, clock):
+        """A failed half-open trial opens the breaker for another reset_timeout."""
+        breaker = CircuitBreaker(fail_threshold=5, reset_timeout=10.0, timer=clock)
+        for _ in range(5):
+            breaker.record_failure()
+
+        clock.now = 10.0
+        assert breaker.allow() is True
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        clock.now = 19.9
+        assert breaker.allow() is False
+        clock.now = 20.0
+        assert breaker.allow() is True
@@ -0,0 +1,70 @@
+"""
+Unit tests for reading Slack bot messages off a wrapper's session socket.
+
+The listener sends one message per connection and closes it, so the wrapper
+must read up to EOF rather than a single fixed-size recv().
+"""
+
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.claude_wrapper_hybrid import read_socket_message as hybrid_read
+from core.claude_wrapper_multi import read_socket_message as multi_read
+
+
+def _send_and_close(sock, payload):
+    sock.sendall(payload)
+    sock.close()
+
+
+@pytest.mark.parametrize("read_socket_message", [hybrid_read, multi_read])
+class TestReadSocketMessage:
+    """Tests for read_socket_message() in both wrappers."""
+
+    def test_reads_message_larger_than_one_recv(self, read_socket_message):
+        """Messages over 4 KB arrive whole."""
+        server, client = socket.socketpair()
+        payload = ("x" * 200 + "\n") * 1000
+        sender = threading.Thread(target=_send_and_close, args=(client, payload.encode("utf-8")))
+        sender.start()
+
+        with server:
+            assert read_socket_message(server) == payload.strip()
+        sender.join()
+
+    def test_multibyte_characters_survive_chunking(self, read_socket_message):
+        """UTF-8 characters split across chunks decode correctly."""
+        server, client = socket.socketpair()
+        payload = "é" * 50000
+        sender = threading.Thread(target=_send_and_close, args=(client, payload.encode("utf-8")))
+        sender.start()
+
+        with server:
+            assert read_socket_message(server) == payload
+        sender.join()
+
+    def test_empty_connection(self, read_socket_message):
+        """A connection closed without data reads as an empty message."""
+        server, client = socket.socketpair()
+        client.close()
+
+        with server:
+            assert read_socket_message(server) == ""
+
+    def test_connection_stays_blocking(self, read_socket_message):
+        """The stall timeout is a kernel SO_RCVTIMEO, not a Python-level settimeout()."""
+        server, client = socket.socketpair()
+        client.close()
+
+        with server:
+            read_socket_message(server)
+            assert server.gettimeout() is None
+            timeval = server.getsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, 16)
+            assert timeval != bytes(len(timeval))
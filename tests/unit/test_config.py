@@ -19,6 +19,8 @@ from config import (
     get_registry_db_path,
     get_log_dir,
     get_claude_bin,
+    get_listener_concurrency,
+    get_listener_log_level,
     get_config_value,
     DEFAULT_CONFIG,
 )
@@ -78,6 +80,42 @@ class TestGetLogDir:
         assert result == '/var/log/claude-slack'
 
 
+class TestGetListenerConcurrency:
+    """Tests for get_listener_concurrency()"""
+
+    def test_get_listener_concurrency_default(self, clean_env):
+        """Returns the default worker count."""
+        assert get_listener_concurrency() == DEFAULT_CONFIG['listener_concurrency']
+
+    def test_get_listener_concurrency_env_override(self, clean_env):
+        """Respects SLACK_BOT_CONCURRENCY environment variable."""
+        clean_env.setenv('SLACK_BOT_CONCURRENCY', '8')
+        assert get_listener_concurrency() == 8
+
+    def test_get_listener_concurrency_invalid(self, clean_env):
+        """Falls back to the default for non-numeric values."""
+        clean_env.setenv('SLACK_BOT_CONCURRENCY', 'lots')
+        assert get_listener_concurrency() == DEFAULT_CONFIG['listener_concurrency']
+
+
+class TestGetListenerLogLevel:
+    """Tests for get_listener_log_level()"""
+
+    def test_get_listener_log_level_default(self, clean_env):
+        """Defaults to INFO."""
+        assert get_listener_log_level() == 'INFO'
+
+    def test_get_listener_log_level_env_override(self, clean_env):
+        """Respects SLACK_LISTENER_LOG_LEVEL, case-insensitively."""
+        clean_env.setenv('SLACK_LISTENER_LOG_LEVEL', 'debug')
+        assert get_listener_log_level() == 'DEBUG'
+
+    def test_get_listener_log_level_invalid(self, clean_env):
+        """Falls back to the default for unknown level names."""
+        clean_env.setenv('SLACK_LISTENER_LOG_LEVEL', 'chatty')
+        assert get_listener_log_level() == 'INFO'
+
+
 class TestGetClaudeBin:
     """Tests for get_claude_bin()"""
 
@@ -4,7 +4,7 @@ Unit tests for DM mode forwarding in core/dm_mode.py
 
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -327,6 +327,24 @@ class TestAttachToSession:
         assert result['success'] is False
         assert 'not found' in result.get('message', '').lower()
 
+    def test_attach_to_session_history_reuses_session_lookup(self, temp_registry_db, sample_session_data, mock_slack_client):
+        """Fetching history does not look the session up a second time."""
+        from dm_mode import attach_to_session
+
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch.object(temp_registry_db, 'get_session', wraps=temp_registry_db.get_session) as spy:
+            attach_to_session(
+                temp_registry_db,
+                user_id='U123456',
+                session_id=sample_session_data['session_id'],
+                dm_channel_id='D123456',
+                slack_client=mock_slack_client,
+                history_count=5
+            )
+
+        assert spy.call_count == 1
+
     def test_attach_to_session_sends_history(self, temp_registry_db, sample_session_data, mock_slack_client, tmp_path):
         """When history_count > 0, sends last N messages to DM."""
         from dm_mode import attach_to_session
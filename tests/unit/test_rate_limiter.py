@@ -0,0 +1,52 @@
+"""
+Unit tests for core/rate_limiter.py
+
+Tests the TokenBucket used to pace Slack API calls.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add core directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
+
+from rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_up_to_capacity_does_not_wait(self, clock):
+        """A full bucket serves `capacity` calls immediately."""
+        bucket = TokenBucket(rate=1.0, capacity=3, timer=clock, sleep=clock.sleep)
+        assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert clock.sleeps == []
+
+    def test_empty_bucket_waits_for_refill(self, clock):
+        """Once empty, each call waits for the next token."""
+        bucket = TokenBucket(rate=2.0, capacity=1, timer=clock, sleep=clock.sleep)
+        bucket.take()
+
+        assert bucket.take() == pytest.approx(0.5)
+        assert clock.sleeps == [pytest.approx(0.5)]
+
+    def test_refill_capped_at_capacity(self, clock):
+        """Idle time never banks more than `capacity` tokens."""
+        bucket = TokenBucket(rate=1.0, capacity=2, timer=clock, sleep=clock.sleep)
+        clock.now = 100.0
+
+        assert [bucket.take() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.take() == pytest.approx(1.0)
+
+    def test_try_take_never_waits(self, clock):
+        """try_take() takes an available token but reports an empty bucket instead of sleeping."""
+        bucket = TokenBucket(rate=1.0, capacity=1, timer=clock, sleep=clock.sleep)
+
+        assert bucket.try_take() is True
+        assert bucket.try_take() is False
+        assert clock.sleeps == []
+
+        clock.now = 1.0
+        assert bucket.try_take() is True
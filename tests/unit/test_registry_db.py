@@ -17,7 +17,7 @@ import pytest
 # Add core directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
 
-from registry_db import RegistryDatabase, SessionRecord, DMSubscription, AskUserQuestion, Base
+from registry_db import RegistryDatabase, SessionRecord, DMSubscription, AskUserQuestion, Base, _SELECT_THREAD_ROUTE
 
 
 class TestRegistryDatabaseInit:
@@ -45,6 +45,56 @@ class TestRegistryDatabaseInit:
             mode = result.fetchone()[0]
             assert mode.lower() == 'wal'
 
+    def test_init_configures_every_connection(self, temp_db_path):
+        """Per-connection PRAGMAs apply to all pooled connections, not just the first."""
+        db = RegistryDatabase(temp_db_path)
+        from sqlalchemy import text
+        with db.engine.connect() as first, db.engine.connect() as second:
+            # Builds compiled with SQLITE_MAX_MMAP_SIZE=0 ignore mmap_size, and
+            # others clamp it to their own limit
+            options = {row[0] for row in first.execute(text("PRAGMA compile_options"))}
+            mmap_supported = "MAX_MMAP_SIZE=0" not in options
+            for conn in (first, second):
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 2000
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == -8000
+                assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+                mmap_size = conn.execute(text("PRAGMA mmap_size")).scalar()
+                if mmap_supported:
+                    assert mmap_size > 0
+                else:
+                    assert not mmap_size
+
+    def test_pool_size_configurable(self, temp_db_path):
+        """Callers with many worker threads can hold that many connections at once."""
+        db = RegistryDatabase(temp_db_path, pool_size=32)
+        assert db.engine.pool.size() == 32
+
+    def test_thread_route_uses_composite_index(self, temp_db_path):
+        """Thread routing probes (slack_thread_ts, status) instead of a single-column index."""
+        db = RegistryDatabase(temp_db_path)
+        from sqlalchemy import text
+        with db.engine.connect() as conn:
+            indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(sessions)"))}
+            plan = " ".join(
+                row[-1] for row in conn.execute(
+                    text("EXPLAIN QUERY PLAN " + _SELECT_THREAD_ROUTE.text),
+                    {"thread_ts": "1234.5678"},
+                )
+            )
+        assert "idx_slack_thread" not in indexes
+        assert "idx_sessions_thread_active" in plan
+
+    def test_init_collects_session_index_statistics(self, temp_db_path, sample_session_data):
+        """Opening the registry analyzes the sessions table for the query planner."""
+        RegistryDatabase(temp_db_path).create_session(sample_session_data)
+
+        db = RegistryDatabase(temp_db_path)
+        from sqlalchemy import text
+        with db.engine.connect() as conn:
+            analyzed = {row[0] for row in conn.execute(text("SELECT idx FROM sqlite_stat1 WHERE tbl = 'sessions'"))}
+        assert "idx_sessions_thread_active" in analyzed
+
 
 class TestCreateSession:
     """Tests for create_session()"""
@@ -215,6 +265,65 @@ class TestListSessions:
         assert sessions == []
 
 
+class TestSearchSessions:
+    """Tests for search_sessions()"""
+
+    def test_search_sessions_by_project(self, temp_registry_db, sample_session_data):
+        """Matches project name case-insensitively."""
+        temp_registry_db.create_session(sample_session_data)
+
+        data2 = sample_session_data.copy()
+        data2['session_id'] = 'other567'
+        data2['project'] = 'other-project'
+        temp_registry_db.create_session(data2)
+
+        results = temp_registry_db.search_sessions('TEST')
+        assert [r['session_id'] for r in results] == [sample_session_data['session_id']]
+
+    def test_search_sessions_by_session_id_prefix(self, temp_registry_db, sample_session_data):
+        """Matches session ID prefix."""
+        temp_registry_db.create_session(sample_session_data)
+        results = temp_registry_db.search_sessions('test12')
+        assert len(results) == 1
+
+    def test_search_sessions_wildcards_match_literally(self, temp_registry_db, sample_session_data):
+        """% and _ in the query are plain characters, not LIKE wildcards."""
+        for session_id, project in (('aaaa1111', 'my_proj'), ('bbbb2222', 'myXproj'), ('cccc3333', '100%')):
+            data = sample_session_data.copy()
+            data['session_id'] = session_id
+            data['project'] = project
+            temp_registry_db.create_session(data)
+
+        assert [r['project'] for r in temp_registry_db.search_sessions('my_proj')] == ['my_proj']
+        assert [r['project'] for r in temp_registry_db.search_sessions('0%')] == ['100%']
+        assert temp_registry_db.search_sessions('a%') == []
+
+    def test_search_sessions_respects_limit(self, temp_registry_db, sample_session_data):
+        """Caps the number of results."""
+        for i in range(5):
+            data = sample_session_data.copy()
+            data['session_id'] = f'sess{i:04d}'
+            temp_registry_db.create_session(data)
+
+        assert len(temp_registry_db.search_sessions(limit=3)) == 3
+
+    def test_search_sessions_columns(self, temp_registry_db, sample_session_data):
+        """columns= loads only the requested fields."""
+        temp_registry_db.create_session(sample_session_data)
+
+        results = temp_registry_db.search_sessions(columns=('session_id', 'project'))
+        assert results == [{
+            'session_id': sample_session_data['session_id'],
+            'project': sample_session_data['project'],
+        }]
+
+    def test_search_sessions_excludes_inactive(self, temp_registry_db, sample_session_data):
+        """Only returns active sessions by default."""
+        temp_registry_db.create_session(sample_session_data)
+        temp_registry_db.update_session(sample_session_data['session_id'], {'status': 'idle'})
+        assert temp_registry_db.search_sessions() == []
+
+
 class TestGetByThread:
     """Tests for get_by_thread()"""
 
@@ -230,6 +339,73 @@ class TestGetByThread:
         result = temp_registry_db.get_by_thread('nonexistent.thread')
         assert result is None
 
+    def test_set_reply_to_ts(self, temp_registry_db, sample_session_data):
+        """Sets reply_to_ts and bumps last_activity in one statement."""
+        temp_registry_db.create_session(sample_session_data)
+        before = temp_registry_db.get_session(sample_session_data['session_id'])['last_activity']
+
+        assert temp_registry_db.set_reply_to_ts(sample_session_data['session_id'], '111.222') is True
+
+        session = temp_registry_db.get_session(sample_session_data['session_id'])
+        assert session['reply_to_ts'] == '111.222'
+        assert session['last_activity'] >= before
+        assert temp_registry_db.set_reply_to_ts('missing', '111.222') is False
+
+    def test_get_session_id_for_thread(self, temp_registry_db, sample_session_data):
+        """Returns just the session_id for the thread, or None."""
+        temp_registry_db.create_session(sample_session_data)
+
+        assert temp_registry_db.get_session_id_for_thread(sample_session_data['thread_ts']) == sample_session_data['session_id']
+        assert temp_registry_db.get_session_id_for_thread('nonexistent.thread') is None
+
+
+class TestRoutingLookups:
+    """Tests for get_thread_route() / get_channel_routes()"""
+
+    def test_get_thread_route(self, temp_registry_db, sample_session_data):
+        """Returns (session_id, socket_path) for active sessions in the thread."""
+        temp_registry_db.create_session(sample_session_data)
+
+        route = temp_registry_db.get_thread_route(sample_session_data['thread_ts'])
+        assert route == (sample_session_data['session_id'], sample_session_data['socket_path'])
+
+    def test_get_thread_route_excludes_inactive(self, temp_registry_db, sample_session_data):
+        """Inactive sessions are not routable."""
+        temp_registry_db.create_session(sample_session_data)
+        temp_registry_db.update_session(sample_session_data['session_id'], {'status': 'idle'})
+
+        assert temp_registry_db.get_thread_route(sample_session_data['thread_ts']) is None
+
+    def test_get_thread_route_prefers_wrapper_session(self, temp_registry_db, sample_session_data):
+        """The 8-char wrapper session wins over the Claude UUID session in the same thread."""
+        claude_session = {
+            **sample_session_data,
+            'session_id': '12345678-1234-1234-1234-123456789abc',
+            'socket_path': '/tmp/claude-uuid.sock',
+        }
+        wrapper_session = {**sample_session_data, 'session_id': 'abcd1234', 'socket_path': '/tmp/wrapper.sock'}
+        temp_registry_db.create_session(claude_session)
+        temp_registry_db.create_session(wrapper_session)
+
+        route = temp_registry_db.get_thread_route(sample_session_data['thread_ts'])
+        assert route == ('abcd1234', '/tmp/wrapper.sock')
+
+    def test_get_channel_routes_matches_name(self, temp_registry_db, sample_session_data_custom_channel):
+        """Matches custom channel sessions by resolved channel name."""
+        temp_registry_db.create_session(sample_session_data_custom_channel)
+
+        routes = temp_registry_db.get_channel_routes('C999', sample_session_data_custom_channel['channel'])
+        assert routes == [(
+            sample_session_data_custom_channel['session_id'],
+            sample_session_data_custom_channel['socket_path']
+        )]
+
+    def test_get_channel_routes_ignores_threaded_sessions(self, temp_registry_db, sample_session_data):
+        """Sessions with a thread_ts are not custom channel sessions."""
+        temp_registry_db.create_session(sample_session_data)
+
+        assert temp_registry_db.get_channel_routes(sample_session_data['channel']) == []
+
 
 class TestGetByProjectDir:
     """Tests for get_by_project_dir()"""
@@ -419,6 +595,47 @@ class TestSchemaMigration:
             columns = [row[1] for row in result.fetchall()]
             assert 'buffer_file_path' in columns
 
+    def test_migration_adds_status_created_index(self, temp_db_path):
+        """Listing index is created on databases that predate it."""
+        import sqlite3
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute("""
+            CREATE TABLE sessions (
+                session_id VARCHAR(50) PRIMARY KEY,
+                project VARCHAR(255) NOT NULL,
+                terminal VARCHAR(100) NOT NULL,
+                socket_path VARCHAR(512) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                created_at DATETIME NOT NULL,
+                last_activity DATETIME NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+        db = RegistryDatabase(temp_db_path)
+        with db.engine.connect() as conn:
+            from sqlalchemy import text
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM sessions WHERE status = 'active' ORDER BY created_at DESC"
+            )).fetchall()
+        assert any('idx_status_created' in str(row) for row in plan)
+
+    def test_routing_queries_use_composite_indexes(self, temp_registry_db):
+        """Thread and custom-channel routing lookups are satisfied by composite indexes."""
+        from sqlalchemy import text
+        from registry_db import _SELECT_THREAD_ROUTE, _SELECT_CHANNEL_ROUTES
+        with temp_registry_db.engine.connect() as conn:
+            thread_plan = conn.execute(
+                text(f"EXPLAIN QUERY PLAN {_SELECT_THREAD_ROUTE.text}"), {'thread_ts': '1.2'}
+            ).fetchall()
+            channel_plan = conn.execute(
+                text(f"EXPLAIN QUERY PLAN {_SELECT_CHANNEL_ROUTES.text}"),
+                {'channel': 'C1', 'channel_name': 'proj'}
+            ).fetchall()
+        assert any('idx_sessions_thread_active' in str(row) for row in thread_plan)
+        assert any('idx_sessions_channel_thread_active' in str(row) for row in channel_plan)
+
 
 class TestDMSubscriptions:
     """Tests for DM subscription CRUD methods."""
@@ -493,6 +710,20 @@ class TestDMSubscriptions:
         user_ids = {s['user_id'] for s in subs}
         assert user_ids == {'U111111', 'U222222'}
 
+    def test_get_dm_route(self, temp_registry_db, sample_session_data):
+        """Returns the subscribed session's socket and the user's mode in one call."""
+        assert temp_registry_db.get_dm_route('U123456') is None
+
+        temp_registry_db.create_session(sample_session_data)
+        temp_registry_db.create_dm_subscription('U123456', sample_session_data['session_id'], 'D123456')
+        assert temp_registry_db.get_dm_route('U123456') == (
+            sample_session_data['session_id'], sample_session_data['socket_path'], 'execute'
+        )
+
+        temp_registry_db.set_user_mode('U123456', 'plan')
+        temp_registry_db.delete_session(sample_session_data['session_id'])
+        assert temp_registry_db.get_dm_route('U123456') == (sample_session_data['session_id'], None, 'plan')
+
     def test_get_dm_subscription_for_user(self, temp_registry_db, sample_session_data):
         """Returns user's current subscription or None."""
         temp_registry_db.create_session(sample_session_data)
@@ -557,6 +788,27 @@ class TestDMSubscriptions:
         assert len(subs) == 0
 
 
+class TestUserMode:
+    """Tests for set_user_mode() / get_user_mode()"""
+
+    def test_get_user_mode_default(self, temp_registry_db):
+        """Users without a preference get 'execute'."""
+        assert temp_registry_db.get_user_mode('U123') == 'execute'
+
+    def test_set_then_get_user_mode(self, temp_registry_db):
+        """Mode written by set_user_mode is read back."""
+        temp_registry_db.set_user_mode('U123', 'Plan')
+        assert temp_registry_db.get_user_mode('U123') == 'plan'
+
+        temp_registry_db.set_user_mode('U123', 'research')
+        assert temp_registry_db.get_user_mode('U123') == 'research'
+
+    def test_set_user_mode_invalid(self, temp_registry_db):
+        """Invalid modes are rejected."""
+        with pytest.raises(ValueError):
+            temp_registry_db.set_user_mode('U123', 'yolo')
+
+
 class TestAskUserQuestionCreate:
     """Tests for create_askuser_question()"""
 
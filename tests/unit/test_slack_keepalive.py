@@ -0,0 +1,157 @@
+"""
+Unit tests for core/slack_keepalive.py
+
+Runs a WebClient against a local HTTP/1.1 server and checks that calls
+reuse one connection and that errors surface as they do over urllib.
+"""
+
+import json
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.base_client import BaseClient
+
+# Add core directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
+
+import slack_keepalive
+from slack_keepalive import install_keepalive_transport
+
+
+class FakeSlackHandler(BaseHTTPRequestHandler):
+    """Answers every API call with {"ok": true}, or a 429 for chat.update."""
+
+    protocol_version = "HTTP/1.1"
+    connections = []
+    closed = threading.Event()  # Set once a connection has been dropped
+
+    def setup(self):
+        super().setup()
+        self.connections.append(self.client_address)
+
+    def do_POST(self):
+        # Requests carrying X-Test-Close get their connection dropped after the
+        # response, without a Connection: close header to warn the client
+        self.close_connection = self.headers.get("X-Test-Close") == "1"
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("chat.update"):
+            status, body = 429, {"ok": False, "error": "ratelimited"}
+        else:
+            status, body = 200, {"ok": True, "path": self.path}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+        if self.close_connection:
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.closed.set()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slack_server(monkeypatch):
+    """Local fake Slack API with the keep-alive transport installed for the test only."""
+    monkeypatch.setattr(
+        BaseClient, "_perform_urllib_http_request_internal",
+        BaseClient._perform_urllib_http_request_internal,
+    )
+    monkeypatch.setattr(slack_keepalive, "_local", threading.local())
+    install_keepalive_transport()
+
+    FakeSlackHandler.connections = []
+    FakeSlackHandler.closed = threading.Event()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSlackHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, close_after_response=False):
+    host, port = server.server_address
+    headers = {"X-Test-Close": "1"} if close_after_response else {}
+    return WebClient(token="xoxb-test", base_url=f"http://{host}:{port}/api/", retry_handlers=[], headers=headers)
+
+
+class TestKeepAliveTransport:
+    """Tests for install_keepalive_transport()."""
+
+    def test_calls_reuse_one_connection(self, slack_server):
+        """Separate clients on one thread share a single connection."""
+        for _ in range(3):
+            assert make_client(slack_server).auth_test()["ok"] is True
+
+        assert len(FakeSlackHandler.connections) == 1
+
+    def test_reconnects_after_server_closes(self, slack_server):
+        """A connection the server closed while idle is reopened, not reused."""
+        make_client(slack_server, close_after_response=True).auth_test()
+        assert FakeSlackHandler.closed.wait(timeout=5)
+
+        assert make_client(slack_server).auth_test()["ok"] is True
+        assert len(FakeSlackHandler.connections) == 2
+
+    def test_http_errors_surface_like_urllib(self, slack_server):
+        """Non-2xx responses reach the SDK's error handling with status and headers."""
+        with pytest.raises(SlackApiError) as exc_info:
+            make_client(slack_server).chat_update(channel="C123", ts="1.2", text="hi")
+
+        assert exc_info.value.response.status_code == 429
+        assert exc_info.value.response.headers["Retry-After"] == "1"
+
+    def test_install_is_idempotent(self, slack_server):
+        """Installing twice keeps the first install."""
+        assert install_keepalive_transport() is False
+
+
+class TestSdkCompatibility:
+    """install_keepalive_transport() leaves urllib in place on an SDK it wasn't written for."""
+
+    @pytest.fixture(autouse=True)
+    def restore_transport(self, monkeypatch):
+        monkeypatch.setattr(
+            BaseClient, "_perform_urllib_http_request_internal",
+            BaseClient._perform_urllib_http_request_internal,
+        )
+
+    def test_supported_sdk_installs(self):
+        """The installed slack_sdk is one the transport supports."""
+        assert slack_keepalive._sdk_incompatibility() is None
+
+    def test_other_major_version_keeps_urllib(self, monkeypatch):
+        """A new major slack_sdk release isn't patched."""
+        original = BaseClient._perform_urllib_http_request_internal
+        monkeypatch.setattr(slack_keepalive, "SLACK_SDK_VERSION", "4.0.0")
+
+        assert install_keepalive_transport() is False
+        assert BaseClient._perform_urllib_http_request_internal is original
+
+    def test_changed_signature_keeps_urllib(self, monkeypatch):
+        """A private method whose signature changed isn't replaced."""
+        def changed(self, url, req, timeout):
+            pass
+
+        monkeypatch.setattr(slack_keepalive, "_urllib_request", changed)
+        monkeypatch.setattr(BaseClient, "_perform_urllib_http_request_internal", changed)
+
+        assert install_keepalive_transport() is False
+        assert BaseClient._perform_urllib_http_request_internal is changed
+
+    def test_missing_method_keeps_urllib(self, monkeypatch):
+        """An SDK without the private method is left alone."""
+        monkeypatch.setattr(slack_keepalive, "_urllib_request", None)
+
+        assert "no longer exists" in slack_keepalive._sdk_incompatibility()
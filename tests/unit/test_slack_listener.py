@@ -5,6 +5,7 @@ Tests Slack event handling including message routing,
 permission button handling, and reaction responses.
 """
 
+import json
 import os
 import sys
 from pathlib import Path
@@ -16,6 +17,209 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
 
 
+@pytest.fixture(autouse=True)
+def clear_route_caches():
+    """Routing lookups are cached per process; start each test cold."""
+    import slack_listener
+    slack_listener._thread_route_cache.clear()
+    slack_listener._channel_route_cache.clear()
+    slack_listener._channel_name_cache.clear()
+    slack_listener._socket_exists_cache.clear()
+    slack_listener._message_thread_cache.clear()
+    slack_listener._non_askuser_messages.clear()
+    slack_listener._seen_reactions.clear()
+    slack_listener._message_route_cache.clear()
+    slack_listener._dm_channel_cache.clear()
+    slack_listener._active_sessions_cache.clear()
+    slack_listener._slack_breakers.clear()
+    slack_listener._thread_session_cache.clear()
+    slack_listener._socket_gone_counts.clear()
+    yield
+
+
+class TestOrjsonEncoder:
+    """Tests for install_orjson_encoder()."""
+
+    def test_install_patches_slack_sdk_only(self, monkeypatch):
+        """Slack SDK JSON bodies are encoded with orjson; global json is untouched."""
+        import json
+        pytest.importorskip("orjson")
+        from slack_sdk.web import base_client
+        monkeypatch.setattr(base_client, 'json', base_client.json)
+
+        from slack_listener import install_orjson_encoder
+        assert install_orjson_encoder() is True
+
+        body = base_client.json.dumps({"blocks": [{"type": "divider"}]})
+        assert isinstance(body, bytes)
+        assert json.loads(body) == {"blocks": [{"type": "divider"}]}
+        assert base_client.json.loads('{"ok": true}') == {"ok": True}
+        assert isinstance(json.dumps({}), str)
+
+    def test_install_without_orjson(self):
+        """Returns False when orjson is not installed."""
+        with patch('slack_listener.orjson', None):
+            from slack_listener import install_orjson_encoder
+            assert install_orjson_encoder() is False
+
+
+class TestMain:
+    """Tests for main() startup validation."""
+
+    def test_main_exits_before_banner_without_app_token(self, capsys):
+        """Missing SLACK_APP_TOKEN fails fast, before any startup output."""
+        with patch('slack_listener._slack_app_error', None), \
+             patch('slack_listener.SLACK_APP_TOKEN', None), \
+             patch('slack_listener.SocketModeHandler') as mock_handler:
+            from slack_listener import main
+
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+            assert exc_info.value.code == 1
+            mock_handler.assert_not_called()
+            captured = capsys.readouterr()
+            assert captured.out == ""
+            assert "SLACK_APP_TOKEN" in captured.err
+
+    def test_main_writes_banner_once_and_starts_handler(self):
+        """Startup banner is emitted with a single stdout write."""
+        with patch('slack_listener._slack_app_error', None), \
+             patch('slack_listener.SLACK_APP_TOKEN', 'xapp-test'), \
+             patch('slack_listener.SocketModeHandler') as mock_handler, \
+             patch('slack_listener.sys.stdout') as mock_stdout:
+            from slack_listener import main
+
+            main()
+
+            mock_stdout.write.assert_called_once()
+            banner = mock_stdout.write.call_args[0][0]
+            assert "Slack bot is running" in banner
+            assert "Press Ctrl+C to stop" in banner
+            mock_handler.return_value.start.assert_called_once()
+
+    def test_main_sizes_handler_pool_from_config(self, clean_env):
+        """SLACK_BOT_CONCURRENCY sets the Socket Mode worker count."""
+        clean_env.setenv('SLACK_BOT_CONCURRENCY', '12')
+        with patch('slack_listener._slack_app_error', None), \
+             patch('slack_listener.SLACK_APP_TOKEN', 'xapp-test'), \
+             patch('slack_listener.SocketModeHandler') as mock_handler, \
+             patch('slack_listener.sys.stdout'):
+            from slack_listener import main
+
+            main()
+
+            assert mock_handler.call_args.kwargs['concurrency'] == 12
+
+    def test_main_reads_socket_mode_in_large_chunks(self):
+        """The websocket reader uses SOCKET_MODE_RECEIVE_BUFFER instead of the SDK's 1 KB reads."""
+        with patch('slack_listener._slack_app_error', None), \
+             patch('slack_listener.SLACK_APP_TOKEN', 'xapp-test'), \
+             patch('slack_listener.SocketModeHandler') as mock_handler, \
+             patch('slack_listener.sys.stdout'):
+            from slack_listener import main, SOCKET_MODE_RECEIVE_BUFFER
+
+            main()
+
+            assert mock_handler.call_args.kwargs['receive_buffer_size'] == SOCKET_MODE_RECEIVE_BUFFER
+
+    def test_main_resolves_bot_user_id_before_start(self, mock_slack_client):
+        """auth.test runs once at startup so events find the bot ID cached."""
+        with patch('slack_listener._slack_app_error', None), \
+             patch('slack_listener.SLACK_APP_TOKEN', 'xapp-test'), \
+             patch('slack_listener.SocketModeHandler'), \
+             patch('slack_listener.sys.stdout'), \
+             patch('slack_listener._bot_user_id', None), \
+             patch('slack_listener._bot_mention', None), \
+             patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            import slack_listener
+
+            slack_listener.main()
+
+            mock_slack_client.auth_test.assert_called_once()
+            assert slack_listener._bot_user_id == 'UBOT123'
+            assert slack_listener._bot_mention == '<@UBOT123>'
+
+
+class TestCreateWebClient:
+    """Tests for create_web_client()."""
+
+    def test_clients_share_ssl_context(self):
+        """Every client reuses the module's TLS context instead of building one per connection."""
+        from slack_listener import create_web_client, SLACK_SSL_CONTEXT
+
+        first = create_web_client('xoxb-test')
+        second = create_web_client('xoxb-test')
+
+        assert first.ssl is SLACK_SSL_CONTEXT
+        assert second.ssl is SLACK_SSL_CONTEXT
+        assert first.token == 'xoxb-test'
+
+
+class TestQueuedLogging:
+    """Tests for queued_logging()."""
+
+    def test_records_delivered_and_handlers_restored(self):
+        """Records reach the original handlers via the queue; handlers are put back on exit."""
+        import logging
+        from slack_listener import log, queued_logging
+
+        seen = []
+        sink = logging.Handler()
+        sink.emit = seen.append
+        log.addHandler(sink)
+        try:
+            before = list(log.handlers)
+            with queued_logging():
+                assert sink not in log.handlers
+                try:
+                    raise ValueError("boom")
+                except ValueError:
+                    log.exception("❌ Error in handler")
+
+            assert log.handlers == before
+            assert len(seen) == 1
+            message = seen[0].getMessage()
+            assert message.startswith("❌ Error in handler")
+            assert "ValueError: boom" in message
+        finally:
+            log.removeHandler(sink)
+
+
+class TestGetBotUserId:
+    """Tests for get_bot_user_id() / get_bot_mention()."""
+
+    def test_auth_test_called_once(self, mock_slack_client):
+        """auth.test result is cached after the first successful call."""
+        with patch('slack_listener._bot_user_id', None):
+            from slack_listener import get_bot_user_id
+
+            assert get_bot_user_id(mock_slack_client) == 'UBOT123'
+            assert get_bot_user_id(mock_slack_client) == 'UBOT123'
+            mock_slack_client.auth_test.assert_called_once()
+
+    def test_failure_not_cached(self, mock_slack_client):
+        """A failed auth.test is retried on the next event."""
+        with patch('slack_listener._bot_user_id', None):
+            from slack_listener import get_bot_user_id
+
+            mock_slack_client.auth_test.side_effect = [Exception("network"), {'user_id': 'UBOT123'}]
+            with pytest.raises(Exception):
+                get_bot_user_id(mock_slack_client)
+            assert get_bot_user_id(mock_slack_client) == 'UBOT123'
+
+    def test_bot_mention_built_once(self, mock_slack_client):
+        """The mention markup is derived from the cached ID and reused."""
+        with patch('slack_listener._bot_user_id', None), \
+             patch('slack_listener._bot_mention', None):
+            from slack_listener import get_bot_mention
+
+            assert get_bot_mention(mock_slack_client) == '<@UBOT123>'
+            assert get_bot_mention(mock_slack_client) == '<@UBOT123>'
+            mock_slack_client.auth_test.assert_called_once()
+
+
 class TestGetSocketForThread:
     """Tests for get_socket_for_thread()."""
 
@@ -63,6 +267,48 @@ class TestGetSocketForThread:
             assert socket_path is None
 
 
+    def test_get_socket_for_thread_cached(self, temp_registry_db, sample_session_data):
+        """Repeated lookups for the same thread hit the registry once."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch('slack_listener.socket_exists', return_value=True):
+            from slack_listener import get_socket_for_thread
+            with patch.object(temp_registry_db, 'get_thread_route',
+                              wraps=temp_registry_db.get_thread_route) as mock_route:
+                for _ in range(3):
+                    assert get_socket_for_thread(sample_session_data['thread_ts']) == sample_session_data['socket_path']
+                assert mock_route.call_count == 1
+
+    def test_cached_thread_route_dropped_when_socket_gone(self, temp_registry_db, sample_session_data):
+        """A cached route whose socket file disappeared is looked up again."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch('slack_listener.socket_exists', side_effect=[False]) as mock_exists:
+            from slack_listener import get_socket_for_thread
+            with patch.object(temp_registry_db, 'get_thread_route',
+                              wraps=temp_registry_db.get_thread_route) as mock_route:
+                get_socket_for_thread(sample_session_data['thread_ts'])
+                get_socket_for_thread(sample_session_data['thread_ts'])
+
+                assert mock_exists.call_count == 1
+                assert mock_route.call_count == 2
+
+    def test_get_socket_for_thread_invalidated_on_send_failure(self, temp_registry_db, sample_session_data):
+        """A failed send evicts the cached route so the next lookup re-queries."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db):
+            from slack_listener import get_socket_for_thread, send_to_session_socket
+            with patch.object(temp_registry_db, 'get_thread_route',
+                              wraps=temp_registry_db.get_thread_route) as mock_route:
+                socket_path = get_socket_for_thread(sample_session_data['thread_ts'])
+                assert send_to_session_socket("hi", socket_path) is False
+                get_socket_for_thread(sample_session_data['thread_ts'])
+                assert mock_route.call_count == 2
+
+
 class TestGetSocketForChannel:
     """Tests for get_socket_for_channel()."""
 
@@ -99,6 +345,88 @@ class TestGetSocketForChannel:
                 assert result is None
 
 
+class TestSocketExists:
+    """Tests for socket_exists()."""
+
+    def test_socket_exists_cached(self, tmp_path):
+        """Repeated checks within the TTL stat the path once."""
+        socket_path = str(tmp_path / "s.sock")
+        with patch('slack_listener.os.path.exists', return_value=True) as mock_exists:
+            from slack_listener import socket_exists
+            assert socket_exists(socket_path) is True
+            assert socket_exists(socket_path) is True
+            assert mock_exists.call_count == 1
+
+    def test_socket_exists_invalidated(self, tmp_path):
+        """invalidate_socket_routes() forces a fresh stat."""
+        socket_path = tmp_path / "s.sock"
+        socket_path.touch()
+        from slack_listener import socket_exists, invalidate_socket_routes
+        assert socket_exists(str(socket_path)) is True
+        socket_path.unlink()
+        invalidate_socket_routes(str(socket_path))
+        assert socket_exists(str(socket_path)) is False
+
+    def test_refused_socket_remembered_as_gone(self, tmp_path):
+        """A refused connection marks the socket missing without another stat."""
+        socket_path = str(tmp_path / "s.sock")
+        from slack_listener import socket_exists, invalidate_socket_routes
+
+        with patch('slack_listener.os.path.exists', return_value=True) as mock_exists:
+            assert socket_exists(socket_path) is True
+            invalidate_socket_routes(socket_path, ConnectionRefusedError())
+            assert socket_exists(socket_path) is False
+            assert mock_exists.call_count == 1
+
+
+class TestResolveChannelName:
+    """Tests for resolve_channel_name()."""
+
+    def test_resolve_channel_name_cached(self, mock_slack_client):
+        """conversations_info is called once per channel ID."""
+        mock_slack_client.conversations_info.return_value = {"ok": True, "channel": {"name": "my-project"}}
+
+        with patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            from slack_listener import resolve_channel_name
+            assert resolve_channel_name('C0123') == 'my-project'
+            assert resolve_channel_name('C0123') == 'my-project'
+            assert mock_slack_client.conversations_info.call_count == 1
+
+    def test_resolve_channel_name_failure_not_cached(self, mock_slack_client):
+        """Failed lookups fall back to the ID and are retried."""
+        mock_slack_client.conversations_info.side_effect = Exception("ratelimited")
+
+        with patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            from slack_listener import resolve_channel_name
+            assert resolve_channel_name('C0123') == 'C0123'
+            assert resolve_channel_name('C0123') == 'C0123'
+            assert mock_slack_client.conversations_info.call_count == 2
+
+    def test_resolve_channel_name_passes_names_through(self, mock_slack_client):
+        """Non-ID values are returned without an API call."""
+        with patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            from slack_listener import resolve_channel_name
+            assert resolve_channel_name('test-custom-channel') == 'test-custom-channel'
+            mock_slack_client.conversations_info.assert_not_called()
+
+    def test_channel_rename_updates_cache_and_drops_route(self, mock_slack_client):
+        """A rename replaces the cached name and forgets the channel's cached route."""
+        import slack_listener
+        slack_listener._channel_name_cache['C123'] = 'old-name'
+        slack_listener._channel_route_cache.set('C123', ('sess1234', '/tmp/old.sock'))
+
+        with patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            slack_listener.handle_channel_rename({'channel': {'id': 'C123', 'name': 'new-name'}})
+
+            assert slack_listener.resolve_channel_name('C123') == 'new-name'
+            mock_slack_client.conversations_info.assert_not_called()
+            assert 'C123' not in slack_listener._channel_route_cache
+
+
 class TestSendResponse:
     """Tests for send_response()."""
 
@@ -123,8 +451,9 @@ class TestSendResponse:
         })
 
         try:
-            with patch('slack_listener.registry_db', temp_registry_db):
-                with patch('slack_listener.get_socket_for_thread', return_value=str(socket_path)):
+            with patch('slack_listener.registry_db', temp_registry_db), \
+                 patch('slack_listener.RESPONSE_FILE', tmp_path / "slack_response.txt"):
+                with patch('slack_listener.get_route_for_thread', return_value=('abc12345', str(socket_path))):
                     from slack_listener import send_response
                     mode = send_response("test message", thread_ts='123.456')
                     assert mode == "registry_socket"
@@ -143,10 +472,460 @@ class TestSendResponse:
                     assert mode == "file"
                     assert response_file.read_text() == "test message"
 
+    def test_send_response_file_fallback_replaces_previous(self, tmp_path):
+        """Each fallback write replaces the file's previous (longer) contents."""
+        response_file = tmp_path / "slack_response.txt"
+        response_file.write_text("an older, much longer response ✅")
+
+        with patch('slack_listener.registry_db', None), \
+             patch('slack_listener.SOCKET_PATH', '/nonexistent/socket'), \
+             patch('slack_listener.RESPONSE_FILE', response_file):
+            from slack_listener import send_response
+            assert send_response("né") == "file"
+
+        assert response_file.read_text(encoding="utf-8") == "né"
+
+    def test_send_response_file_fallback_after_reader_unlinks(self, tmp_path):
+        """Once the reader consumes (deletes) the file, the next response creates it again."""
+        response_file = tmp_path / "slack_response.txt"
+
+        with patch('slack_listener.registry_db', None), \
+             patch('slack_listener.SOCKET_PATH', '/nonexistent/socket'), \
+             patch('slack_listener.RESPONSE_FILE', response_file):
+            from slack_listener import send_response
+            send_response("first")
+            response_file.unlink()
+            send_response("second")
+
+        assert response_file.read_text(encoding="utf-8") == "second"
+
+    def test_send_response_retries_once_without_sleep(self, tmp_path):
+        """A failed send is retried once immediately, then falls back to file."""
+        socket_path = tmp_path / "dead.sock"
+        socket_path.touch()
+        response_file = tmp_path / "slack_response.txt"
+
+        with patch('slack_listener.get_route_for_thread', return_value=('abc12345', str(socket_path))), \
+             patch('slack_listener.RESPONSE_FILE', response_file), \
+             patch('slack_listener._send_socket_message', side_effect=BrokenPipeError) as mock_send, \
+             patch('time.sleep') as mock_sleep:
+            from slack_listener import send_response
+            mode = send_response("test message", thread_ts='123.456')
+
+        assert mode == "file"
+        assert mock_send.call_count == 2
+        mock_sleep.assert_not_called()
+
+    def test_send_response_gone_socket_not_retried(self, tmp_path):
+        """A refused connection means the wrapper is gone; fall back to file without a retry."""
+        socket_path = tmp_path / "dead.sock"
+        socket_path.touch()
+        response_file = tmp_path / "slack_response.txt"
+
+        with patch('slack_listener.get_route_for_thread', return_value=('abc12345', str(socket_path))), \
+             patch('slack_listener.RESPONSE_FILE', response_file), \
+             patch('slack_listener._send_socket_message', side_effect=ConnectionRefusedError) as mock_send:
+            from slack_listener import send_response
+            mode = send_response("test message", thread_ts='123.456')
+
+        assert mode == "file"
+        assert mock_send.call_count == 1
+
+    def test_send_response_timed_out_socket_not_retried(self, tmp_path):
+        """A send that hit SO_SNDTIMEO isn't retried, so the handler blocks for one timeout at most."""
+        socket_path = tmp_path / "stalled.sock"
+        socket_path.touch()
+        response_file = tmp_path / "slack_response.txt"
+
+        with patch('slack_listener.get_route_for_thread', return_value=('abc12345', str(socket_path))), \
+             patch('slack_listener.RESPONSE_FILE', response_file), \
+             patch('slack_listener._send_socket_message', side_effect=BlockingIOError) as mock_send, \
+             patch('slack_listener._record_socket_gone') as mock_gone:
+            from slack_listener import send_response
+            mode = send_response("test message", thread_ts='123.456')
+
+        assert mode == "file"
+        assert mock_send.call_count == 1
+        mock_gone.assert_not_called()
+
+    def test_send_response_deactivates_session_with_gone_socket(self, temp_registry_db, sample_session_data, tmp_path):
+        """After SOCKET_GONE_THRESHOLD refused sends in a row, the session is marked inactive."""
+        temp_registry_db.create_session(sample_session_data)
+        route = (sample_session_data['socket_path'], sample_session_data['session_id'], "registry_socket")
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch('slack_listener.RESPONSE_FILE', tmp_path / "slack_response.txt"), \
+             patch('slack_listener.socket_known_gone', return_value=False), \
+             patch('slack_listener._send_socket_message', side_effect=ConnectionRefusedError):
+            from slack_listener import send_response, SOCKET_GONE_THRESHOLD
+
+            for _ in range(SOCKET_GONE_THRESHOLD - 1):
+                send_response("test message", route=route)
+                assert temp_registry_db.get_session(sample_session_data['session_id'])['status'] == 'active'
+
+            send_response("test message", route=route)
+
+        assert temp_registry_db.get_session(sample_session_data['session_id'])['status'] == 'inactive'
+
+    def test_concurrent_gone_sends_deactivate_once_per_threshold(self):
+        """Counts from concurrent listener threads aren't lost, and each threshold deactivates once."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        import slack_listener
+        from slack_listener import _record_socket_gone, SOCKET_GONE_THRESHOLD
+
+        workers = SOCKET_GONE_THRESHOLD * 10
+        barrier = threading.Barrier(workers)
+
+        def record():
+            barrier.wait()
+            _record_socket_gone('/tmp/gone.sock', 'abc12345')
+
+        mock_db = MagicMock()
+        with patch('slack_listener.registry_db', mock_db), \
+             ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(record) for _ in range(workers)]:
+                future.result()
+
+        assert mock_db.update_session.call_count == 10
+        assert '/tmp/gone.sock' not in slack_listener._socket_gone_counts
+
+
+class TestSendToSessionSocket:
+    """Tests for send_to_session_socket()."""
+
+    def test_known_gone_socket_skips_connect(self):
+        """A socket that recently failed with ENOENT isn't connected to again."""
+        from slack_listener import send_to_session_socket, invalidate_socket_routes
+
+        invalidate_socket_routes('/tmp/gone.sock', FileNotFoundError())
+        with patch('slack_listener._send_socket_message') as mock_send, \
+             patch('os.path.exists') as mock_exists:
+            assert send_to_session_socket("hi", '/tmp/gone.sock') is False
+        mock_send.assert_not_called()
+        mock_exists.assert_not_called()
+
+    def test_missing_socket_detected_by_connect(self, tmp_path):
+        """No stat() before connecting; a missing socket fails the connect and is remembered."""
+        from slack_listener import send_to_session_socket, socket_known_gone
+
+        socket_path = str(tmp_path / "missing.sock")
+        with patch('os.path.exists') as mock_exists:
+            assert send_to_session_socket("hi", socket_path) is False
+        mock_exists.assert_not_called()
+        assert socket_known_gone(socket_path)
+
+    def test_delivers_message_and_closes_connection(self, tmp_path):
+        """One connection per message; the wrapper sees EOF after the payload."""
+        import socket as sock_module
+        socket_path = str(tmp_path / "s.sock")
+        server = sock_module.socket(sock_module.AF_UNIX, sock_module.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(2)
+
+        try:
+            from slack_listener import send_to_session_socket
+            assert send_to_session_socket("héllo", socket_path) is True
+
+            conn, _ = server.accept()
+            with conn:
+                data = b''
+                while chunk := conn.recv(4096):
+                    data += chunk
+            assert data.decode('utf-8') == "héllo"
+        finally:
+            server.close()
+
+    def test_message_larger_than_send_buffer_finishes_blocking(self, tmp_path):
+        """A send the socket buffer can't take at once completes on the blocking path."""
+        import socket as sock_module
+        import threading
+        import time
+        socket_path = str(tmp_path / "s.sock")
+        server = sock_module.socket(sock_module.AF_UNIX, sock_module.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(2)
+        received = []
+
+        def read_slowly():
+            conn, _ = server.accept()
+            time.sleep(0.1)  # Let the sender fill its buffer first
+            with conn:
+                data = b''
+                while chunk := conn.recv(65536):
+                    data += chunk
+            received.append(data)
+
+        reader = threading.Thread(target=read_slowly)
+        reader.start()
+        try:
+            from slack_listener import _send_socket_message
+            payload = b"y" * (8 * 1024 * 1024)
+            _send_socket_message(payload, socket_path)
+            reader.join(timeout=5)
+            assert received == [payload]
+        finally:
+            server.close()
+
+    def test_accepts_pre_encoded_payload(self, tmp_path):
+        """Bytes are sent as-is without re-encoding."""
+        socket_path = tmp_path / "s.sock"
+        socket_path.touch()
+        with patch('slack_listener._send_socket_message') as mock_send:
+            from slack_listener import send_to_session_socket
+            assert send_to_session_socket("héllo".encode('utf-8'), str(socket_path)) is True
+            mock_send.assert_called_once_with("héllo".encode('utf-8'), str(socket_path))
+
+    def test_delivers_large_message(self, tmp_path):
+        """Payloads above the default buffer size arrive intact."""
+        import socket as sock_module
+        import threading
+        socket_path = str(tmp_path / "s.sock")
+        server = sock_module.socket(sock_module.AF_UNIX, sock_module.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(2)
+        received = []
+
+        def read_all():
+            conn, _ = server.accept()
+            with conn:
+                data = b''
+                while chunk := conn.recv(65536):
+                    data += chunk
+            received.append(data)
+
+        reader = threading.Thread(target=read_all)
+        reader.start()
+        try:
+            from slack_listener import send_to_session_socket
+            message = "x" * (256 * 1024)
+            assert send_to_session_socket(message, socket_path) is True
+            reader.join(timeout=5)
+            assert received == [message.encode('utf-8')]
+        finally:
+            server.close()
+
+    def test_closes_socket_on_failed_connect(self, tmp_path):
+        """Failed connects don't leak the client socket."""
+        socket_path = tmp_path / "dead.sock"
+        socket_path.touch()  # Exists but nothing is listening
+
+        with patch('slack_listener.sock_module.socket') as mock_socket_cls:
+            client = mock_socket_cls.return_value.__enter__.return_value
+            client.connect.side_effect = ConnectionRefusedError()
+
+            from slack_listener import send_to_session_socket
+            assert send_to_session_socket("hi", str(socket_path)) is False
+            mock_socket_cls.return_value.__exit__.assert_called_once()
+
+    def test_uses_kernel_send_timeout(self, tmp_path):
+        """The send is bounded with SO_SNDTIMEO on a blocking socket, not settimeout()."""
+        import socket as real_socket
+        socket_path = tmp_path / "live.sock"
+        socket_path.touch()
+
+        with patch('slack_listener.sock_module.socket') as mock_socket_cls:
+            client = mock_socket_cls.return_value.__enter__.return_value
+
+            from slack_listener import send_to_session_socket, _SOCKET_SEND_TIMEVAL
+            assert send_to_session_socket("hi", str(socket_path)) is True
+
+            client.setsockopt.assert_any_call(
+                real_socket.SOL_SOCKET, real_socket.SO_SNDTIMEO, _SOCKET_SEND_TIMEVAL
+            )
+            client.settimeout.assert_not_called()
+
+
+class TestAddReactionAsync:
+    """Tests for add_reaction_async()."""
+
+    def test_add_reaction_async(self, mock_slack_client):
+        """Adds the reaction off the calling thread."""
+        with patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            from slack_listener import add_reaction_async
+            add_reaction_async('C123', '111.222').result(timeout=5)
+
+        mock_slack_client.reactions_add.assert_called_once_with(
+            channel='C123', timestamp='111.222', name='white_check_mark'
+        )
+
+    def test_add_reaction_async_swallows_errors(self, mock_slack_client):
+        """Slack errors are logged, not raised."""
+        mock_slack_client.reactions_add.side_effect = Exception("already_reacted")
+        with patch('slack_listener.app') as mock_app:
+            mock_app.client = mock_slack_client
+            from slack_listener import add_reaction_async
+            assert add_reaction_async('C123', '111.222').result(timeout=5) is None
+
+
+class TestSlackApiCall:
+    """Tests for slack_api_call()."""
+
+    def test_opens_after_repeated_timeouts(self, mock_slack_client):
+        """Once an endpoint keeps timing out, further calls fail without hitting Slack."""
+        from slack_listener import slack_api_call, SLACK_BREAKER_THRESHOLD
+        from circuit_breaker import CircuitOpenError
+
+        mock_slack_client.views_open.side_effect = TimeoutError("timed out")
+        for _ in range(SLACK_BREAKER_THRESHOLD):
+            with pytest.raises(TimeoutError):
+                slack_api_call("views.open", mock_slack_client.views_open, trigger_id='T1')
+
+        with pytest.raises(CircuitOpenError):
+            slack_api_call("views.open", mock_slack_client.views_open, trigger_id='T1')
+        assert mock_slack_client.views_open.call_count == SLACK_BREAKER_THRESHOLD
+
+        # Other endpoints are unaffected
+        slack_api_call("chat.update", mock_slack_client.chat_update, channel='C1', ts='1.0')
+        mock_slack_client.chat_update.assert_called_once()
+
+    def test_request_errors_do_not_trip(self, mock_slack_client):
+        """Slack rejecting a request (e.g. message_not_found) is not an outage."""
+        from slack_listener import slack_api_call, SLACK_BREAKER_THRESHOLD
+        from slack_sdk.errors import SlackApiError
+
+        response = MagicMock(status_code=200)
+        mock_slack_client.chat_delete.side_effect = SlackApiError("message_not_found", response)
+        for _ in range(SLACK_BREAKER_THRESHOLD + 1):
+            with pytest.raises(SlackApiError):
+                slack_api_call("chat.delete", mock_slack_client.chat_delete, channel='C1', ts='1.0')
+
+        assert mock_slack_client.chat_delete.call_count == SLACK_BREAKER_THRESHOLD + 1
+
+    def test_takes_token_from_endpoint_bucket(self, mock_slack_client):
+        """Each call is paced by its endpoint's token bucket."""
+        bucket = MagicMock()
+        bucket.take.return_value = 0.0
+        with patch.dict('slack_listener._slack_buckets', {'chat.update': bucket}):
+            from slack_listener import slack_api_call
+
+            slack_api_call("chat.update", mock_slack_client.chat_update, channel='C1', ts='1.0', text='hi')
+
+            bucket.take.assert_called_once()
+            mock_slack_client.chat_update.assert_called_once_with(channel='C1', ts='1.0', text='hi')
+
+    def test_trigger_bound_call_not_delayed_by_empty_bucket(self, mock_slack_client, clock):
+        """views.open runs at once with an empty bucket, before its trigger_id expires."""
+        from rate_limiter import TokenBucket
+        bucket = TokenBucket(rate=1 / 60, capacity=1, timer=clock, sleep=clock.sleep)
+        bucket.take()
+        with patch.dict('slack_listener._slack_buckets', {'views.open': bucket}):
+            from slack_listener import slack_api_call
+
+            slack_api_call("views.open", mock_slack_client.views_open, trigger_id='T1', view={})
+
+        mock_slack_client.views_open.assert_called_once_with(trigger_id='T1', view={})
+        assert clock.sleeps == []
+
+
+class TestRememberOwnMessages:
+    """Tests for the RememberOwnMessages middleware."""
+
+    @staticmethod
+    def _process(event):
+        from slack_bolt.authorization import AuthorizeResult
+        from slack_bolt.request import BoltRequest
+        from slack_bolt.response import BoltResponse
+        from slack_listener import RememberOwnMessages
+
+        req = BoltRequest(body={"type": "event_callback", "event": event}, mode="socket_mode")
+        req.context["authorize_result"] = AuthorizeResult(
+            enterprise_id=None, team_id="T1", bot_user_id="UBOT123", bot_id="B123", bot_token="xoxb-test"
+        )
+        next_ = MagicMock(return_value="next")
+        RememberOwnMessages().process(req=req, resp=BoltResponse(status=200), next=next_)
+        return next_
+
+    def test_own_prompt_thread_recorded_and_dropped(self):
+        """The bot's own prompt is remembered for reaction routing, then skipped like any self event."""
+        import slack_listener
+
+        next_ = self._process({
+            "type": "message", "bot_id": "B123", "text": "Permission needed",
+            "ts": "111.222", "thread_ts": "100.000", "channel": "C123",
+        })
+
+        next_.assert_not_called()
+        assert slack_listener._message_thread_cache.get(("C123", "111.222")) == "100.000"
+
+    def test_own_reactions_still_dropped(self):
+        """The listener's own confirmation reactions never reach handle_reaction."""
+        next_ = self._process({
+            "type": "reaction_added", "user": "UBOT123", "reaction": "white_check_mark",
+            "item": {"type": "message", "channel": "C123", "ts": "111.222"},
+        })
+
+        next_.assert_not_called()
+
+    def test_user_events_pass_through(self):
+        """Other users' events continue to the listeners."""
+        next_ = self._process({
+            "type": "reaction_added", "user": "U123", "reaction": "+1",
+            "item": {"type": "message", "channel": "C123", "ts": "111.222"},
+        })
+
+        next_.assert_called_once()
+
+    def test_user_messages_left_to_handle_message(self):
+        """Messages that reach the listeners are recorded by handle_message, not here."""
+        import slack_listener
+
+        next_ = self._process({
+            "type": "message", "user": "U123", "text": "hello",
+            "ts": "111.222", "thread_ts": "100.000", "channel": "C123",
+        })
+
+        next_.assert_called_once()
+        assert slack_listener._message_thread_cache.get(("C123", "111.222")) is None
+
 
 class TestHandleMessage:
     """Tests for handle_message event handler."""
 
+    def test_handle_message_dm_skips_channel_lookup(self):
+        """A forwarded DM is never a custom channel session, so channel routes aren't queried."""
+        with patch('slack_listener.handle_dm_message', return_value=False), \
+             patch('slack_listener.get_route_for_channel') as mock_channel_route, \
+             patch('slack_listener.get_bot_mention', return_value='<@UBOT123>'), \
+             patch('slack_listener.send_response', return_value="file") as mock_send:
+            from slack_listener import handle_message
+
+            handle_message({
+                'type': 'message',
+                'user': 'U123',
+                'text': 'hello',
+                'ts': '111.222',
+                'channel': 'D123',
+                'channel_type': 'im',
+            }, MagicMock())
+
+            mock_channel_route.assert_not_called()
+            mock_send.assert_called_once()
+
+    @pytest.mark.parametrize("subtype", ["bot_message", "channel_join", "group_leave"])
+    def test_handle_message_ignores_subtypes(self, subtype):
+        """Bot posts and join/leave notices are never routed."""
+        with patch('slack_listener.send_response') as mock_send:
+            from slack_listener import handle_message
+
+            say = MagicMock()
+            handle_message({
+                'type': 'message',
+                'subtype': subtype,
+                'user': 'U123',
+                'text': '1',
+                'ts': '111.222',
+                'channel': 'C123',
+                'thread_ts': '100.000',
+            }, say)
+
+            mock_send.assert_not_called()
+            say.assert_not_called()
+
     def test_handle_message_threaded(self, temp_registry_db, sample_session_data, tmp_path):
         """Routes threaded message to correct session."""
         temp_registry_db.create_session(sample_session_data)
@@ -155,7 +934,7 @@ class TestHandleMessage:
         socket_path = tmp_path / "test.sock"
 
         with patch('slack_listener.registry_db', temp_registry_db):
-            with patch('slack_listener.get_socket_for_thread', return_value=str(socket_path)):
+            with patch('slack_listener.get_route_for_thread', return_value=(sample_session_data['session_id'], str(socket_path))):
                 with patch('slack_listener.send_response') as mock_send:
                     mock_send.return_value = "registry_socket"
 
@@ -175,6 +954,35 @@ class TestHandleMessage:
                     handle_message(event, say)
 
                     mock_send.assert_called_once()
+                    # The route resolved for the send also selects the reply_to_ts session
+                    assert mock_send.call_args.kwargs['route'][1] == sample_session_data['session_id']
+                    session = temp_registry_db.get_session(sample_session_data['session_id'])
+                    assert session['reply_to_ts'] == '111.222'
+
+    def test_handle_message_thread_on_channel_route_leaves_reply_to_ts(self, temp_registry_db, sample_session_data, tmp_path):
+        """A thread reply routed by the channel fallback doesn't redirect that session's replies."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch('slack_listener.get_route_for_thread', return_value=None), \
+             patch('slack_listener.get_route_for_channel',
+                   return_value=(sample_session_data['session_id'], str(tmp_path / "test.sock"))), \
+             patch('slack_listener.get_bot_mention', return_value='<@UBOT123>'), \
+             patch('slack_listener.send_response', return_value="custom_channel_socket"):
+            from slack_listener import handle_message
+
+            handle_message({
+                'type': 'message',
+                'user': 'U123',
+                'text': 'Hello Claude',
+                'ts': '111.222',
+                'channel': 'C123',
+                'channel_type': 'channel',
+                'thread_ts': '999.000'
+            }, MagicMock())
+
+        session = temp_registry_db.get_session(sample_session_data['session_id'])
+        assert session['reply_to_ts'] is None
 
     def test_handle_message_ignores_bot(self):
         """Ignores messages from bots."""
@@ -209,13 +1017,54 @@ class TestHandleMessage:
             }
 
             # Mock to return None for channel lookup
-            with patch('slack_listener.get_socket_for_channel', return_value=None):
+            with patch('slack_listener.get_route_for_channel', return_value=None):
                 say = MagicMock()
                 handle_message(event, say)
 
                 mock_send.assert_not_called()
 
 
+    def test_handle_message_filters_before_bot_lookup(self, mock_slack_client):
+        """Non-command channel chatter is dropped without resolving the bot user."""
+        with patch('slack_listener.send_response') as mock_send, \
+             patch('slack_listener.get_route_for_channel', return_value=None), \
+             patch('slack_listener.get_bot_mention') as mock_bot_id:
+            from slack_listener import handle_message
+
+            event = {
+                'type': 'message',
+                'user': 'U123',
+                'text': 'hey <@UBOT123> look at this',
+                'ts': '111.222',
+                'channel': 'C123',
+                'channel_type': 'channel'
+            }
+
+            handle_message(event, MagicMock())
+
+            mock_bot_id.assert_not_called()
+            mock_send.assert_not_called()
+
+
+class TestHandleMention:
+    """Tests for handle_mention event handler."""
+
+    def test_strips_mention_and_punctuation(self):
+        """The bot mention and the punctuation after it are removed before sending."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send, \
+             patch('slack_listener.add_reaction_async'):
+            from slack_listener import handle_mention
+
+            handle_mention({
+                'user': 'U123',
+                'text': '<@UBOT123>, yes, proceed with analysis ',
+                'ts': '111.222',
+                'thread_ts': '100.000',
+                'channel': 'C123'
+            }, MagicMock())
+
+            assert mock_send.call_args[0][0] == "yes, proceed with analysis"
+
 class TestHandleReaction:
     """Tests for handle_reaction event handler."""
 
@@ -248,6 +1097,203 @@ class TestHandleReaction:
             mock_send.assert_called_once()
             assert mock_send.call_args[0][0] == "1"
 
+    def test_handle_reaction_uses_seen_message_thread(self, mock_slack_client):
+        """Reactions to messages seen by handle_message skip conversations_history."""
+        with patch('slack_listener.send_response') as mock_send:
+            mock_send.return_value = "registry_socket"
+
+            from slack_listener import handle_message, handle_reaction
+
+            # Bot-posted prompt in a thread: ignored for routing, but its thread is recorded
+            handle_message({
+                'type': 'message',
+                'bot_id': 'B123',
+                'text': 'Permission needed',
+                'ts': '111.222',
+                'thread_ts': '100.000',
+                'channel': 'C123'
+            }, MagicMock())
+
+            body = {
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': '+1',
+                    'item': {
+                        'channel': 'C123',
+                        'ts': '111.222'
+                    }
+                }
+            }
+
+            handle_reaction(body, mock_slack_client)
+
+            mock_slack_client.conversations_history.assert_not_called()
+            assert mock_send.call_args.kwargs['thread_ts'] == '100.000'
+
+    def test_number_reaction_on_seen_prompt_makes_no_api_call(self, mock_slack_client):
+        """A 1️⃣ on a seen non-AskUser prompt needs neither the AskUser check nor the thread fetch."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send:
+            from slack_listener import handle_message, handle_reaction
+
+            handle_message({
+                'type': 'message',
+                'bot_id': 'B123',
+                'text': 'Permission needed',
+                'blocks': [{'type': 'section', 'block_id': 'perm1'}],
+                'ts': '111.222',
+                'thread_ts': '100.000',
+                'channel': 'C123'
+            }, MagicMock())
+
+            handle_reaction({
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': 'one',
+                    'item': {'channel': 'C123', 'ts': '111.222'}
+                }
+            }, mock_slack_client)
+
+            mock_slack_client.conversations_history.assert_not_called()
+            mock_slack_client.conversations_replies.assert_not_called()
+            assert mock_send.call_args[0][0] == "1"
+            assert mock_send.call_args.kwargs['thread_ts'] == '100.000'
+
+    def test_handle_reaction_uses_item_thread_ts(self, mock_slack_client):
+        """A thread_ts on the reacted-to item is used without fetching the message."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send:
+            from slack_listener import handle_reaction
+
+            handle_reaction({
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': '+1',
+                    'item': {'type': 'message', 'channel': 'C123', 'ts': '111.222', 'thread_ts': '100.000'}
+                }
+            }, mock_slack_client)
+
+            mock_slack_client.conversations_history.assert_not_called()
+            assert mock_send.call_args.kwargs['thread_ts'] == '100.000'
+
+    def test_handle_reaction_ignores_redelivered_event(self, mock_slack_client):
+        """A redelivered reaction_added event sends its input once; a new reaction still goes through."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send:
+            from slack_listener import handle_reaction
+
+            def reaction(event_ts):
+                return {
+                    'event': {
+                        'type': 'reaction_added',
+                        'user': 'U123',
+                        'reaction': '+1',
+                        'item': {'type': 'message', 'channel': 'C123', 'ts': '111.222', 'thread_ts': '100.000'},
+                        'event_ts': event_ts,
+                    }
+                }
+
+            handle_reaction(reaction('200.001'), mock_slack_client)
+            handle_reaction(reaction('200.001'), mock_slack_client)
+            assert mock_send.call_count == 1
+
+            handle_reaction(reaction('200.002'), mock_slack_client)
+            assert mock_send.call_count == 2
+
+    def test_handle_reaction_makes_no_auth_call(self, mock_slack_client):
+        """Self-reactions are filtered by Bolt, so the handler never calls auth.test."""
+        with patch('slack_listener._bot_user_id', None), \
+             patch('slack_listener.send_response', return_value="registry_socket"):
+            from slack_listener import handle_reaction
+
+            handle_reaction({
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': '+1',
+                    'item': {'type': 'message', 'channel': 'C123', 'ts': '111.222', 'thread_ts': '100.000'}
+                }
+            }, mock_slack_client)
+
+            mock_slack_client.auth_test.assert_not_called()
+
+    def test_handle_reaction_fetches_message_once(self, mock_slack_client):
+        """The AskUser check's fetch also supplies the thread for routing."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send:
+            from slack_listener import handle_reaction
+
+            mock_slack_client.conversations_history.return_value = {
+                'ok': True,
+                'messages': [{'ts': '111.222', 'thread_ts': '100.000', 'blocks': []}]
+            }
+            handle_reaction({
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': 'one',
+                    'item': {'type': 'message', 'channel': 'C123', 'ts': '111.222'}
+                }
+            }, mock_slack_client)
+
+            assert mock_slack_client.conversations_history.call_count == 1
+            mock_slack_client.conversations_replies.assert_not_called()
+            assert mock_send.call_args.kwargs['thread_ts'] == '100.000'
+
+    def test_handle_reaction_fast_path_for_routed_message(self, mock_slack_client):
+        """Reactions on messages the listener delivered reuse that socket directly."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send, \
+             patch('slack_listener.get_route_for_thread', return_value=('sess1234', '/tmp/sess.sock')), \
+             patch('slack_listener.handle_askuser_thread_reply', return_value=None), \
+             patch('slack_listener.send_to_session_socket', return_value=True) as mock_socket_send:
+            from slack_listener import handle_message, handle_reaction
+
+            handle_message({
+                'type': 'message',
+                'user': 'U123',
+                'text': 'run the tests',
+                'ts': '111.222',
+                'thread_ts': '100.000',
+                'channel': 'C123',
+                'channel_type': 'channel'
+            }, MagicMock())
+            mock_send.reset_mock()
+
+            body = {
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U456',
+                    'reaction': 'thumbsdown',
+                    'item': {'channel': 'C123', 'ts': '111.222'}
+                }
+            }
+            handle_reaction(body, mock_slack_client)
+
+            mock_socket_send.assert_called_once_with("3", '/tmp/sess.sock')
+            mock_send.assert_not_called()
+            mock_slack_client.conversations_history.assert_not_called()
+
+    def test_handle_reaction_confirms_in_background(self, mock_slack_client):
+        """The confirmation checkmark is handed to the background pool, not added inline."""
+        with patch('slack_listener.send_response', return_value="registry_socket"), \
+             patch('slack_listener.add_reaction_async') as mock_react:
+            from slack_listener import handle_reaction
+
+            mock_slack_client.conversations_history.return_value = {
+                'ok': True,
+                'messages': [{'ts': '111.222'}]
+            }
+            handle_reaction({
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': 'one',
+                    'item': {'channel': 'C123', 'ts': '111.222'}
+                }
+            }, mock_slack_client)
+
+            mock_react.assert_called_once_with('C123', '111.222')
+            mock_slack_client.reactions_add.assert_not_called()
+
     def test_handle_reaction_approve_thumbsup(self, mock_slack_client):
         """Thumbsup emoji maps to '1'."""
         with patch('slack_listener.send_response') as mock_send:
@@ -267,7 +1313,7 @@ class TestHandleReaction:
                 }
             }
 
-            mock_slack_client.conversations_history.return_value = {
+            mock_slack_client.conversations_replies.return_value = {
                 'ok': True,
                 'messages': [{'ts': '111.222'}]
             }
@@ -276,6 +1322,30 @@ class TestHandleReaction:
 
             mock_send.assert_called_once()
             assert mock_send.call_args[0][0] == "1"
+            assert mock_send.call_args.kwargs['thread_ts'] == '111.222'
+
+    def test_handle_reaction_on_thread_reply_routes_to_parent(self, mock_slack_client):
+        """A reaction on a threaded prompt is routed to the thread's parent, looked up via conversations.replies."""
+        with patch('slack_listener.send_response', return_value="registry_socket") as mock_send:
+            from slack_listener import handle_reaction
+
+            # Parent first, as conversations.replies returns it for a reply ts
+            mock_slack_client.conversations_replies.return_value = {
+                'ok': True,
+                'messages': [{'ts': '100.000', 'thread_ts': '100.000'}]
+            }
+            handle_reaction({
+                'event': {
+                    'type': 'reaction_added',
+                    'user': 'U123',
+                    'reaction': '+1',
+                    'item': {'type': 'message', 'channel': 'C123', 'ts': '111.222'}
+                }
+            }, mock_slack_client)
+
+            mock_slack_client.conversations_replies.assert_called_once_with(channel='C123', ts='111.222', limit=1)
+            mock_slack_client.conversations_history.assert_not_called()
+            assert mock_send.call_args.kwargs['thread_ts'] == '100.000'
 
     def test_handle_reaction_approve_remember(self, mock_slack_client):
         """2 emoji maps to '2'."""
@@ -396,7 +1466,6 @@ class TestHandlePermissionButton:
 
             from slack_listener import handle_permission_button
 
-            ack = MagicMock()
             body = {
                 'user': {'id': 'U123', 'name': 'testuser'},
                 'channel': {'id': 'C123'},
@@ -406,10 +1475,9 @@ class TestHandlePermissionButton:
                 ]
             }
 
-            with patch('slack_listener.get_socket_for_channel', return_value=None):
-                handle_permission_button(ack, body, mock_slack_client)
+            with patch('slack_listener.resolve_route', return_value=(None, None, None)):
+                handle_permission_button(body, mock_slack_client)
 
-            ack.assert_called_once()
             mock_send.assert_called_once()
             assert mock_send.call_args[0][0] == "1"
 
@@ -418,7 +1486,6 @@ class TestHandlePermissionButton:
         with patch('slack_listener.send_response') as mock_send:
             from slack_listener import handle_permission_button
 
-            ack = MagicMock()
             body = {
                 'user': {'id': 'U123', 'name': 'testuser'},
                 'channel': {'id': 'C123'},
@@ -428,15 +1495,378 @@ class TestHandlePermissionButton:
                 ]
             }
 
-            with patch('slack_listener.get_socket_for_channel', return_value=None):
-                handle_permission_button(ack, body, mock_slack_client)
+            with patch('slack_listener.resolve_route', return_value=(None, None, None)):
+                handle_permission_button(body, mock_slack_client)
 
-            ack.assert_called_once()
             # In thread mode with deny, should update message for feedback
             mock_slack_client.chat_update.assert_called_once()
             # send_response should NOT be called yet (waiting for feedback)
             mock_send.assert_not_called()
 
+    def test_deny_in_custom_channel_sends_with_resolved_route(self, mock_slack_client):
+        """Custom channel deny is sent directly, reusing the route resolved for detection."""
+        route = ('/tmp/custom.sock', 'cust5678', 'custom_channel_socket')
+        with patch('slack_listener.send_response', return_value='custom_channel_socket') as mock_send, \
+             patch('slack_listener.resolve_route', return_value=route) as mock_resolve:
+            from slack_listener import handle_permission_button
+
+            handle_permission_button({
+                'user': {'id': 'U123', 'name': 'testuser'},
+                'channel': {'id': 'C123'},
+                'message': {'ts': '111.222'},
+                'actions': [{'action_id': 'permission_response_3', 'value': '3', 'style': 'danger'}]
+            }, mock_slack_client)
+
+            mock_resolve.assert_called_once_with(thread_ts='111.222', channel='C123')
+            mock_send.assert_called_once()
+            assert mock_send.call_args.kwargs['route'] == route
+
+
+    def test_handle_permission_button_deletes_prompt_and_clears_ts(self, temp_registry_db, sample_session_data, mock_slack_client):
+        """The prompt is deleted and the session's permission_message_ts cleared."""
+        temp_registry_db.create_session(sample_session_data)
+        temp_registry_db.update_session(sample_session_data['session_id'], {'permission_message_ts': '111.222'})
+
+        pool = MagicMock()
+
+        with patch('slack_listener.send_response', return_value="registry_socket"), \
+             patch('slack_listener.resolve_route', return_value=(None, None, None)), \
+             patch('slack_listener.registry_db', temp_registry_db), \
+             patch('slack_listener._slack_call_pool', pool):
+            from slack_listener import handle_permission_button
+
+            handle_permission_button({
+                'user': {'id': 'U123', 'name': 'testuser'},
+                'channel': {'id': 'C123'},
+                'message': {'ts': '111.222', 'thread_ts': sample_session_data['thread_ts']},
+                'actions': [{'action_id': 'permission_response_1', 'value': '1', 'style': 'primary'}]
+            }, mock_slack_client)
+
+            # Cleanup is handed to the background pool, not done on the handler thread
+            mock_slack_client.chat_delete.assert_not_called()
+            assert temp_registry_db.get_session(sample_session_data['session_id'])['permission_message_ts'] == '111.222'
+
+            fn, *args = pool.submit.call_args[0]
+            fn(*args)
+
+        mock_slack_client.chat_delete.assert_called_once_with(channel='C123', ts='111.222')
+        session = temp_registry_db.get_session(sample_session_data['session_id'])
+        assert session['permission_message_ts'] is None
+
+    def test_clear_permission_ts_reuses_thread_lookup(self, temp_registry_db, sample_session_data):
+        """A burst of clears in one thread looks the session up once."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch.object(temp_registry_db, 'get_session_id_for_thread', wraps=temp_registry_db.get_session_id_for_thread) as mock_get:
+            from slack_listener import _clear_permission_message_ts
+
+            for ts in ('111.222', '333.444'):
+                temp_registry_db.update_session(sample_session_data['session_id'], {'permission_message_ts': ts})
+                _clear_permission_message_ts(sample_session_data['thread_ts'], 'C123')
+                assert temp_registry_db.get_session(sample_session_data['session_id'])['permission_message_ts'] is None
+
+            assert mock_get.call_count == 1
+
+    def test_clear_permission_ts_for_custom_channel_session(self, temp_registry_db, sample_session_data_custom_channel):
+        """Without a thread, the session is found through the custom channel route."""
+        data = sample_session_data_custom_channel
+        temp_registry_db.create_session(data)
+        temp_registry_db.update_session(data['session_id'], {'permission_message_ts': '111.222'})
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch('slack_listener.socket_exists', return_value=True):
+            from slack_listener import _clear_permission_message_ts
+
+            _clear_permission_message_ts(None, data['channel'])
+
+        assert temp_registry_db.get_session(data['session_id'])['permission_message_ts'] is None
+
+    def test_delete_permission_message_falls_back_to_update(self, mock_slack_client):
+        """If the prompt can't be deleted it is updated instead and reported as not deleted."""
+        mock_slack_client.chat_delete.side_effect = Exception("cant_delete_message")
+
+        from slack_listener import _delete_permission_message
+        assert _delete_permission_message(mock_slack_client, 'C123', '111.222', 'U123', '1') is False
+        mock_slack_client.chat_update.assert_called_once()
+        assert mock_slack_client.chat_update.call_args.kwargs['blocks'] == [
+            {"type": "section", "text": {"type": "mrkdwn", "text": "✅ *<@U123> approved* (option 1)"}}
+        ]
+
+
+class TestHandlePermissionHookButton:
+    """Tests for handle_permission_hook_button()."""
+
+    def test_update_fallback_shows_decision(self, mock_slack_client, tmp_path):
+        """If the prompt can't be deleted, it is updated with the decision text."""
+        import json
+        mock_slack_client.chat_delete.side_effect = Exception("cant_delete_message")
+        body = {
+            'actions': [{
+                'action_id': 'permission_deny',
+                'value': json.dumps({'session_id': 'abc12345', 'request_id': 'req1', 'decision': 'deny'}),
+            }],
+            'user': {'id': 'U123', 'name': 'alice'},
+            'channel': {'id': 'C123'},
+            'message': {'ts': '111.222'},
+        }
+
+        with patch('slack_listener.PERMISSION_RESPONSE_DIR', tmp_path):
+            from slack_listener import handle_permission_hook_button
+            handle_permission_hook_button(body, mock_slack_client)
+
+        assert json.loads((tmp_path / "abc12345_req1.json").read_text())['decision'] == 'deny'
+        assert mock_slack_client.chat_update.call_args.kwargs['blocks'] == [
+            {"type": "section", "text": {"type": "mrkdwn", "text": "❌ *<@U123> denied* this action"}}
+        ]
+
+class TestSessionSelectOptions:
+    """Tests for the attach modal's external_select options handler."""
+
+    def test_options_filtered_by_query(self, temp_registry_db, sample_session_data):
+        """Options are loaded from the registry using the typed query."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db):
+            from slack_listener import handle_session_select_options
+
+            ack = MagicMock()
+            handle_session_select_options(ack, {'value': 'test'})
+
+            options = ack.call_args.kwargs['options']
+            assert len(options) == 1
+            assert options[0]['value'] == sample_session_data['session_id']
+
+    def test_session_option_to_slack(self):
+        """SessionOption renders Slack's option object."""
+        from slack_listener import SessionOption
+
+        option = SessionOption('my-project', '12345678-1234-5678-1234-567812345678')
+        assert option.to_slack() == {
+            'text': {'type': 'plain_text', 'text': 'my-project (12345678...)'},
+            'value': '12345678-1234-5678-1234-567812345678'
+        }
+
+    def test_options_capped_at_slack_limit(self):
+        """Never requests more than Slack's option limit."""
+        mock_db = MagicMock()
+        mock_db.search_sessions.return_value = []
+
+        with patch('slack_listener.registry_db', mock_db):
+            from slack_listener import handle_session_select_options, SLACK_MAX_SELECT_OPTIONS
+
+            ack = MagicMock()
+            handle_session_select_options(ack, {'value': ''})
+
+            assert mock_db.search_sessions.call_args.kwargs['limit'] == SLACK_MAX_SELECT_OPTIONS
+            ack.assert_called_once_with(options=[])
+
+
+class TestAttachModalSubmission:
+    """Tests for handle_attach_modal_submission()."""
+
+    def _view(self, history_value=None):
+        values = {
+            'session_select_block': {'session_select': {'selected_option': {'value': 'sess1234'}}},
+        }
+        if history_value is not None:
+            values['history_block'] = {'history_select': {'selected_option': {'value': history_value}}}
+        return {'private_metadata': '{"user_id": "U123"}', 'state': {'values': values}}
+
+    @pytest.mark.parametrize("history_value,expected", [
+        ("10", 10),
+        (None, 0),
+        ("999", 0),
+    ])
+    def test_history_count_from_selection(self, mock_slack_client, history_value, expected):
+        """History option values map to counts; unknown or missing values mean no history."""
+        mock_slack_client.conversations_open.return_value = {'channel': {'id': 'D123'}}
+
+        with patch('slack_listener.attach_to_session', return_value={'message': 'ok'}) as mock_attach:
+            from slack_listener import handle_attach_modal_submission
+
+            handle_attach_modal_submission({'user': {'id': 'U123'}}, mock_slack_client, self._view(history_value))
+
+            assert mock_attach.call_args[0][-1] == expected
+
+    def test_history_unselected_means_no_history(self, mock_slack_client):
+        """Slack sends selected_option: null when the optional history input is left empty."""
+        mock_slack_client.conversations_open.return_value = {'channel': {'id': 'D123'}}
+        view = self._view()
+        view['state']['values']['history_block'] = {'history_select': {'selected_option': None}}
+
+        with patch('slack_listener.attach_to_session', return_value={'message': 'ok'}) as mock_attach:
+            from slack_listener import handle_attach_modal_submission
+
+            handle_attach_modal_submission({'user': {'id': 'U123'}}, mock_slack_client, view)
+
+            assert mock_attach.call_args[0][-1] == 0
+
+    def test_dm_channel_opened_once_per_user(self, mock_slack_client):
+        """Repeat attaches reuse the user's DM channel instead of calling conversations_open."""
+        mock_slack_client.conversations_open.return_value = {'channel': {'id': 'D123'}}
+
+        with patch('slack_listener.attach_to_session', return_value={'message': 'ok'}) as mock_attach:
+            from slack_listener import handle_attach_modal_submission
+
+            for _ in range(2):
+                handle_attach_modal_submission({'user': {'id': 'U123'}}, mock_slack_client, self._view())
+
+            mock_slack_client.conversations_open.assert_called_once_with(users=['U123'])
+            assert mock_attach.call_args[0][3] == 'D123'
+
+    def test_dm_channel_dropped_after_failure(self, mock_slack_client):
+        """A failed attach forgets the cached DM channel so the next attempt reopens it."""
+        mock_slack_client.conversations_open.return_value = {'channel': {'id': 'D123'}}
+        mock_slack_client.chat_postMessage.side_effect = [Exception("channel_not_found"), {'ok': True}]
+
+        with patch('slack_listener.attach_to_session', return_value={'message': 'ok'}):
+            from slack_listener import handle_attach_modal_submission
+
+            for _ in range(2):
+                handle_attach_modal_submission({'user': {'id': 'U123'}}, mock_slack_client, self._view())
+
+            assert mock_slack_client.conversations_open.call_count == 2
+
+
+class TestGetSessionsShortcut:
+    """Tests for handle_get_sessions_shortcut()."""
+
+    def test_opens_modal_without_ack(self, mock_slack_client):
+        """Runs as a lazy listener: opens the modal using only shortcut and client."""
+        with patch('slack_listener.registry_db', None):
+            from slack_listener import handle_get_sessions_shortcut
+
+            handle_get_sessions_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T1'}, mock_slack_client)
+
+            mock_slack_client.views_open.assert_called_once()
+            assert mock_slack_client.views_open.call_args.kwargs['trigger_id'] == 'T1'
+
+
+    def test_session_list_reused_within_ttl(self, temp_registry_db, sample_session_data, mock_slack_client):
+        """Back-to-back opens query the registry once."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch.object(temp_registry_db, 'list_sessions', wraps=temp_registry_db.list_sessions) as mock_list:
+            from slack_listener import handle_get_sessions_shortcut
+
+            for _ in range(2):
+                handle_get_sessions_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T1'}, mock_slack_client)
+
+            assert mock_list.call_count == 1
+            blocks = mock_slack_client.views_open.call_args.kwargs['view']['blocks']
+            assert any(sample_session_data['session_id'] in str(block) for block in blocks)
+
+    def test_static_blocks_not_mutated(self, temp_registry_db, sample_session_data, mock_slack_client):
+        """Header/footer constants are copied, not extended in place."""
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db):
+            from slack_listener import (
+                handle_get_sessions_shortcut, SESSIONS_HEADER_BLOCKS, SESSIONS_FOOTER_BLOCKS,
+            )
+
+            handle_get_sessions_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T1'}, mock_slack_client)
+
+            blocks = mock_slack_client.views_open.call_args.kwargs['view']['blocks']
+            assert isinstance(blocks, list)
+            assert tuple(blocks[:2]) == SESSIONS_HEADER_BLOCKS
+            assert tuple(blocks[-2:]) == SESSIONS_FOOTER_BLOCKS
+            assert len(SESSIONS_HEADER_BLOCKS) == 2
+
+    def test_session_blocks_handle_missing_created_at(self, mock_slack_client):
+        """One section per session; a missing/None created_at renders as empty."""
+        sessions = [
+            {'session_id': 'aaaa1111', 'project': 'alpha', 'created_at': '2026-01-02T03:04:05'},
+            {'session_id': 'bbbb2222', 'project': 'beta', 'created_at': None},
+            {'session_id': 'cccc3333', 'project': 'gamma'},
+        ]
+
+        with patch('slack_listener.get_active_sessions', return_value=sessions):
+            from slack_listener import handle_get_sessions_shortcut
+
+            handle_get_sessions_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T1'}, mock_slack_client)
+
+            blocks = mock_slack_client.views_open.call_args.kwargs['view']['blocks']
+            texts = [b['text']['text'] for b in blocks[2:-2]]
+            assert texts == [
+                "*alpha*\n`aaaa1111`\n_Started: 2026-01-02_",
+                "*beta*\n`bbbb2222`\n_Started: _",
+                "*gamma*\n`cccc3333`\n_Started: _",
+            ]
+
+
+class TestAttachShortcut:
+    """Tests for handle_attach_shortcut()."""
+
+    def test_opens_template_view_with_user_metadata(self, temp_registry_db, sample_session_data, mock_slack_client):
+        """The modal is the shared template plus this user's private_metadata."""
+        import json
+        temp_registry_db.create_session(sample_session_data)
+
+        with patch('slack_listener.registry_db', temp_registry_db):
+            from slack_listener import handle_attach_shortcut, ATTACH_VIEW_TEMPLATE
+
+            handle_attach_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T1'}, mock_slack_client)
+
+            view = mock_slack_client.views_open.call_args.kwargs['view']
+            assert json.loads(view['private_metadata']) == {'user_id': 'U123'}
+            assert view['callback_id'] == 'attach_session_modal'
+            assert 'private_metadata' not in ATTACH_VIEW_TEMPLATE
+            # Serializes like a plain dict/list view
+            body = json.loads(json.dumps(view))
+            assert [b.get('block_id') for b in body['blocks']] == [None, 'session_select_block', 'history_block']
+
+    def test_empty_state_cached_and_shared(self, temp_registry_db, mock_slack_client):
+        """With no sessions, repeat opens of either shortcut reuse the empty result and the prebuilt view."""
+        with patch('slack_listener.registry_db', temp_registry_db), \
+             patch.object(temp_registry_db, 'search_sessions', wraps=temp_registry_db.search_sessions) as mock_search, \
+             patch('slack_listener.list_active_sessions') as mock_list:
+            from slack_listener import (
+                handle_attach_shortcut, handle_get_sessions_shortcut,
+                EMPTY_ATTACH_VIEW, EMPTY_GET_SESSIONS_VIEW,
+            )
+
+            for _ in range(2):
+                handle_attach_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T1'}, mock_slack_client)
+            assert mock_search.call_count == 1
+            assert mock_slack_client.views_open.call_args.kwargs['view'] is EMPTY_ATTACH_VIEW
+
+            handle_get_sessions_shortcut({'user': {'id': 'U123'}, 'trigger_id': 'T2'}, mock_slack_client)
+            mock_list.assert_not_called()
+            assert mock_slack_client.views_open.call_args.kwargs['view'] is EMPTY_GET_SESSIONS_VIEW
+
+
+class TestSetUserMode:
+    """Tests for the mode shortcut helper."""
+
+    def test_set_user_mode_posts_to_user_directly(self, temp_registry_db, mock_slack_client):
+        """Confirmation is posted with channel=user_id, without conversations_open."""
+        with patch('slack_listener.registry_db', temp_registry_db):
+            from slack_listener import _set_user_mode
+
+            _set_user_mode('U123', 'plan', mock_slack_client)
+
+            assert temp_registry_db.get_user_mode('U123') == 'plan'
+            mock_slack_client.conversations_open.assert_not_called()
+            mock_slack_client.chat_postMessage.assert_called_once()
+            assert mock_slack_client.chat_postMessage.call_args.kwargs['channel'] == 'U123'
+
+    @pytest.mark.parametrize("callback_id,mode", [
+        ("research_mode", "research"),
+        ("plan_mode", "plan"),
+        ("execute_mode", "execute"),
+    ])
+    def test_mode_shortcut_sets_mode_from_callback_id(self, mock_slack_client, callback_id, mode):
+        """One handler serves all three mode shortcuts, keyed by callback_id."""
+        with patch('slack_listener._set_user_mode') as mock_set:
+            from slack_listener import handle_mode_shortcut
+
+            handle_mode_shortcut({'user': {'id': 'U123'}, 'callback_id': callback_id}, mock_slack_client)
+
+            mock_set.assert_called_once_with('U123', mode, mock_slack_client)
+
 
 class TestHandleDMCommands:
     """Tests for DM command handling in slack_listener."""
@@ -542,6 +1972,34 @@ class TestHandleDMCommands:
         sub = temp_registry_db.get_dm_subscription_for_user('U123456')
         assert sub is None
 
+    def test_dm_message_forwarded_with_mode_prompt(self, temp_registry_db, sample_session_data):
+        """Attached users' messages go to the session socket with their mode prompt, via one lookup."""
+        from slack_listener import handle_dm_message
+
+        temp_registry_db.create_session(sample_session_data)
+        temp_registry_db.create_dm_subscription('U123456', sample_session_data['session_id'], 'D123456')
+        temp_registry_db.set_user_mode('U123456', 'plan')
+        say = MagicMock()
+
+        with patch('slack_listener.send_to_session_socket', return_value=True) as mock_send, \
+             patch.object(temp_registry_db, 'get_session') as mock_get_session:
+            result = handle_dm_message(
+                text='refactor the parser',
+                user_id='U123456',
+                dm_channel_id='D123456',
+                db=temp_registry_db,
+                slack_client=None,
+                say=say
+            )
+
+        assert result is True
+        mock_get_session.assert_not_called()
+        sent_text, socket_path = mock_send.call_args[0]
+        assert sent_text.startswith('refactor the parser')
+        assert len(sent_text) > len('refactor the parser')
+        assert socket_path == sample_session_data['socket_path']
+        assert say.call_args.kwargs['text'] == "✅ Sent to Claude [plan]"
+
     def test_dm_non_command_guides_user(self, temp_registry_db, sample_session_data):
         """Non-command DMs now return True and guide user to attach."""
         from slack_listener import handle_dm_message
@@ -567,6 +2025,28 @@ class TestHandleDMCommands:
         assert '/attach' in call_args.kwargs['text']
 
 
+class TestAtomicReadAndUpdateResponseFile:
+    """Tests for atomic_read_and_update_response_file()."""
+
+    def test_returns_merged_data(self, tmp_path):
+        """The merged answers are returned, matching what was written."""
+        from slack_listener import atomic_read_and_update_response_file
+
+        response_file = tmp_path / "abc12345_req1.json"
+        response_file.write_text(json.dumps({"question_0": "1"}))
+
+        merged = atomic_read_and_update_response_file(response_file, {"question_1": "0"})
+
+        assert merged == {"question_0": "1", "question_1": "0"}
+        assert json.loads(response_file.read_text()) == merged
+
+    def test_returns_none_on_failure(self, tmp_path):
+        """An unwritable location reports failure as None."""
+        from slack_listener import atomic_read_and_update_response_file
+
+        assert atomic_read_and_update_response_file(tmp_path / "missing" / "r.json", {"question_0": "1"}) is None
+
+
 class TestAskUserQuestionReactionHandler:
     """Test reaction handling for AskUserQuestion."""
 
@@ -456,3 +456,30 @@ class TestGetLastNMessages:
         parser.load()
         messages = parser.get_last_n_messages()
         assert messages == []
+
+    def test_load_recent_matches_full_load(self, tmp_path):
+        """load_recent() yields the same last-N messages as load()."""
+        transcript_path = tmp_path / "long.jsonl"
+        with open(transcript_path, 'w') as f:
+            for i in range(40):
+                msg = {
+                    'type': ('user', 'assistant', 'tool_result')[i % 3],
+                    'timestamp': f'2025-01-01T00:{i:02d}:00Z',
+                    'message': {'content': [{'type': 'text', 'text': f'Message {i}'}]}
+                }
+                f.write(json.dumps(msg) + '\n')
+            f.write('not valid json\n')
+
+        full = TranscriptParser(str(transcript_path))
+        full.load()
+
+        recent = TranscriptParser(str(transcript_path))
+        assert recent.load_recent(5) is True
+
+        assert recent.get_last_n_messages(n=5) == full.get_last_n_messages(n=5)
+        assert len(recent.messages) < len(full.messages)
+
+    def test_load_recent_file_not_found(self, tmp_path):
+        """Returns False for missing file."""
+        parser = TranscriptParser(str(tmp_path / "nonexistent.jsonl"))
+        assert parser.load_recent(5) is False
@@ -0,0 +1,86 @@
+"""
+Unit tests for core/ttl_cache.py
+
+Tests the TTLCache used to memoize listener routing lookups.
+"""
+
+import sys
+from pathlib import Path
+
+# Add core directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
+
+from ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_returns_cached_value(self, clock):
+        """Values are returned until the TTL elapses."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        cache.set('a', 1)
+        clock.now = 4.9
+        assert cache.get('a') == 1
+
+    def test_entries_expire(self, clock):
+        """Expired entries behave like misses."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        cache.set('a', 1)
+        clock.now = 5.0
+        assert cache.get('a', 'miss') == 'miss'
+        assert 'a' not in cache
+
+    def test_per_entry_ttl(self, clock):
+        """A per-entry TTL overrides the default."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        cache.set('a', None, ttl=1.0)
+        assert 'a' in cache
+        clock.now = 1.0
+        assert 'a' not in cache
+
+    def test_none_values_are_cached(self, clock):
+        """A cached None is distinguishable from a miss."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        cache.set('a', None)
+        assert cache.get('a', 'miss') is None
+
+    def test_evicts_oldest_when_full(self, clock):
+        """Oldest entry is dropped once maxsize is exceeded."""
+        cache = TTLCache(maxsize=2, ttl=5.0, timer=clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+        assert 'a' not in cache
+        assert cache.get('b') == 2
+        assert cache.get('c') == 3
+
+    def test_discard_value(self, clock):
+        """discard_value() removes every key mapped to that value."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        cache.set('a', '/tmp/x.sock')
+        cache.set('b', '/tmp/x.sock')
+        cache.set('c', '/tmp/y.sock')
+        assert cache.discard_value('/tmp/x.sock') == 2
+        assert len(cache) == 1
+        assert cache.get('c') == '/tmp/y.sock'
+
+    def test_pop_and_clear(self, clock):
+        """pop() removes one entry, clear() removes all."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.pop('a') == 1
+        assert cache.pop('a', 'gone') == 'gone'
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_add_only_when_missing(self, clock):
+        """add() stores a key once; it can be added again after it expires."""
+        cache = TTLCache(maxsize=10, ttl=5.0, timer=clock)
+        assert cache.add('a', 1) is True
+        assert cache.add('a', 2) is False
+        assert cache.get('a') == 1
+        clock.now = 5.0
+        assert cache.add('a', 3) is True
+        assert cache.get('a') == 3